@@ -0,0 +1,85 @@
+# app/cache.py
+"""
+프로세스 내 LRU + TTL 캐시
+
+    cache = TTLCache("tokens", maxsize=10_000, ttl=300)
+    cache.set(key, value)                      # 기본 ttl
+    cache.set(key, value, ttl=exp - time.time())  # 항목별 만료
+    value = cache.get(key)                     # 없거나 만료면 None
+
+- 스레드 안전 (동기 라우트는 스레드풀에서 동시에 호출된다)
+- maxsize 를 넘으면 가장 오래 안 쓴 항목부터 버린다. maxsize=0 이면 아무것도 저장하지 않음
+- 워커 프로세스마다 따로 가지므로, 무효화가 필요한 값은 TTL 을 짧게 둔다
+- hits / misses / evictions 를 세고 stats() 로 확인 (GET /metrics 에도 노출)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+_caches: List["TTLCache"] = []
+
+
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key → (만료 시각(monotonic), 값), 뒤쪽이 최근에 쓴 항목
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches.append(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def all_caches() -> List[TTLCache]:
+    return list(_caches)
@@ -0,0 +1,148 @@
+# app/config.py
+"""
+환경 설정 (환경변수 / .env 를 한 번만 읽어 캐시)
+
+    from app.config import get_settings
+    settings = get_settings()
+
+필드 이름의 대문자가 환경변수 이름이다. (예: database_url → DATABASE_URL)
+값은 첫 get_settings() 호출 때 고정되므로, 벤치마크/스크립트에서 환경변수를 바꿀 때는
+app 모듈을 import 하기 전에 지정한다.
+"""
+from functools import lru_cache
+from typing import List, Set
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    # ---------------------------
+    # DB (app.db)
+    # ---------------------------
+    # 예) sqlite:///./app.db
+    #     mysql+mysqlconnector://user:pw@host:3306/dbname
+    database_url: str = "sqlite:///./app.db"
+    # 서버형 DB(MySQL) 기준 값. SQLite 파일 DB 는 db_pool_size 만 적용
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30
+    # MySQL wait_timeout(기본 8시간) 보다 먼저 연결을 새로 맺음
+    db_pool_recycle: int = 1800
+
+    # SQLite PRAGMA (연결마다 적용)
+    # WAL: 쓰기 중에도 읽기가 막히지 않음 / NORMAL: commit 마다 fsync 하지 않음 (WAL 에서 안전)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    # 다른 연결이 쓰는 중이면 에러 대신 최대 이 시간(ms) 까지 기다림
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kb: int = 64 * 1024
+
+    # 비동기 엔진 (ASYNC_DB=1 이면 주요 조회/쪽지/매칭 신청 API 가 async 라우트로 동작)
+    async_db: bool = False
+    # 비우면 DATABASE_URL 의 드라이버만 바꿔서 사용 (sqlite → aiosqlite, mysql → aiomysql)
+    async_database_url: str = ""
+
+    # 읽기 전용 복제본. 비우면 읽기도 primary 로
+    read_database_url: str = ""
+    # 마지막 commit 후 이 시간(초) 동안은 그 유저의 읽기도 primary 로 (복제 지연보다 길게)
+    read_your_writes_seconds: float = 5
+    # 로컬 SQLite 복제본 동기화 주기(초), 0 이면 API 프로세스에서 돌리지 않음 (app.replica)
+    replica_sync_seconds: float = 2
+
+    # ---------------------------
+    # 계측 (app.instrumentation)
+    # ---------------------------
+    # 1 이면 응답 헤더에 X-DB-Queries / X-DB-Time(ms)
+    debug: bool = False
+    # 한 요청에서 같은 모양의 SQL 이 이 횟수를 넘으면 N+1 경고 로그, 0 이면 끔
+    n_plus_one_threshold: int = 10
+    # GET /metrics (Prometheus 텍스트 형식) 와 요청 지표 수집 (app.metrics)
+    metrics_enabled: bool = True
+    # 요청 샘플링 프로파일러 (app.profiling). 끄면 미들웨어를 아예 등록하지 않음
+    profiling_enabled: bool = False
+    # 관리자 X-Profile: 1 헤더 외에 무작위로 프로파일할 요청 비율 (0~1)
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5
+    profile_dir: str = "profiles"
+    profile_max_files: int = 200
+    # 이 시간(ms) 보다 오래 걸린 SQL 을 실행 계획과 함께 기록, 0 이면 끔 (app.slow_query)
+    slow_query_ms: float = 200
+    # 비우면 stdout 에 JSON 한 줄씩. 지정하면 크기 기준으로 회전하는 파일
+    slow_query_log_file: str = ""
+    slow_query_log_max_bytes: int = 10 * 1024 * 1024
+    slow_query_log_backups: int = 5
+
+    # ---------------------------
+    # 인증 (app.deps, app.routers.auth)
+    # ---------------------------
+    secret_key: str = "dev-secret-key-change-me"
+    # 검증된 JWT 디코드 결과 캐시 (토큰 sha256 기준, 항목 수 / 최대 보관 시간(초)), 0 이면 끔
+    token_cache_size: int = 10_000
+    token_cache_ttl: float = 300
+    # 로그인 유저 컬럼 스냅샷 캐시 (app.user_cache), 0 이면 끔
+    # 다른 프로세스에서 바뀐 값(정지 등)은 최대 user_cache_ttl 초 늦게 반영
+    user_cache_size: int = 10_000
+    user_cache_ttl: float = 30
+    # 로그인 시 권한 클레임(terms_agreed/user_status/user_type + 버전) 을 담은 토큰 발급 (app.token_claims)
+    # 버전 맵 항목은 token_version_ttl 초마다 DB 로 다시 확인 (다른 프로세스의 변경 반영 주기)
+    token_claims: bool = False
+    token_version_cache_size: int = 10_000
+    token_version_ttl: float = 30
+    # 운영(관리자) API 를 쓸 수 있는 user_id 목록 (쉼표 구분, 예: "1,2")
+    admin_user_ids: str = ""
+
+    # 비밀번호 로그인 (app.passwords): bcrypt 비용, 해시 전용 프로세스 수(0 이면 요청 스레드에서 계산),
+    # 밀려 있는 해시 작업이 이보다 많으면 503
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 1
+    password_max_pending: int = 64
+
+    kakao_client_id: str = ""
+    kakao_redirect_uri: str = ""
+    # 카카오 OAuth 호출 (app.kakao): 주소(벤치마크의 가짜 서버로 바꿀 때), 시간 제한(초), 재시도 횟수, 연결 풀 크기
+    kakao_auth_host: str = "https://kauth.kakao.com"
+    kakao_api_host: str = "https://kapi.kakao.com"
+    kakao_connect_timeout: float = 3.0
+    kakao_read_timeout: float = 5.0
+    kakao_retries: int = 2
+    kakao_pool_size: int = 20
+    # 카카오 로그인 완료 후, 우리가 최종적으로 보내줄 프론트 주소
+    frontend_login_success_url: str = "http://localhost:3000/login/success"
+
+    # 허용할 프론트 origin (쉼표 구분)
+    cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
+
+    # ---------------------------
+    # 매칭 (app.routers.matches, app.matching_worker)
+    # ---------------------------
+    # 매칭 워커: 별도 프로세스(python -m app.matching_worker)로 돌릴 때는 0 으로 끈다
+    run_matching_worker: bool = True
+    # 주기 매칭 라운드 방식: greedy(기본, FIFO first-fit) / maximum(최대 매칭)
+    matching_mode: str = "greedy"
+    # 라운드 1회에 선점할 최대 대기열 row 수 / 선점 유지 시간(초)
+    match_claim_batch: int = 10000
+    match_lease_seconds: int = 60
+    # 만료 처리 시 한 트랜잭션에서 다루는 최대 row 수
+    match_expire_chunk_size: int = 1000
+    # 변화가 없을 때의 라운드 간격(초) = 만료 처리 주기
+    match_worker_interval: float = 60
+    # 신호를 받은 뒤 추가 신호를 모으는 시간(초)
+    match_debounce_seconds: float = 0.2
+    # 별도 프로세스 워커가 DB 변경 여부를 확인하는 주기(초)
+    match_wake_poll_seconds: float = 0.5
+
+    @property
+    def admin_user_id_set(self) -> Set[int]:
+        return {int(uid) for uid in self.admin_user_ids.split(",") if uid.strip()}
+
+    @property
+    def cors_origin_list(self) -> List[str]:
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
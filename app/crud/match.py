@@ -1,8 +1,15 @@
-from datetime import datetime
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import and_, bindparam, insert, or_, select, update
 
 from app import models
+from app.matching import MatchingSnapshot, Pair, QueueEntry
+from app.matching_events import notify_queue_changed
 
 def get_pending_match_by_user(db: Session, user_id: int):
     """
@@ -106,6 +113,7 @@ def process_match_answer(db: Session, match_id: int, user_id: int, consent: bool
 
         db.commit()
         db.refresh(match)
+        notify_queue_changed()
         return match
 
     if not (match.a_consent is True and match.b_consent is True):
@@ -145,3 +153,367 @@ def process_match_answer(db: Session, match_id: int, user_id: int, consent: bool
     db.refresh(match)
 
     return match
+
+
+def new_worker_id() -> str:
+    """대기열 선점(claimed_by) 에 기록할 워커 식별자: host:pid:랜덤"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def is_unclaimed(now: datetime):
+    """매칭 워커가 선점하지 않았거나 선점 기한(lease) 이 지난 대기열 row"""
+    Queue = models.MatchingQueue
+    return or_(Queue.claimed_by.is_(None), Queue.lease_until < now)
+
+
+# 대기열 선점 커서: 마지막으로 가져간 row 의 (requested_at, match_id)
+ClaimCursor = Tuple[Optional[datetime], int]
+
+
+def _after_cursor(cursor: ClaimCursor):
+    """(requested_at, match_id) 순서에서 cursor 다음 row 들 (requested_at NULL 은 맨 앞)"""
+    Queue = models.MatchingQueue
+    requested_at, match_id = cursor
+    if requested_at is None:
+        return or_(
+            Queue.requested_at.is_not(None),
+            and_(Queue.requested_at.is_(None), Queue.match_id > match_id),
+        )
+    return or_(
+        Queue.requested_at > requested_at,
+        and_(Queue.requested_at == requested_at, Queue.match_id > match_id),
+    )
+
+
+def claim_pending_entries(
+    db: Session,
+    worker_id: str,
+    lease_seconds: int,
+    batch_size: int,
+    categories: Optional[List[str]] = None,
+    after: Optional[ClaimCursor] = None,
+) -> Tuple[int, Optional[ClaimCursor]]:
+    """
+    PENDING row 를 신청 순서(requested_at, match_id) 로 최대 batch_size 개 선점
+    (claimed_by / lease_until 기록) 후 commit.
+    - 후보를 고른 뒤 '아직 비어 있는 row' 조건을 붙인 UPDATE 로 선점하므로
+      여러 워커 프로세스가 동시에 실행돼도 같은 row 를 나눠 갖지 않는다.
+    - categories 를 주면 learn/teach 카테고리가 그 안에 있는 신청자만 가져간다.
+      (카테고리 샤드: 같은 카테고리로 맺어질 수 있는 A, B 가 같은 워커로 모임)
+    - after(이전 라운드 커서) 다음 row 부터 가져온다. 대기열이 batch_size 보다 길 때
+      라운드마다 이어서 훑기 위한 커서 (매칭 안 되는 오래된 row 만 계속 잡는 것 방지).
+      정렬과 같은 (requested_at, match_id) 라서 신청 시각이 match_id 순서와 달라도 건너뛰는 row 가 없다.
+    - 짝은 한 라운드에 선점한 batch_size 개 안에서만 맺어진다.
+      (서로 다른 구간에 있는 A, B 는 대기열이 한 바퀴 돌아 같은 구간에 들어올 때까지 남음)
+    (선점한 row 수, 다음 라운드 커서) 를 반환. 끝까지 훑었으면 커서는 None.
+    """
+    Queue = models.MatchingQueue
+    now = datetime.utcnow()
+    conditions = [
+        Queue.status == "PENDING",
+        Queue.user_b_id.is_(None),
+        is_unclaimed(now),
+    ]
+
+    candidates = select(Queue.match_id, Queue.requested_at).where(*conditions)
+    if after is not None:
+        candidates = candidates.where(_after_cursor(after))
+    if categories:
+        Profile = models.MatchingProfile
+        candidates = candidates.where(
+            Queue.user_a_id.in_(
+                select(Profile.user_id).where(
+                    or_(
+                        Profile.learn_category.in_(categories),
+                        Profile.teach_category.in_(categories),
+                    )
+                )
+            )
+        )
+    rows = db.execute(
+        candidates.order_by(Queue.requested_at.asc(), Queue.match_id.asc()).limit(batch_size)
+    ).all()
+    next_cursor = (rows[-1].requested_at, rows[-1].match_id) if len(rows) == batch_size else None
+    if not rows:
+        db.commit()
+        return 0, next_cursor
+    ids = [row.match_id for row in rows]
+
+    claimed = db.execute(
+        update(Queue)
+        .where(Queue.match_id.in_(ids), *conditions)
+        .values(
+            claimed_by=worker_id,
+            lease_until=now + timedelta(seconds=lease_seconds),
+        )
+    ).rowcount
+    db.commit()
+    return claimed, next_cursor
+
+
+def release_claims(db: Session, worker_id: str) -> None:
+    Queue = models.MatchingQueue
+    db.execute(
+        update(Queue)
+        .where(Queue.claimed_by == worker_id)
+        .values(claimed_by=None, lease_until=None)
+    )
+    db.commit()
+
+
+def load_matching_snapshot(db: Session, worker_id: Optional[str]) -> MatchingSnapshot:
+    """
+    worker_id 가 선점한 대기열로 매칭 라운드용 스냅샷을 쿼리 1번으로 읽어 온다.
+    PENDING 대기열 row + 신청자(user_type, nickname) + 매칭 프로필(learn/teach 카테고리)
+    프로필이 없는 유저(재능 카드 미등록) 는 learn/teach 가 None → 매칭 대상 아님.
+    worker_id=None 이면 선점 여부와 관계없이 대기열 전체 (dry-run 용, 읽기 전용)
+    """
+    Queue = models.MatchingQueue
+    Profile = models.MatchingProfile
+
+    rows = db.execute(
+        select(
+            Queue.match_id,
+            Queue.user_a_id,
+            Queue.requested_at,
+            models.User.user_type,
+            models.User.nickname,
+            Profile.learn_category,
+            Profile.teach_category,
+        )
+        .join(models.User, models.User.user_id == Queue.user_a_id)
+        .outerjoin(Profile, Profile.user_id == Queue.user_a_id)
+        .where(
+            Queue.status == "PENDING",
+            Queue.user_b_id.is_(None),
+            *([Queue.claimed_by == worker_id] if worker_id is not None else []),
+        )
+        .order_by(Queue.requested_at.asc(), Queue.match_id.asc())
+    ).all()
+
+    snapshot = MatchingSnapshot()
+    for match_id, user_id, requested_at, user_type, nickname, learn, teach in rows:
+        snapshot.nicknames[user_id] = nickname
+        snapshot.entries.append(
+            QueueEntry(
+                match_id=match_id,
+                user_id=user_id,
+                requested_at=requested_at,
+                user_type=user_type,
+                learn=learn,
+                teach=teach,
+            )
+        )
+    return snapshot
+
+
+def match_new_entry(
+    db: Session,
+    new_entry: models.MatchingQueue,
+    user: models.User,
+    teach_category: str,
+    candidate_limit: int = 5,
+):
+    """
+    방금 대기열에 들어온 한 명(new_entry)만 기존 대기자와 맞춰 본다. (전체 스캔 X)
+
+    FIFO 상 신규 신청자는 항상 맨 뒤이므로 B 쪽으로만 짝이 될 수 있다.
+    → '배우고 싶은 재능' 이 내 teach 카테고리와 같고 세대가 다른 대기자 중
+      가장 먼저 신청한 사람(A) 의 row 를 CONFIRMED 로 바꾸고 내 row 는 취소.
+
+    A row 는 조건부 UPDATE(status='PENDING' AND user_b_id IS NULL, 워커 미선점) 로
+    가져오므로 동시에 들어온 요청/매칭 워커와 같은 row 를 두 번 쓰지 않는다.
+    매칭되면 A row, 아니면 None 반환 (남은 대기자는 주기 작업이 처리).
+
+    워커 라운드가 선점(lease) 중인 대기자는 후보에서 빠진다. 그래서 라운드 도중에 들어온
+    신청은 맞는 상대가 있어도 None(→ QUEUED) 이 된다. 호출한 쪽은 None 이면
+    notify_queue_changed() 로 워커를 깨워야 한다. 라운드가 끝나며 선점이 풀린 뒤
+    디바운스 후 다음 라운드에서 짝이 된다. (benchmarks/check_enqueue_during_round.py)
+    """
+    Queue = models.MatchingQueue
+    Profile = models.MatchingProfile
+    now = datetime.utcnow()
+
+    # 첫 번째 Learn 카드의 카테고리가 내 teach 카테고리와 같고 세대가 다른 유저
+    candidates = db.execute(
+        select(Queue.match_id, Queue.user_a_id, models.User.nickname)
+        .join(Profile, Profile.user_id == Queue.user_a_id)
+        .join(models.User, models.User.user_id == Queue.user_a_id)
+        .where(
+            Profile.learn_category == teach_category,
+            Profile.is_matchable.is_(True),     # learn/teach 카드 보유 + 매칭 대상 세대
+            Queue.status == "PENDING",
+            Queue.user_b_id.is_(None),
+            is_unclaimed(now),
+            Queue.user_a_id != user.user_id,
+            or_(
+                Queue.requested_at < new_entry.requested_at,
+                and_(
+                    Queue.requested_at == new_entry.requested_at,
+                    Queue.match_id < new_entry.match_id,
+                ),
+            ),
+            Profile.user_type != user.user_type,
+        )
+        .order_by(Queue.requested_at.asc(), Queue.match_id.asc())
+        .limit(candidate_limit)
+    ).all()
+
+    for match_id, partner_id, partner_nickname in candidates:
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(Queue)
+            .where(
+                Queue.match_id == match_id,
+                Queue.status == "PENDING",
+                Queue.user_b_id.is_(None),
+                is_unclaimed(now),
+            )
+            .values(
+                user_b_id=user.user_id,
+                status="CONFIRMED",
+                shared_category=teach_category,
+                confirmed_at=now,
+                a_consent=None,
+                b_consent=None,
+            )
+        ).rowcount
+        closed = db.execute(
+            update(Queue)
+            .where(
+                Queue.match_id == new_entry.match_id,
+                Queue.status == "PENDING",
+                is_unclaimed(now),
+            )
+            .values(status="CANCELED", canceled_at=now)
+        ).rowcount
+
+        if closed != 1:
+            # 그 사이 매칭 워커가 내 row 를 가져갔거나 이미 처리함
+            db.rollback()
+            return None
+        if claimed != 1:
+            # 다른 요청이 먼저 가져감 → 다음 후보
+            db.rollback()
+            continue
+
+        for row in match_found_notification_rows(
+            match_id,
+            teach_category,
+            partner_id, partner_nickname,
+            user.user_id, user.nickname,
+        ):
+            db.add(models.Notification(**row))
+        db.commit()
+        return get_match_by_id(db, match_id)
+
+    return None
+
+
+def match_found_notification_rows(
+    match_id: int,
+    category: Optional[str],
+    user_a_id: int,
+    nickname_a: str,
+    user_b_id: int,
+    nickname_b: str,
+) -> List[dict]:
+    category = category or "재능 교환"
+    link_path = f"/matches/{match_id}"
+    return [
+        {
+            "user_id": user_a_id,
+            "type": "MATCH_FOUND",
+            "content": f"{nickname_b}님과 '{category}' 재능 교환 가능성이 생겼습니다!",
+            "link_path": link_path,
+            "is_read": False,
+        },
+        {
+            "user_id": user_b_id,
+            "type": "MATCH_FOUND",
+            "content": f"{nickname_a}님과 '{category}' 재능 교환 가능성이 생겼습니다!",
+            "link_path": link_path,
+            "is_read": False,
+        },
+    ]
+
+
+def matched_pair_rows(
+    pairs: List[Pair],
+    nicknames: Dict[int, str],
+) -> Tuple[List[dict], List[dict], List[dict]]:
+    """apply_matched_pairs 가 executemany 로 넘기는 (CONFIRMED, CANCELED, 알림) 파라미터 목록"""
+    # A row를 최종 매칭 row로 사용, B row는 취소
+    confirmed = [
+        {"row_id": a.match_id, "user_b_id": b.user_id, "shared_category": a.learn}
+        for a, b in pairs
+    ]
+    canceled = [{"row_id": b.match_id} for _, b in pairs]
+    notifs = [
+        row
+        for a, b in pairs
+        for row in match_found_notification_rows(
+            a.match_id,
+            a.learn,
+            a.user_id, nicknames[a.user_id],
+            b.user_id, nicknames[b.user_id],
+        )
+    ]
+    return confirmed, canceled, notifs
+
+
+def apply_matched_pairs(
+    db: Session,
+    pairs: List[Pair],
+    nicknames: Dict[int, str],
+    worker_id: str,
+) -> int:
+    """
+    매칭 결과 반영: A row → CONFIRMED, B row → CANCELED, MATCH_FOUND 알림 2건씩.
+
+    worker_id 가 선점한 PENDING row 만 바꾼다. 보통은 executemany 로 pair 수와 상관없이
+    statement 3개에 끝나지만, 중간에 만료/취소된 row 가 있어 갱신 건수가 맞지 않으면
+    되돌린 뒤 pair 단위로 다시 반영한다. (어느 row 도 두 번 매칭되지 않음)
+    반영된 pair 수를 반환.
+    """
+    if not pairs:
+        return 0
+
+    Queue = models.MatchingQueue.__table__
+    now = datetime.utcnow()
+    owned = (
+        Queue.c.match_id == bindparam("row_id"),
+        Queue.c.status == "PENDING",
+        Queue.c.user_b_id.is_(None),
+        Queue.c.claimed_by == worker_id,
+    )
+    confirm = update(Queue).where(*owned).values(
+        status="CONFIRMED",
+        confirmed_at=now,
+        a_consent=None,
+        b_consent=None,
+    )
+    cancel = update(Queue).where(*owned).values(status="CANCELED", canceled_at=now)
+
+    def write(batch: List[Pair]) -> bool:
+        confirmed, canceled, notifs = matched_pair_rows(batch, nicknames)
+        if db.execute(confirm, confirmed).rowcount != len(batch):
+            return False
+        if db.execute(cancel, canceled).rowcount != len(batch):
+            return False
+        db.execute(insert(models.Notification.__table__), notifs)
+        return True
+
+    if write(pairs):
+        db.commit()
+        return len(pairs)
+    db.rollback()
+
+    written = 0
+    for pair in pairs:
+        if write([pair]):
+            db.commit()
+            written += 1
+        else:
+            db.rollback()
+    return written
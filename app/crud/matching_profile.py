@@ -0,0 +1,113 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import models
+from app.matching import MATCHABLE_USER_TYPES
+
+
+def profile_values(
+    user_type: Optional[str],
+    learn_category: Optional[str],
+    teach_category: Optional[str],
+) -> dict:
+    user_type = user_type or "UNKNOWN"
+    return {
+        "user_type": user_type,
+        "learn_category": learn_category,
+        "teach_category": teach_category,
+        "is_matchable": (
+            user_type in MATCHABLE_USER_TYPES
+            and learn_category is not None
+            and teach_category is not None
+        ),
+    }
+
+
+def first_card_categories(rows: Iterable[Tuple[int, str, str]]) -> Dict[Tuple[int, str], str]:
+    """(user_id, 소문자 type, category) 를 talent_id 순으로 받아 유저별 첫 카드만 남김"""
+    categories: Dict[Tuple[int, str], str] = {}
+    for user_id, t_type, category in rows:
+        categories.setdefault((user_id, t_type), category)
+    return categories
+
+
+#매칭 프로필 갱신 (재능 등록 / 프로필 수정 시 호출, commit 은 호출한 쪽에서)
+def refresh_matching_profile(db: Session, user: models.User) -> models.MatchingProfile:
+    db.flush()  # 같은 트랜잭션에서 방금 추가한 재능 카드도 보이도록
+
+    talent_type = func.lower(models.Talent.type)
+    categories = first_card_categories(
+        db.execute(
+            select(models.Talent.user_id, talent_type, models.Talent.category)
+            .where(
+                models.Talent.user_id == user.user_id,
+                talent_type.in_(["learn", "teach"]),
+            )
+            .order_by(models.Talent.talent_id.asc())
+        ).all()
+    )
+    values = profile_values(
+        user.user_type,
+        categories.get((user.user_id, "learn")),
+        categories.get((user.user_id, "teach")),
+    )
+
+    profile = db.get(models.MatchingProfile, user.user_id)
+    if profile is None:
+        profile = models.MatchingProfile(user_id=user.user_id, **values)
+        db.add(profile)
+    else:
+        for key, value in values.items():
+            setattr(profile, key, value)
+    return profile
+
+
+def backfill_matching_profiles(conn: Connection, chunk_size: int = 10_000) -> int:
+    """
+    matching_profiles 가 없는 유저 중 재능 카드가 있는 유저의 프로필을 채운다.
+    (테이블 추가 전부터 있던 데이터용, app.migrations.upgrade 에서 호출)
+    """
+    Profile = models.MatchingProfile
+    missing_users = (
+        select(models.Talent.user_id)
+        .where(models.Talent.user_id.not_in(select(Profile.user_id)))
+        .distinct()
+    )
+    user_types = dict(
+        conn.execute(
+            select(models.User.user_id, models.User.user_type)
+            .where(models.User.user_id.in_(missing_users))
+        ).all()
+    )
+    if not user_types:
+        return 0
+
+    talent_type = func.lower(models.Talent.type)
+    categories = first_card_categories(
+        conn.execute(
+            select(models.Talent.user_id, talent_type, models.Talent.category)
+            .where(
+                models.Talent.user_id.in_(missing_users),
+                talent_type.in_(["learn", "teach"]),
+            )
+            .order_by(models.Talent.talent_id.asc())
+        ).all()
+    )
+
+    rows = [
+        {
+            "user_id": user_id,
+            **profile_values(
+                user_type,
+                categories.get((user_id, "learn")),
+                categories.get((user_id, "teach")),
+            ),
+        }
+        for user_id, user_type in user_types.items()
+    ]
+    for start in range(0, len(rows), chunk_size):
+        conn.execute(insert(Profile), rows[start:start + chunk_size])
+    return len(rows)
@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+
+
+# ------------------------------
+# 쪽지 목록 (list_chats) : 대화 수와 관계없이 쿼리 4번
+# ------------------------------
+def chat_matches_stmt(user_id: int):
+    """내 CONFIRMED 매칭 + 상대 유저 (상대 유저가 없으면 제외)"""
+    Queue = models.MatchingQueue
+    partner_id = case((Queue.user_a_id == user_id, Queue.user_b_id), else_=Queue.user_a_id)
+    return (
+        select(Queue.match_id, Queue.shared_category, models.User)
+        .join(models.User, models.User.user_id == partner_id)
+        .where(
+            Queue.status == "CONFIRMED",
+            or_(Queue.user_a_id == user_id, Queue.user_b_id == user_id),
+        )
+    )
+
+
+def block_pairs_stmt(user_id: int):
+    """내가 차단했거나 나를 차단한 (blocker_id, blocked_id)"""
+    return select(models.Block.blocker_id, models.Block.blocked_id).where(
+        or_(models.Block.blocker_id == user_id, models.Block.blocked_id == user_id)
+    )
+
+
+def last_messages_stmt(match_ids: List[int]):
+    """매칭별 가장 최근 메시지 (match_id, content, timestamp)"""
+    Message = models.Message
+    ranked = (
+        select(
+            Message.match_id,
+            Message.content,
+            Message.timestamp,
+            func.row_number().over(
+                partition_by=Message.match_id,
+                order_by=(Message.timestamp.desc(), Message.message_id.desc()),
+            ).label("rn"),
+        )
+        .where(Message.match_id.in_(match_ids))
+        .subquery()
+    )
+    return select(ranked.c.match_id, ranked.c.content, ranked.c.timestamp).where(ranked.c.rn == 1)
+
+
+def unread_counts_stmt(user_id: int, match_ids: List[int]):
+    """매칭별 내가 받은 안 읽은 메시지 수"""
+    Message = models.Message
+    return (
+        select(Message.match_id, func.count())
+        .where(
+            and_(
+                Message.match_id.in_(match_ids),
+                Message.sender_id != user_id,
+                Message.is_read.is_(False),
+            )
+        )
+        .group_by(Message.match_id)
+    )
+
+
+def build_chat_summaries(
+    user_id: int,
+    match_rows: Iterable[Tuple[int, str, models.User]],
+    block_rows: Iterable[Tuple[int, int]],
+    last_rows: Iterable[Tuple[int, str, datetime]],
+    unread_rows: Iterable[Tuple[int, int]],
+) -> List[schemas.ChatSummary]:
+    blocked: Set[int] = {
+        blocked_id if blocker_id == user_id else blocker_id
+        for blocker_id, blocked_id in block_rows
+    }
+    last: Dict[int, Tuple[str, datetime]] = {
+        match_id: (content, timestamp) for match_id, content, timestamp in last_rows
+    }
+    unread: Dict[int, int] = dict(unread_rows)
+
+    results: List[schemas.ChatSummary] = []
+    for match_id, shared_category, partner in match_rows:
+        if partner.user_id in blocked:
+            continue
+        content, timestamp = last.get(match_id, (None, None))
+        results.append(
+            schemas.ChatSummary(
+                match_id=match_id,
+                partner_id=partner.user_id,
+                partner_nickname=partner.nickname,
+                partner_profile_image=getattr(partner, "profile_image", None),
+                shared_category=shared_category,
+                last_message=content,
+                last_message_time=timestamp,
+                unread_count=unread.get(match_id, 0),
+            )
+        )
+
+    # 정렬: 최신 메시지 시간 기준 내림차순
+    results.sort(key=lambda x: x.last_message_time or datetime.min, reverse=True)
+    return results
+
+
+def list_chat_summaries(db: Session, user_id: int) -> List[schemas.ChatSummary]:
+    match_rows = db.execute(chat_matches_stmt(user_id)).all()
+    if not match_rows:
+        return []
+    match_ids = [row[0] for row in match_rows]
+    return build_chat_summaries(
+        user_id,
+        match_rows,
+        db.execute(block_pairs_stmt(user_id)).all(),
+        db.execute(last_messages_stmt(match_ids)).all(),
+        db.execute(unread_counts_stmt(user_id, match_ids)).all(),
+    )
+
+
+async def list_chat_summaries_async(db: AsyncSession, user_id: int) -> List[schemas.ChatSummary]:
+    match_rows = (await db.execute(chat_matches_stmt(user_id))).all()
+    if not match_rows:
+        return []
+    match_ids = [row[0] for row in match_rows]
+    return build_chat_summaries(
+        user_id,
+        match_rows,
+        (await db.execute(block_pairs_stmt(user_id))).all(),
+        (await db.execute(last_messages_stmt(match_ids))).all(),
+        (await db.execute(unread_counts_stmt(user_id, match_ids))).all(),
+    )
+
+
+# ------------------------------
+# 읽음 처리
+# ------------------------------
+def mark_read_stmt(match_id: int, user_id: int):
+    """매칭에서 내가 받은 안 읽은 메시지를 한 번에 읽음 처리 (rowcount = 바뀐 수)"""
+    Message = models.Message
+    return (
+        update(Message)
+        .where(
+            Message.match_id == match_id,
+            Message.sender_id != user_id,
+            Message.is_read.is_(False),
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
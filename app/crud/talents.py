@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.models import Talent as DBTalent, User
 from app import models, schemas
+from app.crud.matching_profile import refresh_matching_profile
+from app.matching_events import notify_queue_changed
 
 #재능 생성
 def create_talent(db: Session, talent: schemas.TalentCreate, user_id: int):
@@ -15,8 +17,12 @@ def create_talent(db: Session, talent: schemas.TalentCreate, user_id: int):
     )
 
     db.add(db_talent)
+    user = db.get(User, user_id)
+    if user is not None:
+        refresh_matching_profile(db, user)
     db.commit()
     db.refresh(db_talent)
+    notify_queue_changed()
     return db_talent
 
 
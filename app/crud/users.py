@@ -0,0 +1,95 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+# ------------------------------
+# 소셜 로그인: 있으면 조회, 없으면 가입 (문장 1번, 동시 첫 로그인에도 unique 충돌 없음)
+# ------------------------------
+def _new_social_user(provider: str, social_id: str, nickname: str) -> dict:
+    return {
+        "social_provider": provider,
+        "social_id": social_id,
+        "nickname": nickname,
+        "user_type": "YOUNG",
+        "hashed_password": None,  # 소셜로그인 전용
+    }
+
+
+def social_user_upsert_stmt(dialect_name: str, values: dict):
+    """
+    sqlite : INSERT ... ON CONFLICT(social_id) DO UPDATE ... RETURNING users.*  → User
+    mysql  : INSERT ... ON DUPLICATE KEY UPDATE user_id = LAST_INSERT_ID(user_id) → lastrowid 가 user_id
+    그 밖의 DB 는 None (select → insert 로 처리)
+    기존 유저의 닉네임 등은 바꾸지 않는다. (DO UPDATE 는 RETURNING 을 받기 위한 no-op)
+    """
+    if dialect_name == "sqlite":
+        stmt = sqlite_insert(models.User).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.User.social_id],
+            set_={"social_id": stmt.excluded.social_id},
+        )
+        return stmt.returning(models.User)
+    if dialect_name == "mysql":
+        stmt = mysql_insert(models.User.__table__).values(**values)
+        return stmt.on_duplicate_key_update(user_id=func.last_insert_id(models.User.user_id))
+    return None
+
+
+def _social_user_stmt(provider: str, social_id: str):
+    return select(models.User).where(
+        models.User.social_provider == provider,
+        models.User.social_id == social_id,
+    ).limit(1)
+
+
+def upsert_social_user(db: Session, provider: str, social_id: str, nickname: str) -> models.User:
+    """
+    소셜 계정의 User (없으면 만든다). commit 은 호출한 쪽에서.
+    기존 유저는 SELECT 1번 (쓰기 없음), 첫 로그인은 sqlite 기준 SELECT + upsert 2번
+    (mysql 은 RETURNING 이 없어 PK 조회 1번 더)
+    """
+    user = db.scalar(_social_user_stmt(provider, social_id))
+    if user is not None:
+        return user
+
+    values = _new_social_user(provider, social_id, nickname)
+    dialect_name = db.get_bind().dialect.name
+    stmt = social_user_upsert_stmt(dialect_name, values)
+    if stmt is None:
+        return _insert_or_select(db, provider, social_id, values)
+    if dialect_name == "mysql":
+        return db.get(models.User, db.execute(stmt).lastrowid)
+    return db.scalars(stmt, execution_options={"populate_existing": True}).one()
+
+
+def _insert_or_select(db: Session, provider: str, social_id: str, values: dict) -> models.User:
+    try:
+        with db.begin_nested():
+            user = models.User(**values)
+            db.add(user)
+    except IntegrityError:
+        # 동시에 들어온 첫 로그인이 먼저 만든 경우
+        user = db.scalar(_social_user_stmt(provider, social_id))
+    return user
+
+
+async def upsert_social_user_async(db: AsyncSession, provider: str, social_id: str, nickname: str) -> models.User:
+    """upsert_social_user 의 async 버전 (ASYNC_DB=1)"""
+    user = await db.scalar(_social_user_stmt(provider, social_id))
+    if user is not None:
+        return user
+
+    values = _new_social_user(provider, social_id, nickname)
+    dialect_name = db.get_bind().dialect.name
+    stmt = social_user_upsert_stmt(dialect_name, values)
+    if stmt is None:
+        return await db.run_sync(lambda session: _insert_or_select(session, provider, social_id, values))
+    if dialect_name == "mysql":
+        return await db.get(models.User, (await db.execute(stmt)).lastrowid)
+    return (await db.scalars(stmt, execution_options={"populate_existing": True})).one()
@@ -1,15 +1,140 @@
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator
+from typing import AsyncGenerator, Dict, Generator, Optional
+
+from app import slow_query
+from app.config import get_settings
+
+# 설정 설명은 app.config.Settings 참고
+settings = get_settings()
+
+DATABASE_URL: str = settings.database_url
+
+# 커넥션 풀
+DB_POOL_SIZE: int = settings.db_pool_size
+DB_MAX_OVERFLOW: int = settings.db_max_overflow
+DB_POOL_TIMEOUT: float = settings.db_pool_timeout
+DB_POOL_RECYCLE: int = settings.db_pool_recycle
+
+# SQLite PRAGMA (연결마다 적용)
+SQLITE_JOURNAL_MODE: str = settings.sqlite_journal_mode
+SQLITE_SYNCHRONOUS: str = settings.sqlite_synchronous
+SQLITE_BUSY_TIMEOUT_MS: int = settings.sqlite_busy_timeout_ms
+SQLITE_MMAP_SIZE: int = settings.sqlite_mmap_size
+SQLITE_CACHE_SIZE_KB: int = settings.sqlite_cache_size_kb
+
+# 비동기 엔진
+ASYNC_DB: bool = settings.async_db
+ASYNC_DATABASE_URL: str = settings.async_database_url
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "mysql": "aiomysql"}
+
+# 읽기 전용 복제본
+READ_DATABASE_URL: str = settings.read_database_url
+READ_YOUR_WRITES_SECONDS: float = settings.read_your_writes_seconds
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(database_url: str) -> dict:
+    """백엔드별 create_engine 옵션"""
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        # 메모리 DB 는 SQLAlchemy 기본(연결 1개 공유) 풀을 그대로 사용
+        if not _is_sqlite_memory(url):
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=0, pool_timeout=DB_POOL_TIMEOUT)
+        return options
+
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        # 끊긴 연결(서버 재시작, 타임아웃) 을 꺼내 쓰기 전에 확인
+        "pool_pre_ping": True,
+    }
+
+
+def sqlite_pragmas(memory: bool = False) -> list:
+    pragmas = [
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if not memory:
+        pragmas += [
+            f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}",
+            f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        ]
+    return pragmas
+
+
+def _install_sqlite_pragmas(sync_engine, url) -> None:
+    pragmas = sqlite_pragmas(memory=_is_sqlite_memory(url))
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_db_engine(database_url: str = DATABASE_URL):
+    db_engine = create_engine(database_url, **engine_options(database_url))
+
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(db_engine, url)
+    slow_query.install(db_engine)
+
+    return db_engine
+
+
+def async_database_url(database_url: str) -> str:
+    """동기 DATABASE_URL → 같은 DB 를 가리키는 async 드라이버 URL"""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"async 드라이버를 알 수 없는 DB 입니다: {url.get_backend_name()}")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
 
-DATABASE_URL = "sqlite:///./app.db"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+def create_async_db_engine(database_url: str):
+    db_engine = create_async_engine(database_url, **engine_options(database_url))
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(db_engine.sync_engine, url)
+    slow_query.install(db_engine.sync_engine)
+
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL)
+
+
+class PrimarySession(Session):
+    """
+    primary DB 세션 (SessionLocal, AsyncSessionLocal 의 sync_session).
+    info["user_id"] 가 있으면 commit 시 read-your-writes 기록을 남긴다.
+    """
+
+
+SessionLocal = sessionmaker(class_=PrimarySession, autocommit=False, autoflush=False, bind=engine)
+
+read_engine = create_db_engine(READ_DATABASE_URL) if READ_DATABASE_URL else engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
@@ -18,4 +143,62 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ---------------------------
+# read-your-writes: 최근에 commit 한 유저 (프로세스 단위)
+# ---------------------------
+_recent_writes: Dict[int, float] = {}
+_recent_writes_lock = threading.Lock()
+
+
+def record_user_write(user_id: int) -> None:
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[user_id] = now
+        # 오래된 항목 정리 (맵이 커질 때만)
+        if len(_recent_writes) > 10_000:
+            for uid, at in list(_recent_writes.items()):
+                if now - at > READ_YOUR_WRITES_SECONDS:
+                    del _recent_writes[uid]
+
+
+def wrote_recently(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    at = _recent_writes.get(user_id)
+    return at is not None and time.monotonic() - at < READ_YOUR_WRITES_SECONDS
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_session_user_write(session) -> None:
+    # get_current_user(_async) 가 session.info["user_id"] 에 로그인 유저를 넣어 둔다
+    # (async 세션은 sync_session.info)
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        record_user_write(user_id)
+
+
+def session_for_read(user_id: Optional[int] = None) -> Session:
+    """복제본 세션. 복제본이 없거나 user_id 가 방금 쓴 유저면 primary 세션"""
+    if read_engine is engine or wrote_recently(user_id):
+        return SessionLocal()
+    return ReadSessionLocal()
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+# async 드라이버(aiosqlite / aiomysql) 와 greenlet 은 ASYNC_DB=1 인 배포에만 필요
+if ASYNC_DB:
+    async_engine = create_async_db_engine(ASYNC_DATABASE_URL or async_database_url(DATABASE_URL))
+    # commit 후 응답 변환 시 lazy load(동기 IO) 가 일어나지 않도록 expire 하지 않음
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, sync_session_class=PrimarySession, autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
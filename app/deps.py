@@ -1,48 +1,47 @@
-from typing import Generator, Optional
-from fastapi import Header, HTTPException, Depends
-from sqlalchemy.orm import Session
-from .db import SessionLocal
-from . import models
-
-import os
+import hashlib
+import time
+from typing import Generator, Optional, Union
 from datetime import datetime, timedelta
-from typing import Optional
 
-from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-import os
 
-from dotenv import load_dotenv
-from app.db import SessionLocal
-from app import models
+from app.cache import TTLCache
+from app.config import get_settings
+from app.db import SessionLocal, get_async_db, session_for_read
+from app import models, passwords
+from app.token_claims import TOKEN_CLAIMS, TokenUser, claims_for, confirm_claims, user_from_claims
+from app.user_cache import cached_user, remember_user
 
-# ====================
-# 환경변수 로드
-# ====================
-load_dotenv()
+settings = get_settings()
 
 # ====================
 # JWT 설정
 # ====================
-SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-me")
+SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1일
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 운영(관리자) API 를 쓸 수 있는 user_id 목록 (ADMIN_USER_IDS, 쉼표 구분)
+ADMIN_USER_IDS = settings.admin_user_id_set
+
+# 검증된 토큰의 payload 캐시: 같은 토큰으로 반복 호출(알림 뱃지 폴링 등) 시 서명 검증/JSON 파싱 생략
+# 키는 토큰 원문 대신 sha256 digest, 항목은 토큰의 exp 까지만 유효
+TOKEN_CACHE_SIZE: int = settings.token_cache_size
+TOKEN_CACHE_TTL: float = settings.token_cache_ttl
+token_cache = TTLCache("jwt", maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
 
 # ====================
-# 비밀번호 해시/검증
+# 비밀번호 해시/검증 (app.passwords: bcrypt 를 프로세스 풀에서)
 # ====================
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return passwords.hash_password(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return passwords.verify_password(plain_password, hashed_password)
 
 # ====================
 # DB 세션
@@ -55,6 +54,18 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# ====================
+# 읽기 전용 DB 세션 (READ_DATABASE_URL 복제본)
+# ====================
+def get_read_db() -> Generator[Session, None, None]:
+    """로그인과 무관한 조회용 (통계 등)"""
+    db = session_for_read()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 # ====================
 # JWT Access Token 생성
 # ====================
@@ -73,6 +84,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_user_access_token(user: models.User) -> str:
+    """로그인 응답용 토큰. TOKEN_CLAIMS=1 이면 권한 클레임 포함 (app.token_claims)"""
+    if TOKEN_CLAIMS:
+        return create_access_token(data=claims_for(user))
+    return create_access_token(data={"sub": str(user.user_id)})
+
+
 # ====================
 # HTTP Bearer 스키마 (Swagger용)
 # ====================
@@ -96,22 +114,137 @@ def get_current_user(
     )
 
     # JWT 디코드
+    user_id = user_id_from_token(token, credentials_exception)
+
+    # DB 조회 (app.user_cache 에 있으면 생략)
+    user = cached_user(db, user_id)
+    if user is None:
+        user = db.query(models.User).get(user_id)
+        if user is None:
+            raise credentials_exception
+        remember_user(user)
+
+    # 이 세션의 commit 을 read-your-writes 기록에 남기기 위함 (app.db)
+    db.info["user_id"] = user.user_id
+    return user
+
+
+def decode_token(token: str) -> dict:
+    """서명/만료 검증된 payload (실패 시 JWTError). 검증 결과는 token_cache 에 exp 까지 보관"""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+
+def payload_from_token(token: str, credentials_exception: HTTPException) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
+        payload = decode_token(token)
+        if payload.get("sub") is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    return payload
+
+
+def user_id_from_token(token: str, credentials_exception: HTTPException) -> int:
+    return int(payload_from_token(token, credentials_exception)["sub"])
 
-    # DB 조회
-    user = db.query(models.User).get(int(user_id))
+
+# ====================
+# 현재 로그인한 유저 (async 라우트용, ASYNC_DB=1)
+# ====================
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="로그인이 필요합니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    user_id = user_id_from_token(credentials.credentials, credentials_exception)
+    user = cached_user(db.sync_session, user_id)
     if user is None:
-        raise credentials_exception
+        user = await db.get(models.User, user_id)
+        if user is None:
+            raise credentials_exception
+        remember_user(user)
+
+    # get_current_user 와 같이 commit 을 read-your-writes 기록에 남김 (app.db)
+    db.sync_session.info["user_id"] = user.user_id
+    return user
+
+
+# ====================
+# 토큰 클레임만으로 로그인 유저 확인 (알림 뱃지, 쪽지 목록 등)
+# ====================
+def get_token_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> Union[TokenUser, models.User]:
+    """
+    user_id / terms_agreed / user_status / user_type 만 쓰는 라우트용.
+    버전이 최신인 클레임 토큰이면 users 조회 없이 TokenUser, 아니면 get_current_user 와 같이 DB 조회
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="로그인이 필요합니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = payload_from_token(credentials.credentials, credentials_exception)
+    token_user = user_from_claims(payload)
+    if token_user is not None:
+        return token_user
+
+    user = get_current_user(credentials, db)
+    confirm_claims(payload, user)
+    return user
 
+
+async def get_token_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Union[TokenUser, models.User]:
+    """get_token_user 의 async 버전 (ASYNC_DB=1)"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="로그인이 필요합니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = payload_from_token(credentials.credentials, credentials_exception)
+    token_user = user_from_claims(payload)
+    if token_user is not None:
+        return token_user
+
+    user = await get_current_user_async(credentials, db)
+    confirm_claims(payload, user)
     return user
 
 
+# ====================
+# 로그인 유저의 읽기 전용 DB 세션
+# ====================
+def get_user_read_db(
+    current_user: Union[TokenUser, models.User] = Depends(get_token_user),
+) -> Generator[Session, None, None]:
+    """
+    복제본 세션. 단, 방금(READ_YOUR_WRITES_SECONDS 안에) 쓴 유저는 primary 세션을 받아
+    자기가 보낸 쪽지/읽음 처리를 바로 본다.
+    """
+    db = session_for_read(current_user.user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 # ====================
 # 세대 구분 유틸 함수
 # ====================
@@ -139,3 +272,35 @@ def get_active_user(
             detail="서비스를 이용하려면 약관에 동의해야 합니다.",
         )
     return current_user
+
+
+async def get_active_user_async(
+    current_user: models.User = Depends(get_current_user_async),
+) -> models.User:
+    return get_active_user(current_user)
+
+
+def get_active_token_user(
+    current_user: Union[TokenUser, models.User] = Depends(get_token_user),
+) -> Union[TokenUser, models.User]:
+    return get_active_user(current_user)
+
+
+async def get_active_token_user_async(
+    current_user: Union[TokenUser, models.User] = Depends(get_token_user_async),
+) -> Union[TokenUser, models.User]:
+    return get_active_user(current_user)
+
+
+# ====================
+# 관리자만 허용 (ADMIN_USER_IDS)
+# ====================
+def get_admin_user(
+    current_user: models.User = Depends(get_current_user),
+) -> models.User:
+    if current_user.user_id not in ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자만 사용할 수 있습니다.",
+        )
+    return current_user
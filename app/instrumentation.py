@@ -0,0 +1,207 @@
+# app/instrumentation.py
+"""
+SQL 실행 계측
+
+    with track_queries() as stats:
+        run_matching_once(db)
+    print(stats.statements, stats.seconds)
+
+Engine 클래스 전체에 리스너를 걸어 두고, track_queries() 블록 안(같은 context)에서
+실행된 statement 만 센다. 다른 스레드/요청의 쿼리는 섞이지 않는다.
+
+요청 단위 (QueryCountMiddleware, app.main 에서 등록)
+- DEBUG=1 이면 응답 헤더 X-DB-Queries / X-DB-Time(ms)
+- 같은 모양의 statement 가 한 요청에서 N_PLUS_ONE_THRESHOLD 번을 넘으면 경고 로그 (N+1 의심)
+- current_route(): 지금 처리 중인 요청의 "METHOD /경로/{템플릿}" (app.slow_query 로그용)
+
+쿼리 예산 (테스트/점검 스크립트용, benchmarks.check_query_budgets)
+
+    with query_budget(4):
+        client.get("/messages/messages")     # statement 가 4개를 넘으면 QueryBudgetExceeded
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# IN (?, ?, ?) / VALUES (?, ?), (?, ?) 처럼 파라미터 개수만 다른 statement 를 같은 모양으로
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    __slots__ = ("statements", "seconds", "shapes")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def repeated_shapes(self, threshold: int) -> List[tuple]:
+        """threshold 번을 넘게 실행된 (shape, 횟수) 목록"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# 처리 중인 요청의 ASGI scope (라우팅 후 scope["route"] 가 채워진다)
+_current_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+# query_budget: 스레드/context 와 무관하게 프로세스 전체 statement 를 모은다
+_global_stats: List[QueryStats] = []
+_global_lock = threading.Lock()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _active_stats() -> List[QueryStats]:
+    stats = _current_stats.get()
+    active = [stats] if stats is not None else []
+    if _global_stats:
+        with _global_lock:
+            active.extend(_global_stats)
+    return active
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    active = _active_stats()
+    if not active:
+        return
+    shape = statement_shape(statement)
+    for stats in active:
+        stats.statements += 1
+        stats.shapes[shape] += 1
+    # 시작 시각은 실행 단위(context) 에 둔다. 연결(conn.info) 에 두면 실패한 문장
+    # (after_cursor_execute 가 안 불림) 의 값이 풀에 돌아간 연결에 계속 남는다.
+    # context 가 없는 실행(시퀀스/기본값 선실행) 은 시간을 재지 않음
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _time_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    for stats in _active_stats():
+        stats.seconds += elapsed
+
+
+def route_template(scope: dict) -> Optional[str]:
+    """라우팅된 경로 템플릿 (예: /messages/messages/{match_id}), 매칭된 라우트가 없으면 None"""
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return None
+    # include_router(prefix=...) 로 붙은 경로는 route.path 에 빠져 있을 수 있어
+    # 실제 경로의 앞부분(고정 prefix) 을 붙인다
+    path = scope["path"]
+    extra = path.count("/") - template.count("/")
+    if extra > 0:
+        template = "/".join(path.split("/")[:extra + 1]) + template
+    return template
+
+
+def current_route() -> Optional[str]:
+    """요청 밖(매칭 워커 등)에서는 None"""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {route_template(scope) or scope['path']}"
+
+
+# ------------------------------
+# 쿼리 예산
+# ------------------------------
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_statements: int, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    블록 안에서 실행된 statement 수가 max_statements 를 넘거나,
+    같은 모양이 max_repeats 번을 넘게 반복되면 QueryBudgetExceeded.
+    TestClient 처럼 다른 스레드에서 실행되는 요청도 센다. (동시에 다른 요청을 돌리지 말 것)
+    """
+    stats = QueryStats()
+    with _global_lock:
+        _global_stats.append(stats)
+    try:
+        yield stats
+    finally:
+        with _global_lock:
+            _global_stats.remove(stats)
+
+    problems = []
+    if stats.statements > max_statements:
+        problems.append(f"{stats.statements} statements (budget {max_statements})")
+    if max_repeats is not None:
+        problems += [
+            f"{count}x {shape[:120]}" for shape, count in stats.repeated_shapes(max_repeats)
+        ]
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
+
+
+# ------------------------------
+# 요청 단위 계측 (ASGI 미들웨어)
+# ------------------------------
+class QueryCountMiddleware:
+    """
+    요청마다 track_queries() 를 열어 두고 응답 시작 시점에 집계한다.
+    (동기 라우트는 스레드풀에서 돌지만 context 가 복사되므로 같은 QueryStats 에 쌓인다)
+    """
+
+    def __init__(self, app, debug_headers: bool = False, repeat_threshold: int = 0) -> None:
+        self.app = app
+        self.debug_headers = debug_headers
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope_token = _current_scope.set(scope)
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    if self.debug_headers:
+                        headers = list(message.get("headers", []))
+                        headers.append((b"x-db-queries", str(stats.statements).encode()))
+                        headers.append((b"x-db-time", f"{stats.seconds * 1000:.1f}".encode()))
+                        message = {**message, "headers": headers}
+                    if self.repeat_threshold:
+                        for shape, count in stats.repeated_shapes(self.repeat_threshold):
+                            logger.warning(
+                                "[N+1] %s %s: %d x %s",
+                                scope["method"], scope["path"], count, shape[:200],
+                            )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                _current_scope.reset(scope_token)
@@ -0,0 +1,193 @@
+# app/kakao.py
+"""
+카카오 OAuth HTTP 클라이언트 (로그인 콜백에서 사용)
+
+    token = kakao.exchange_code(code)                 # 동기 라우트
+    kakao_user = kakao.fetch_user(token["access_token"])
+    token = await kakao.exchange_code_async(code)      # async 라우트 (ASYNC_DB=1)
+
+- 프로세스당 keep-alive 연결 풀 하나를 같이 쓴다. (로그인마다 TLS handshake 를 새로 하지 않음)
+  동기: requests.Session, async: httpx.AsyncClient. 둘 다 처음 쓸 때 만든다. (import 가 무거움)
+- 연결/응답 대기 시간 제한 KAKAO_CONNECT_TIMEOUT / KAKAO_READ_TIMEOUT (초)
+  → 카카오가 느려도 스레드풀 자리를 무한정 잡지 않는다.
+- 재시도 KAKAO_RETRIES 번
+  - 연결 실패: 요청이 나가기 전이므로 토큰 교환(POST) 도 재시도
+  - 502/503/504: 사용자 정보 조회(GET) 만 재시도 (인가 코드는 한 번만 쓸 수 있음)
+- 실패는 KakaoError(status_code, detail) 로 올린다. 라우트가 HTTPException 으로 바꿔 응답.
+"""
+import asyncio
+import threading
+from typing import Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+KAKAO_CLIENT_ID: str = settings.kakao_client_id
+KAKAO_REDIRECT_URI: str = settings.kakao_redirect_uri
+KAKAO_AUTH_HOST: str = settings.kakao_auth_host
+KAKAO_API_HOST: str = settings.kakao_api_host
+KAKAO_CONNECT_TIMEOUT: float = settings.kakao_connect_timeout
+KAKAO_READ_TIMEOUT: float = settings.kakao_read_timeout
+KAKAO_RETRIES: int = settings.kakao_retries
+KAKAO_POOL_SIZE: int = settings.kakao_pool_size
+
+TOKEN_PATH = "/oauth/token"
+USER_ME_PATH = "/v2/user/me"
+
+RETRY_STATUSES = (502, 503, 504)
+RETRY_BACKOFF = 0.2  # 초, 재시도마다 2배
+
+_session = None
+_async_client = None
+_lock = threading.Lock()
+
+
+class KakaoError(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# ------------------------------
+# 클라이언트 (프로세스 공용)
+# ------------------------------
+def get_session():
+    """재시도/연결 풀이 설정된 requests.Session"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(
+                    total=KAKAO_RETRIES,
+                    connect=KAKAO_RETRIES,
+                    read=0,
+                    status=KAKAO_RETRIES,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset({"GET"}),
+                    backoff_factor=RETRY_BACKOFF,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=KAKAO_POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_async_client():
+    """연결 재시도/연결 풀이 설정된 httpx.AsyncClient"""
+    global _async_client
+    if _async_client is None:
+        import httpx
+
+        # transport 를 직접 넘기면 AsyncClient(limits=...) 는 무시되므로 transport 에 지정
+        limits = httpx.Limits(max_connections=KAKAO_POOL_SIZE, max_keepalive_connections=KAKAO_POOL_SIZE)
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(KAKAO_READ_TIMEOUT, connect=KAKAO_CONNECT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(retries=KAKAO_RETRIES, limits=limits),
+        )
+    return _async_client
+
+
+async def close_clients() -> None:
+    """앱 종료 시 연결 풀 정리"""
+    global _session, _async_client
+    if _session is not None:
+        _session.close()
+        _session = None
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+# ------------------------------
+# 동기
+# ------------------------------
+def _request(method: str, url: str, error_detail: str, **kwargs) -> dict:
+    import requests
+
+    try:
+        response = get_session().request(
+            method, url, timeout=(KAKAO_CONNECT_TIMEOUT, KAKAO_READ_TIMEOUT), **kwargs
+        )
+    except requests.Timeout as e:
+        print("[KAKAO TIMEOUT]", method, url, e)
+        raise KakaoError(504, "카카오 응답이 지연되고 있습니다. 잠시 후 다시 시도해 주세요.")
+    except requests.RequestException as e:
+        print("[KAKAO CONNECTION ERROR]", method, url, e)
+        raise KakaoError(502, "카카오 서버에 연결하지 못했습니다.")
+    if response.status_code != 200:
+        print("[KAKAO ERROR]", method, url, response.status_code, response.text)
+        raise KakaoError(400, error_detail)
+    return response.json()
+
+
+def exchange_code(code: str) -> dict:
+    """인가 코드 → 카카오 토큰 응답 (access_token 포함)"""
+    return _request("POST", KAKAO_AUTH_HOST + TOKEN_PATH, "카카오 토큰 요청에 실패했습니다.", data=_token_form(code))
+
+
+def fetch_user(access_token: str) -> dict:
+    """카카오 사용자 정보 (/v2/user/me)"""
+    return _request(
+        "GET", KAKAO_API_HOST + USER_ME_PATH, "카카오 사용자 정보 조회에 실패했습니다.",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def _token_form(code: str) -> dict:
+    return {
+        "grant_type": "authorization_code",
+        "client_id": KAKAO_CLIENT_ID,
+        "redirect_uri": KAKAO_REDIRECT_URI,
+        "code": code,
+        # "client_secret": os.getenv("KAKAO_CLIENT_SECRET", "")
+    }
+
+
+# ------------------------------
+# async
+# ------------------------------
+async def _request_async(method: str, url: str, error_detail: str, **kwargs) -> dict:
+    import httpx
+
+    # 연결 실패 재시도는 transport 가, 502/503/504 재시도(GET) 는 여기서
+    attempts = 1 + (KAKAO_RETRIES if method == "GET" else 0)
+    response: Optional["httpx.Response"] = None
+    for attempt in range(attempts):
+        if attempt:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            response = await get_async_client().request(method, url, **kwargs)
+        except httpx.TimeoutException as e:
+            print("[KAKAO TIMEOUT]", method, url, repr(e))
+            raise KakaoError(504, "카카오 응답이 지연되고 있습니다. 잠시 후 다시 시도해 주세요.")
+        except httpx.HTTPError as e:
+            print("[KAKAO CONNECTION ERROR]", method, url, repr(e))
+            raise KakaoError(502, "카카오 서버에 연결하지 못했습니다.")
+        if response.status_code not in RETRY_STATUSES:
+            break
+    if response.status_code != 200:
+        print("[KAKAO ERROR]", method, url, response.status_code, response.text)
+        raise KakaoError(400, error_detail)
+    return response.json()
+
+
+async def exchange_code_async(code: str) -> dict:
+    return await _request_async(
+        "POST", KAKAO_AUTH_HOST + TOKEN_PATH, "카카오 토큰 요청에 실패했습니다.", data=_token_form(code)
+    )
+
+
+async def fetch_user_async(access_token: str) -> dict:
+    return await _request_async(
+        "GET", KAKAO_API_HOST + USER_ME_PATH, "카카오 사용자 정보 조회에 실패했습니다.",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
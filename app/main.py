@@ -1,43 +1,94 @@
 # main.py
+"""
+API 앱
+
+    uvicorn app.main:app                 # 모듈 import 시 create_app() 1회
+    python -m app.migrations             # 스키마 생성/업그레이드는 배포 시 따로 실행
+
+import 만으로는 DB 에 접속하지 않는다. (테이블 생성, 백필 X)
+"""
 from fastapi import FastAPI
-from app.db import engine
-from app.models import Base
-from app.routers import auth, users, talents, matches, messages, notifications
-from dotenv import load_dotenv
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Talent Matching API")
+from app import kakao, metrics, passwords, profiling, replica
+from app.instrumentation import QueryCountMiddleware
+from app.config import get_settings
+from app.routers import auth, users, talents, matches, messages, notifications, profiles
+
+
+def create_app() -> FastAPI:
+    """
+    설정은 환경변수(.env) 로만 받는다. 라우터/app.db/app.token_claims/app.profiling 등이
+    import 시점에 get_settings() 값을 모듈 상수로 읽으므로, 다른 설정으로 띄우려면
+    app 패키지를 import 하기 전에 환경변수를 바꿔야 한다. (benchmarks 는 --child 프로세스로 실행)
+    """
+    settings = get_settings()
+
+    app = FastAPI(title="Talent Matching API")
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origin_list,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    #  요청별 SQL 수/시간 (DEBUG=1 이면 응답 헤더), N+1 경고
+    app.add_middleware(
+        QueryCountMiddleware,
+        debug_headers=settings.debug,
+        repeat_threshold=settings.n_plus_one_threshold,
+    )
+
+    #  요청 수/지연/처리 중 요청 수 (GET /metrics)
+    if settings.metrics_enabled:
+        app.add_middleware(metrics.MetricsMiddleware)
+        metrics.install_default_collectors()
+
+        @app.get("/metrics", include_in_schema=False)
+        def read_metrics():
+            return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    #  요청 프로파일러 (관리자 X-Profile: 1 헤더 / PROFILE_SAMPLE_RATE), 꺼져 있으면 미들웨어 없음
+    if settings.profiling_enabled:
+        app.add_middleware(profiling.ProfilingMiddleware)
+        app.include_router(profiles.router, prefix="/admin/profiles", tags=["admin"])
+
+    @app.get("/")
+    def read_root():
+        return{"status":"ok","message":"runnning"}
 
-origins = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-]
+    #  라우터 등록
+    app.include_router(auth.router, prefix="/auth", tags=["auth"])
+    app.include_router(users.router, prefix="/users", tags=["users"])
+    app.include_router(talents.router, tags=["talents"])
+    app.include_router(matches.router, prefix="/matches", tags=["matches"])
+    app.include_router(messages.router, prefix="/messages", tags=["messages"])
+    app.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    @app.on_event("startup")
+    def _check_kakao_settings():
+        if not settings.kakao_client_id or not settings.kakao_redirect_uri:
+            print("[WARN] KAKAO_CLIENT_ID 또는 KAKAO_REDIRECT_URI가 설정되지 않았습니다.")
 
-load_dotenv()
+    @app.on_event("shutdown")
+    async def _close_kakao_clients():
+        await kakao.close_clients()
 
-app = FastAPI(title="Talent Matching API")
+    @app.on_event("shutdown")
+    def _stop_password_pool():
+        passwords.shutdown_pool()
 
-#  서버 실행 시 SQLite 테이블 자동 생성
-Base.metadata.create_all(bind=engine)
+    #  매칭 워커: 별도 프로세스(python -m app.matching_worker)로 돌릴 때는 RUN_MATCHING_WORKER=0 으로 끈다
+    if settings.run_matching_worker:
+        matches.register_periodic_task(app)
 
-@app.get("/")
-def read_root():
-    return{"status":"ok","message":"runnning"}
+    #  로컬 SQLite 읽기 복제본(READ_DATABASE_URL) 동기화
+    replica.register_sync_task(app)
 
-#  라우터 등록
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
-app.include_router(users.router, prefix="/users", tags=["users"])
-app.include_router(talents.router, tags=["talents"])
-app.include_router(matches.router, prefix="/matches", tags=["matches"])
-app.include_router(messages.router, prefix="/messages", tags=["messages"])
-app.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+    return app
 
 
+app = create_app()
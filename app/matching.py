@@ -0,0 +1,326 @@
+# app/matching.py
+"""
+매칭 엔진 (DB 비의존, 메모리 연산 전용)
+
+run_matching_once 는 대기열 스냅샷(QueueEntry 목록)을 받아 여기 함수로 짝을 구한다.
+- 대기열은 requested_at 오름차순(FIFO) 으로 처리
+- A(먼저 신청) 의 '배우고 싶은 재능' == B(나중 신청) 의 '가르쳐줄 재능'
+- A, B 의 세대(user_type) 가 서로 달라야 함 (MIDDLE 은 제외)
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+EXCLUDED_USER_TYPE = "MIDDLE"
+# 짝 후보가 되는 세대 (UNKNOWN: 출생연도 미입력, 다른 세대로 취급). 그 밖의 값은 어느 모드도 보지 않음
+MATCHABLE_USER_TYPES = ("YOUNG", "SENIOR", "UNKNOWN")
+
+# 짝이 안 된 사유 (dry-run 리포트용)
+UNMATCHED_MIDDLE = "MIDDLE"                 # 중년 유저 (서비스 대상 아님)
+UNMATCHED_NO_TALENT = "NO_TALENT"           # Learn/Teach 카드 미등록
+UNMATCHED_UNSUPPORTED_USER_TYPE = "UNSUPPORTED_USER_TYPE"   # MATCHABLE_USER_TYPES 밖의 세대 값 (짝 후보 아님)
+UNMATCHED_NO_COMPLEMENT = "NO_COMPLEMENT"   # 카테고리가 맞는 다른 세대 대기자가 없음
+
+
+@dataclass(slots=True)
+class QueueEntry:
+    match_id: int
+    user_id: int
+    requested_at: Optional[datetime]
+    user_type: Optional[str]
+    learn: Optional[str]      # 배우고 싶은 재능 카테고리
+    teach: Optional[str]      # 가르쳐줄 수 있는 재능 카테고리
+
+    @property
+    def is_matchable(self) -> bool:
+        return (
+            self.user_type in MATCHABLE_USER_TYPES
+            and self.learn is not None
+            and self.teach is not None
+        )
+
+
+Pair = Tuple[QueueEntry, QueueEntry]
+
+
+@dataclass(slots=True)
+class MatchingSnapshot:
+    """한 라운드 동안 사용할 대기열 스냅샷 (DB 에서 한 번에 읽어 온 값)"""
+    entries: List[QueueEntry] = field(default_factory=list)
+    nicknames: Dict[int, str] = field(default_factory=dict)   # user_id → 닉네임
+
+
+@dataclass(slots=True)
+class MatchingRoundStats:
+    """라운드 1회 실행 결과 (로그/모니터링용)"""
+    entries: int = 0
+    pairs: int = 0
+    sql_statements: int = 0
+    elapsed_ms: float = 0.0
+
+
+def fifo_key(entry: QueueEntry) -> Tuple[datetime, int]:
+    """requested_at 오름차순, 같은 시각이면 먼저 생성된 row 우선"""
+    return (entry.requested_at or datetime.min, entry.match_id)
+
+
+def fifo_order(entries: Iterable[QueueEntry]) -> List[QueueEntry]:
+    return sorted(entries, key=fifo_key)
+
+
+@dataclass(slots=True)
+class MatchingIndex:
+    """
+    FIFO 정렬된 대기열 + (user_type, teach 카테고리) 별 대기자 덱.
+    pair_greedy 가 짝을 찾으면서 덱을 비우므로 한 번만 사용할 수 있다.
+    """
+    ordered: List[QueueEntry]
+    buckets: Dict[Tuple[str, str], Deque[int]]
+    types_by_teach: Dict[str, Set[str]]
+
+
+def build_index(entries: Iterable[QueueEntry]) -> MatchingIndex:
+    ordered = fifo_order(entries)
+
+    buckets: Dict[Tuple[str, str], Deque[int]] = {}
+    types_by_teach: Dict[str, Set[str]] = {}
+    for pos, entry in enumerate(ordered):
+        if not entry.is_matchable:
+            continue
+        buckets.setdefault((entry.user_type, entry.teach), deque()).append(pos)
+        types_by_teach.setdefault(entry.teach, set()).add(entry.user_type)
+
+    return MatchingIndex(ordered, buckets, types_by_teach)
+
+
+def pair_greedy(
+    entries: Iterable[QueueEntry],
+    index: Optional[MatchingIndex] = None,
+) -> List[Pair]:
+    """
+    기존 이중 루프(first-fit) 와 같은 결과를 내는 인덱스 기반 그리디 매칭.
+
+    - (user_type, teach 카테고리) 별로 대기자를 FIFO 덱에 담아 둔다. (build_index)
+    - A 차례가 오면 A.learn 을 가르칠 수 있는 '다른 세대' 덱들의 맨 앞만 본다.
+    - 덱 앞쪽에 A 보다 먼저 신청했거나 이미 짝이 정해진 항목은 버린다.
+      (B 는 항상 A 보다 뒤에 신청한 사람이어야 하므로 다시 쓸 일이 없음)
+    → 항목마다 덱에 한 번 들어가고 한 번 빠지므로 전체 O(n)
+    """
+    index = index or build_index(entries)
+    ordered, buckets, types_by_teach = index.ordered, index.buckets, index.types_by_teach
+
+    used: Set[int] = set()
+    pairs: List[Pair] = []
+
+    for pos, a in enumerate(ordered):
+        if pos in used or not a.is_matchable:
+            continue
+
+        best: Optional[int] = None
+        best_bucket: Optional[Deque[int]] = None
+        for user_type in types_by_teach.get(a.learn, ()):
+            if user_type == a.user_type:
+                continue
+            bucket = buckets[(user_type, a.learn)]
+            while bucket and (bucket[0] <= pos or bucket[0] in used):
+                bucket.popleft()
+            if bucket and (best is None or bucket[0] < best):
+                best = bucket[0]
+                best_bucket = bucket
+
+        if best is None:
+            continue
+
+        best_bucket.popleft()
+        used.add(pos)
+        used.add(best)
+        pairs.append((a, ordered[best]))
+
+    return pairs
+
+
+# ------------------------------
+# 최대 매칭 모드 (maximum)
+# ------------------------------
+# 그리디는 A 에게 처음 맞는 B 를 바로 붙이기 때문에, 다른 조합이었다면
+# 모두 짝지어질 수 있었던 사람이 남는 경우가 생긴다.
+# maximum 모드는 YOUNG/SENIOR 이분 그래프에서 최대 매칭을 구한다.
+#
+# - 호환 조건: 한쪽의 learn == 다른 쪽의 teach (신청 순서 무관)
+#   배우는 쪽이 A(매칭 row 주인) 가 되고, 양쪽 다 성립하면 먼저 신청한 쪽이 A.
+# - 같은 (세대, learn, teach) 인 사람끼리는 그래프 상 구분이 없으므로
+#   카테고리 조합(최대 5x5) 단위로 묶어 작은 유량 그래프에서 최대 유량을 구한다.
+#   → 대기자가 10만 명이어도 노드 수는 50개 남짓.
+# - 나이(신청 순서) 우선: FIFO 그리디 결과에서 출발해 증가 경로로만 늘리므로
+#   그룹별 매칭 인원은 줄지 않고, 각 그룹에서는 먼저 신청한 사람부터 배정한다.
+# - 이분 그래프 밖의 대기자(UNKNOWN 등) 는 남은 사람끼리 그리디로 짝짓고,
+#   그래도 전체 그리디보다 짝이 적으면 전체 그리디 결과를 쓴다. (그리디보다 적게 짝짓지 않음)
+MAX_MATCH_SIDES = ("YOUNG", "SENIOR")
+
+GroupKey = Tuple[str, str, str]   # (user_type, learn, teach)
+
+
+def _compatible(a: GroupKey, b: GroupKey) -> bool:
+    return a[1] == b[2] or b[1] == a[2]
+
+
+def _orient(x: QueueEntry, y: QueueEntry) -> Pair:
+    """(A=배우는 쪽, B=가르치는 쪽) 순서로 정렬"""
+    first, second = (x, y) if fifo_key(x) < fifo_key(y) else (y, x)
+    if first.learn == second.teach:
+        return first, second
+    return second, first
+
+
+def pair_maximum(
+    entries: Iterable[QueueEntry],
+    index: Optional[MatchingIndex] = None,
+) -> List[Pair]:
+    ordered = index.ordered if index else fifo_order(entries)
+    sides = [e for e in ordered if e.is_matchable and e.user_type in MAX_MATCH_SIDES]
+
+    pairs = _pair_bipartite_maximum(sides)
+    if len(sides) < sum(1 for e in ordered if e.is_matchable):
+        paired = {e.match_id for pair in pairs for e in pair}
+        pairs += pair_greedy([e for e in ordered if e.match_id not in paired])
+
+        greedy = pair_greedy(ordered)
+        if len(greedy) > len(pairs):
+            return greedy
+
+    pairs.sort(key=lambda p: min(fifo_key(p[0]), fifo_key(p[1])))
+    return pairs
+
+
+def _pair_bipartite_maximum(ordered: List[QueueEntry]) -> List[Pair]:
+    """YOUNG/SENIOR 대기자(FIFO 순) 만으로 최대 매칭"""
+    left_type, right_type = MAX_MATCH_SIDES
+
+    groups: Dict[GroupKey, List[QueueEntry]] = {}
+    for e in ordered:
+        groups.setdefault((e.user_type, e.learn, e.teach), []).append(e)
+    left = [k for k in groups if k[0] == left_type]
+    right = [k for k in groups if k[0] == right_type]
+    neighbors: Dict[GroupKey, List[GroupKey]] = {
+        k: [r for r in right if _compatible(k, r)] for k in left
+    }
+
+    # 1) FIFO 그리디 결과를 초기 유량으로 사용
+    flow: Dict[Tuple[GroupKey, GroupKey], int] = {}
+    used: Dict[GroupKey, int] = {k: 0 for k in groups}
+    for a, b in pair_greedy(ordered):
+        ka = (a.user_type, a.learn, a.teach)
+        kb = (b.user_type, b.learn, b.teach)
+        lk, rk = (ka, kb) if a.user_type == left_type else (kb, ka)
+        flow[(lk, rk)] = flow.get((lk, rk), 0) + 1
+        used[lk] += 1
+        used[rk] += 1
+
+    # 2) 잔여 그래프에서 증가 경로(BFS) 를 더 이상 못 찾을 때까지 반복
+    while True:
+        parent: Dict[GroupKey, Optional[GroupKey]] = {}
+        frontier = deque()
+        for k in left:
+            if used[k] < len(groups[k]):
+                parent[k] = None
+                frontier.append(k)
+
+        sink: Optional[GroupKey] = None
+        while frontier and sink is None:
+            node = frontier.popleft()
+            if node[0] == left_type:
+                for r in neighbors[node]:
+                    if r not in parent:
+                        parent[r] = node
+                        if used[r] < len(groups[r]):
+                            sink = r
+                            break
+                        frontier.append(r)
+            else:
+                for l in left:
+                    if l not in parent and flow.get((l, node), 0) > 0:
+                        parent[l] = node
+                        frontier.append(l)
+
+        if sink is None:
+            break
+
+        # 경로를 따라 보낼 수 있는 최대량(병목) 만큼 한 번에 흘림
+        path = [sink]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        path.reverse()     # left, right, left, ..., right(sink)
+
+        amount = min(
+            len(groups[path[0]]) - used[path[0]],
+            len(groups[sink]) - used[sink],
+        )
+        for i in range(1, len(path) - 1, 2):      # right → left 역방향 간선
+            amount = min(amount, flow[(path[i + 1], path[i])])
+
+        for i in range(0, len(path) - 1):
+            u, v = path[i], path[i + 1]
+            if i % 2 == 0:
+                flow[(u, v)] = flow.get((u, v), 0) + amount
+            else:
+                flow[(v, u)] -= amount
+        used[path[0]] += amount
+        used[sink] += amount
+
+    # 3) 그룹별로 먼저 신청한 사람부터 실제 짝 배정
+    cursor: Dict[GroupKey, int] = {k: 0 for k in groups}
+    pairs: List[Pair] = []
+    for (lk, rk), count in sorted(flow.items()):
+        for _ in range(count):
+            x = groups[lk][cursor[lk]]
+            y = groups[rk][cursor[rk]]
+            cursor[lk] += 1
+            cursor[rk] += 1
+            pairs.append(_orient(x, y))
+    return pairs
+
+
+MATCHING_MODES = {
+    "greedy": pair_greedy,
+    "maximum": pair_maximum,
+}
+
+
+def pair_entries(
+    entries: Iterable[QueueEntry],
+    mode: str = "greedy",
+    index: Optional[MatchingIndex] = None,
+) -> List[Pair]:
+    try:
+        strategy = MATCHING_MODES[mode]
+    except KeyError:
+        raise ValueError(f"알 수 없는 매칭 모드입니다: {mode}") from None
+    return strategy(entries, index)
+
+
+def unmatched_reason(entry: QueueEntry) -> str:
+    """
+    짝이 안 된 사유. NO_COMPLEMENT 는 선택한 모드가 실제로 짝 후보로 본 대기자에만 붙인다.
+    (maximum 모드도 YOUNG/SENIOR 밖의 대기자를 그리디로 짝지으므로 두 모드의 후보는 같음)
+    """
+    if entry.user_type == EXCLUDED_USER_TYPE:
+        return UNMATCHED_MIDDLE
+    if entry.user_type not in MATCHABLE_USER_TYPES:
+        return UNMATCHED_UNSUPPORTED_USER_TYPE
+    if entry.learn is None or entry.teach is None:
+        return UNMATCHED_NO_TALENT
+    return UNMATCHED_NO_COMPLEMENT
+
+
+def unmatched_entries(
+    entries: Iterable[QueueEntry],
+    pairs: Iterable[Pair],
+) -> List[Tuple[QueueEntry, str]]:
+    """짝이 되지 않은 대기자와 그 사유 (FIFO 순서)"""
+    paired = {e.match_id for pair in pairs for e in pair}
+    return [
+        (e, unmatched_reason(e))
+        for e in fifo_order(entries)
+        if e.match_id not in paired
+    ]
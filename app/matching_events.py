@@ -0,0 +1,24 @@
+# app/matching_events.py
+"""
+매칭 워커 깨우기 신호
+
+대기열/재능 카드가 바뀌는 곳(매칭 신청, 재능 등록, 매칭 취소) 에서
+notify_queue_changed() 를 호출하면 같은 프로세스의 매칭 스케줄러가
+짧은 디바운스 후 라운드를 바로 실행한다. (30초 고정 폴링 대기 X)
+"""
+import threading
+
+_wakeup = threading.Event()
+
+
+def notify_queue_changed() -> None:
+    _wakeup.set()
+
+
+def wait_for_change(timeout: float) -> bool:
+    """신호가 오면 True, timeout 동안 없으면 False. 받은 신호는 소비한다."""
+    woke = _wakeup.wait(timeout)
+    if woke:
+        # timeout 뒤에 clear 하면 그 사이에 온 신호를 잃는다 (다음 주기까지 매칭 지연)
+        _wakeup.clear()
+    return woke
@@ -0,0 +1,137 @@
+# app/matching_worker.py
+"""
+매칭 워커 (API 서버와 분리된 별도 프로세스)
+
+    python -m app.matching_worker
+    python -m app.matching_worker --categories 디지털/IT 요리/생활 --interval 120
+    python -m app.matching_worker --once
+
+- 라운드마다 대기열 row 를 조건부 UPDATE 로 선점(lease)한 뒤 그 row 만 매칭한다.
+  → 워커 프로세스를 여러 개 띄워도 같은 신청이 두 번 매칭되지 않는다.
+- --categories 로 카테고리 샤드를 나눠 맡길 수 있다. (미지정 시 전체)
+
+라운드 실행 시점
+- 변경 신호(매칭 신청/재능 등록/취소) 가 오면 디바운스 후 바로 1라운드
+  · API 프로세스 안 스레드: app.matching_events 신호를 직접 받음
+  · 별도 프로세스: 대기열/재능 테이블의 마지막 id 를 짧은 주기로 확인 (PK 조회 2번)
+- 아무 변화가 없어도 interval 마다 1번 (만료 처리 포함)
+"""
+import argparse
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import func, select
+
+from app import models
+from app.config import get_settings
+from app.crud.match import new_worker_id
+from app.db import SessionLocal
+from app.matching_events import wait_for_change
+from app.routers.matches import expire_old_matches, run_matching_once
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# 변화가 없을 때의 라운드 간격(초) = 만료 처리 주기
+MATCH_WORKER_INTERVAL: float = settings.match_worker_interval
+# 신호를 받은 뒤 추가 신호를 모으는 시간(초)
+MATCH_DEBOUNCE_SECONDS: float = settings.match_debounce_seconds
+# 별도 프로세스 워커가 DB 변경 여부를 확인하는 주기(초)
+MATCH_WAKE_POLL_SECONDS: float = settings.match_wake_poll_seconds
+
+
+def run_worker_round(
+    worker_id: str,
+    categories: Optional[List[str]] = None,
+    expire: bool = True,
+) -> None:
+    db = SessionLocal()
+    try:
+        run_matching_once(db, worker_id=worker_id, categories=categories)
+        if expire:
+            expire_old_matches(db)
+    except Exception:
+        db.rollback()
+        # 라운드 하나가 실패해도 워커는 계속 돈다 (다음 신호/주기에 다시 시도)
+        logger.exception("matching worker %s round failed", worker_id)
+    finally:
+        db.close()
+
+
+def queue_signature() -> tuple:
+    """새 신청/새 재능 카드가 생겼는지 확인용 (max PK 라 테이블 크기와 무관)"""
+    db = SessionLocal()
+    try:
+        return (
+            db.scalar(select(func.max(models.MatchingQueue.match_id))),
+            db.scalar(select(func.max(models.Talent.talent_id))),
+        )
+    finally:
+        db.close()
+
+
+def worker_loop(
+    worker_id: str,
+    interval: float = MATCH_WORKER_INTERVAL,
+    categories: Optional[List[str]] = None,
+    stop: Optional[threading.Event] = None,
+    poll_db: bool = False,
+) -> None:
+    """
+    poll_db=False : 같은 프로세스의 notify_queue_changed() 신호로 깨어남 (API 내 스레드)
+    poll_db=True  : MATCH_WAKE_POLL_SECONDS 마다 queue_signature() 비교 (별도 프로세스)
+    """
+    stop = stop or threading.Event()
+    signature = queue_signature() if poll_db else None
+    next_tick = time.monotonic()
+
+    while not stop.is_set():
+        timeout = max(0.0, next_tick - time.monotonic())
+        if poll_db:
+            timeout = min(timeout, MATCH_WAKE_POLL_SECONDS)
+
+        changed = wait_for_change(timeout)
+        if stop.is_set():
+            break
+        if poll_db and not changed:
+            current = queue_signature()
+            changed, signature = current != signature, current
+
+        if time.monotonic() >= next_tick:
+            run_worker_round(worker_id, categories)
+            next_tick = time.monotonic() + interval
+        elif changed:
+            # 몰려오는 신호는 디바운스 시간 동안 모아서 라운드 1번으로 처리
+            stop.wait(MATCH_DEBOUNCE_SECONDS)
+            wait_for_change(0)
+            run_worker_round(worker_id, categories, expire=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="매칭 워커")
+    parser.add_argument("--worker-id", default=new_worker_id())
+    parser.add_argument("--interval", type=float, default=MATCH_WORKER_INTERVAL,
+                        help="변화가 없을 때의 라운드 간격(초, 만료 처리 주기)")
+    parser.add_argument("--categories", nargs="*", default=None,
+                        help="이 워커가 맡을 재능 카테고리 (미지정 시 전체)")
+    parser.add_argument("--once", action="store_true", help="1라운드만 실행하고 종료")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    logger.info("matching worker %s started (categories=%s)", args.worker_id, args.categories)
+
+    if args.once:
+        run_worker_round(args.worker_id, args.categories)
+        return
+
+    try:
+        worker_loop(args.worker_id, args.interval, args.categories, poll_db=True)
+    except KeyboardInterrupt:
+        logger.info("matching worker %s stopped", args.worker_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# app/metrics.py
+"""
+Prometheus 텍스트 형식 지표 (GET /metrics, app.main 에서 등록)
+
+요청 (MetricsMiddleware)
+- http_requests_total{method, route, status}
+- http_request_duration_seconds{method, route}   히스토그램
+- http_requests_in_progress{method}
+  route 는 경로 템플릿(/messages/messages/{match_id}), 매칭되는 라우트가 없으면 "unmatched"
+
+DB 커넥션 풀 (엔진별, 스크레이프 시점 값 + 이벤트 카운터)
+- db_pool_size / db_pool_checked_out / db_pool_overflow
+- db_pool_checkouts_total / db_pool_connections_total
+
+매칭 워커 (run_matching_once 에서 기록, 워커가 도는 프로세스 기준)
+- matching_round_duration_seconds  히스토그램
+- matching_round_pairs             히스토그램
+- matching_queue_depth             PENDING 대기열 수 (스크레이프 시점 COUNT)
+
+프로세스 내 캐시 (app.cache)
+- cache_hits_total / cache_misses_total / cache_size{cache}
+
+기록 비용은 요청당 수 µs (benchmarks.bench_metrics_overhead).
+prometheus_client 없이 필요한 만큼만 구현했다.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy import event, func, select
+
+from app.instrumentation import route_template
+
+LabelValues = Tuple[str, ...]
+
+# 요청 지연 버킷(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 매칭 라운드 버킷
+ROUND_SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+ROUND_PAIRS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ------------------------------
+# 지표 타입
+# ------------------------------
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            label_names = self.labels + (("le",) if len(labels) > len(self.labels) else ())
+            lines.append(f"{name}{_format_labels(label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, value: float, *labels: str) -> None:
+        """다른 곳에서 세고 있는 누적값을 스크레이프 시점에 그대로 반영"""
+        with self._lock:
+            self._values[labels] = value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets=LATENCY_BUCKETS) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label → [버킷별 개수(마지막은 +Inf), 합계]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in sorted(self._values.items())]
+        out = []
+        bounds = self.buckets + (float("inf"),)
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                out.append((f"{self.name}_bucket", labels + (_format_value(bound),), cumulative))
+            out.append((f"{self.name}_sum", labels, total))
+            out.append((f"{self.name}_count", labels, cumulative))
+        return out
+
+
+# ------------------------------
+# 레지스트리
+# ------------------------------
+_metrics: List[_Metric] = []
+# 스크레이프 직전에 실행 (풀 상태, 대기열 수처럼 그때그때 읽는 값)
+_collectors: List[Callable[[], None]] = []
+
+
+def register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    _collectors.append(collector)
+
+
+def render() -> str:
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception as e:
+            print("[METRICS_COLLECTOR_ERROR]", e)
+    lines: List[str] = []
+    for metric in _metrics:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUESTS = register(Counter(
+    "http_requests_total", "HTTP 요청 수", ("method", "route", "status"),
+))
+HTTP_LATENCY = register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간(초)", ("method", "route"),
+))
+HTTP_IN_PROGRESS = register(Gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수", ("method",),
+))
+
+DB_POOL_SIZE = register(Gauge("db_pool_size", "커넥션 풀 크기", ("engine",)))
+DB_POOL_CHECKED_OUT = register(Gauge("db_pool_checked_out", "사용 중인 커넥션 수", ("engine",)))
+DB_POOL_OVERFLOW = register(Gauge("db_pool_overflow", "pool_size 를 넘어 연 커넥션 수", ("engine",)))
+DB_POOL_CHECKOUTS = register(Counter("db_pool_checkouts_total", "풀에서 커넥션을 꺼낸 횟수", ("engine",)))
+DB_POOL_CONNECTIONS = register(Counter("db_pool_connections_total", "새로 맺은 DB 연결 수", ("engine",)))
+
+MATCHING_ROUND_SECONDS = register(Histogram(
+    "matching_round_duration_seconds", "매칭 라운드 1회 소요 시간(초)", buckets=ROUND_SECONDS_BUCKETS,
+))
+MATCHING_ROUND_PAIRS = register(Histogram(
+    "matching_round_pairs", "매칭 라운드 1회에 성사된 쌍 수", buckets=ROUND_PAIRS_BUCKETS,
+))
+MATCHING_QUEUE_DEPTH = register(Gauge("matching_queue_depth", "PENDING 매칭 대기열 수"))
+
+CACHE_HITS = register(Counter("cache_hits_total", "프로세스 내 캐시 적중 수", ("cache",)))
+CACHE_MISSES = register(Counter("cache_misses_total", "프로세스 내 캐시 미스 수", ("cache",)))
+CACHE_SIZE = register(Gauge("cache_size", "프로세스 내 캐시 항목 수", ("cache",)))
+
+
+# ------------------------------
+# 매칭 워커
+# ------------------------------
+def observe_matching_round(elapsed_seconds: float, pairs: int) -> None:
+    MATCHING_ROUND_SECONDS.observe(elapsed_seconds)
+    MATCHING_ROUND_PAIRS.observe(pairs)
+
+
+def _collect_queue_depth() -> None:
+    from app import models
+    from app.db import session_for_read
+
+    db = session_for_read()
+    try:
+        depth = db.scalar(
+            select(func.count()).select_from(models.MatchingQueue).where(models.MatchingQueue.status == "PENDING")
+        )
+    finally:
+        db.close()
+    MATCHING_QUEUE_DEPTH.set(depth or 0)
+
+
+# ------------------------------
+# 프로세스 내 캐시 (app.cache)
+# ------------------------------
+def _collect_caches() -> None:
+    from app.cache import all_caches
+
+    for cache in all_caches():
+        CACHE_HITS.set_total(cache.hits, cache.name)
+        CACHE_MISSES.set_total(cache.misses, cache.name)
+        CACHE_SIZE.set(len(cache), cache.name)
+
+
+# ------------------------------
+# DB 커넥션 풀
+# ------------------------------
+_pools: Dict[str, object] = {}
+
+
+def watch_pool(name: str, sync_engine) -> None:
+    """엔진의 풀 상태를 name 라벨로 노출 (같은 엔진을 두 번 등록하면 무시)"""
+    if name in _pools or sync_engine.pool in _pools.values():
+        return
+    _pools[name] = sync_engine.pool
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc(name)
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.inc(name)
+
+
+def _collect_pools() -> None:
+    for name, pool in _pools.items():
+        # 메모리 SQLite 등 QueuePool 이 아닌 풀은 일부 값이 없다
+        for gauge, attr in ((DB_POOL_SIZE, "size"), (DB_POOL_CHECKED_OUT, "checkedout"), (DB_POOL_OVERFLOW, "overflow")):
+            getter = getattr(pool, attr, None)
+            if getter is not None:
+                # overflow() 는 풀이 다 차기 전에는 음수 (연 연결 수 - pool_size)
+                gauge.set(max(getter(), 0), name)
+
+
+def install_default_collectors() -> None:
+    """app.db 의 엔진 풀과 매칭 대기열 수 수집 (create_app 에서 1번)"""
+    from app import db
+
+    if _collect_pools in _collectors:
+        return
+    watch_pool("primary", db.engine)
+    if db.read_engine is not db.engine:
+        watch_pool("replica", db.read_engine)
+    if db.async_engine is not None:
+        watch_pool("async", db.async_engine.sync_engine)
+    register_collector(_collect_pools)
+    register_collector(_collect_queue_depth)
+    register_collector(_collect_caches)
+
+
+# ------------------------------
+# 요청 지표 (ASGI 미들웨어)
+# ------------------------------
+class MetricsMiddleware:
+    def __init__(self, app, exclude_paths: Iterable[str] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec(method)
+            route = route_template(scope) or "unmatched"
+            HTTP_LATENCY.observe(elapsed, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status))
@@ -0,0 +1,83 @@
+# app/migrations.py
+"""
+스키마 생성/업그레이드
+
+create_all 은 없는 테이블만 만들고 기존 테이블에 컬럼을 추가하지는 않는다.
+이미 운영 중인 app.db 에도 새 컬럼이 생기도록 여기서 ALTER TABLE 을 보충한다.
+파생 테이블(matching_profiles) 에 빠진 유저가 있으면 기존 talents 로 채운다.
+models 의 __table_args__ 인덱스도 create_all 은 테이블을 새로 만들 때만 만들므로,
+기존 테이블에 없는 인덱스는 여기서 만든다. (CREATE INDEX, 이미 있으면 건너뜀)
+
+    python -m app.migrations
+"""
+import logging
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.db import Base, engine as default_engine
+from app import models  # noqa: F401  (테이블 메타데이터 등록)
+from app.crud.matching_profile import backfill_matching_profiles
+
+logger = logging.getLogger("app.migrations")
+
+# 기존 테이블에 나중에 추가된 컬럼 (table, column)
+ADDED_COLUMNS = [
+    ("matching_queue", "claimed_by"),
+    ("matching_queue", "lease_until"),
+    ("users", "token_version"),
+]
+
+
+def ensure_indexes(engine: Engine) -> List[str]:
+    """모델에 선언된 인덱스 중 DB 에 없는 것을 만들고, 만든 인덱스 이름 목록을 반환"""
+    inspector = inspect(engine)
+    created = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda ix: ix.name):
+                if index.name in existing:
+                    continue
+                index.create(conn)
+                created.append(index.name)
+    return created
+
+
+def upgrade(engine: Engine = default_engine) -> None:
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table_name, column_name in ADDED_COLUMNS:
+            existing = {c["name"] for c in inspector.get_columns(table_name)}
+            if column_name in existing:
+                continue
+            column = Base.metadata.tables[table_name].c[column_name]
+            column_type = column.type.compile(dialect=engine.dialect)
+            ddl = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
+            # NOT NULL 컬럼은 기존 row 를 채울 server_default 가 있어야 함 (SQLite)
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            conn.execute(text(ddl))
+
+        backfilled = backfill_matching_profiles(conn)
+        if backfilled:
+            logger.info("matching_profiles backfilled: %d", backfilled)
+
+    created = ensure_indexes(engine)
+    if created:
+        logger.info("indexes created: %s", ", ".join(created))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    try:
+        upgrade()
+    except Exception:
+        logger.exception("migration failed: %s", default_engine.url)
+        raise SystemExit(1)
+    logger.info("done: %s", default_engine.url)
@@ -6,9 +6,10 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Text,
 )
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -49,6 +50,8 @@ class User(Base):
     noshow_count = Column(Integer, default=0)
     user_status = Column(String, default="NORMAL")  # NORMAL / SUSPENDED / DELETED
     is_matching_available = Column(Boolean, default=True)
+    # 권한 클레임 토큰의 버전 (app.token_claims). 클레임 컬럼이 바뀔 때마다 1씩 증가, 줄지 않음
+    token_version = Column(Integer, nullable=False, default=0, server_default=text("0"))
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(
         DateTime, server_default=func.now(), onupdate=func.now()
@@ -89,10 +92,45 @@ class Talent(Base):
 
     user = relationship("User", back_populates="talents")
 
+    __table_args__ = (
+        # 유저별 Learn/Teach 카드 조회 (재능 요약, 매칭 프로필 갱신)
+        Index("ix_talents_user_type", "user_id", "type"),
+    )
+
     def __repr__(self):
         return f"<Talent(id={self.talent_id}, user_id={self.user_id}, title={self.title})>"
 
 
+# ===========================
+# MATCHING PROFILE TABLE (매칭용 요약, talents/users 에서 파생)
+# ===========================
+class MatchingProfile(Base):
+    """
+    유저별 매칭 판단에 필요한 값만 모아 둔 테이블.
+    재능 등록/프로필 수정 시 crud.matching_profile.refresh_matching_profile 로 갱신한다.
+    learn/teach 는 먼저 등록된(talent_id 가 작은) 카드 1장 기준.
+    """
+    __tablename__ = "matching_profiles"
+
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
+    user_type = Column(String, nullable=False, default="UNKNOWN")
+    learn_category = Column(String, nullable=True)
+    teach_category = Column(String, nullable=True)
+    # learn/teach 카드가 모두 있고 세대가 MATCHABLE_USER_TYPES 중 하나 (MIDDLE 아님)
+    is_matchable = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # match_new_entry: "내 teach 카테고리를 배우려는 다른 세대" 후보 조회
+        Index("ix_matching_profiles_learn_type", "learn_category", "user_type"),
+    )
+
+    def __repr__(self):
+        return f"<MatchingProfile(user_id={self.user_id}, learn={self.learn_category}, teach={self.teach_category})>"
+
+
 # ===========================
 # MATCHING TABLE (기록용)
 # ===========================
@@ -132,10 +170,24 @@ class MatchingQueue(Base):
     confirmed_at = Column(DateTime, nullable=True)
     canceled_at = Column(DateTime, nullable=True)
 
+    # 매칭 워커 선점 정보 (여러 워커가 같은 row 를 동시에 처리하지 않도록)
+    claimed_by = Column(String, nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+
     # 관계
     user_a = relationship("User", foreign_keys=[user_a_id], backref="matches_as_a")
     user_b = relationship("User", foreign_keys=[user_b_id], backref="matches_as_b")
 
+    __table_args__ = (
+        # 매칭 대기열 (status='PENDING' AND user_b_id IS NULL ORDER BY requested_at)
+        # + 내 매칭 조회의 user_b_id 쪽 (status, user_b_id)
+        Index("ix_matching_queue_status_b_requested", "status", "user_b_id", "requested_at"),
+        # 내 매칭 조회의 user_a_id 쪽 (채팅 목록, 대기 중 여부 확인)
+        Index("ix_matching_queue_a_status", "user_a_id", "status"),
+        # 매칭 워커가 선점한 row 만 읽기/해제
+        Index("ix_matching_queue_claimed_by", "claimed_by"),
+    )
+
     # 🔥 MatchingQueue ↔ Message (1 : N)
     messages = relationship(
         "Message", back_populates="match", cascade="all, delete-orphan"
@@ -173,6 +225,13 @@ class Message(Base):
     match = relationship("MatchingQueue", back_populates="messages")
     sender = relationship("User", back_populates="sent_messages")
 
+    __table_args__ = (
+        # 채팅방 메시지 목록 / 최근 메시지
+        Index("ix_messages_match_timestamp", "match_id", "timestamp"),
+        # 채팅방별 안 읽은 메시지 수
+        Index("ix_messages_match_sender_read", "match_id", "sender_id", "is_read"),
+    )
+
     def __repr__(self):
         return f"<Message(id={self.message_id}, match_id={self.match_id})>"
 
@@ -203,6 +262,11 @@ class Notification(Base):
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # 알림 목록 / 안 읽은 알림 수 (헤더 뱃지)
+        Index("ix_notifications_user_read_timestamp", "user_id", "is_read", "timestamp"),
+    )
+
     def __repr__(self):
         return f"<Notification(id={self.notif_id}, user_id={self.user_id}, type={self.type})>"
 
@@ -218,6 +282,11 @@ class Block(Base):
 
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        # 차단 여부 확인 (양방향 모두 이 인덱스로 조회)
+        Index("ix_blocks_blocker_blocked", "blocker_id", "blocked_id"),
+    )
+
 class Report(Base):
     __tablename__ = "reports"
 
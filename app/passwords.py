@@ -0,0 +1,156 @@
+# app/passwords.py
+"""
+비밀번호 해시/검증 (bcrypt, 이메일/비밀번호 로그인에서 사용)
+
+    hashed = hash_password("pw")                      # 동기 라우트 (스레드풀)
+    ok = await verify_password_async("pw", hashed)    # async 라우트
+    if ok and needs_rehash(hashed): ...               # 비용(rounds) 이 바뀐 해시면 새로 저장
+
+- bcrypt 1번은 PASSWORD_BCRYPT_ROUNDS=12 기준 수백 ms 의 CPU 를 쓴다.
+  요청 스레드/이벤트 루프 대신 PASSWORD_HASH_WORKERS 개 프로세스 풀에서 돌려서
+  로그인이 몰려도 다른 요청이 쓸 CPU/GIL 을 남긴다. (0 이면 호출한 스레드에서 바로 계산)
+- 풀에 쌓인 작업이 PASSWORD_MAX_PENDING 을 넘으면 기다리지 않고 PasswordBusyError (라우트에서 503)
+- PASSWORD_BCRYPT_ROUNDS 를 바꾸면 기존 해시는 로그인 성공 시 새 비용으로 다시 저장된다. (needs_rehash)
+- bcrypt 는 72바이트까지만 쓰므로 그보다 긴 비밀번호는 ValueError (스키마에서 먼저 막음)
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from app.config import get_settings
+
+settings = get_settings()
+
+PASSWORD_BCRYPT_ROUNDS: int = settings.password_bcrypt_rounds
+PASSWORD_HASH_WORKERS: int = settings.password_hash_workers
+PASSWORD_MAX_PENDING: int = settings.password_max_pending
+
+MAX_PASSWORD_BYTES = 72
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# 풀에 넣었지만 아직 끝나지 않은 작업 수
+_pending = threading.BoundedSemaphore(max(PASSWORD_MAX_PENDING, 1))
+
+
+class PasswordBusyError(Exception):
+    """해시 작업이 PASSWORD_MAX_PENDING 개 넘게 밀려 있음"""
+
+
+# ------------------------------
+# 워커 프로세스에서 실행 (pickle 되므로 모듈 최상위 함수)
+# ------------------------------
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds)).decode()
+
+
+def _verify(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(_encode(password), hashed.encode())
+    except ValueError:  # bcrypt 해시가 아님
+        return False
+
+
+def _encode(password: str) -> bytes:
+    encoded = password.encode("utf-8")
+    if len(encoded) > MAX_PASSWORD_BYTES:
+        raise ValueError(f"password longer than {MAX_PASSWORD_BYTES} bytes")
+    return encoded
+
+
+# ------------------------------
+# 프로세스 풀
+# ------------------------------
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """PASSWORD_HASH_WORKERS=0 이면 None"""
+    global _pool
+    if PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # fork 는 uvicorn/DB 스레드 상태까지 복사하므로 spawn
+                _pool = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _submit(fn, *args) -> Future:
+    if not _pending.acquire(blocking=False):
+        raise PasswordBusyError()
+    try:
+        future = get_pool().submit(fn, *args)
+    except BaseException:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future
+
+
+# ------------------------------
+# 동기 (스레드풀의 동기 라우트용: 결과를 기다리는 동안 GIL/CPU 를 잡지 않음)
+# ------------------------------
+def hash_password(password: str) -> str:
+    if get_pool() is None:
+        return _hash(password, PASSWORD_BCRYPT_ROUNDS)
+    return _submit(_hash, password, PASSWORD_BCRYPT_ROUNDS).result()
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    if get_pool() is None:
+        return _verify(password, hashed)
+    return _submit(_verify, password, hashed).result()
+
+
+# ------------------------------
+# async
+# ------------------------------
+async def hash_password_async(password: str) -> str:
+    if get_pool() is None:
+        return await asyncio.to_thread(_hash, password, PASSWORD_BCRYPT_ROUNDS)
+    return await asyncio.wrap_future(_submit(_hash, password, PASSWORD_BCRYPT_ROUNDS))
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    if get_pool() is None:
+        return await asyncio.to_thread(_verify, password, hashed)
+    return await asyncio.wrap_future(_submit(_verify, password, hashed))
+
+
+_dummy_hash: Optional[str] = None
+
+
+def dummy_hash() -> str:
+    """없는 이메일로 로그인해도 검증 1번만큼 시간을 쓰게 하는 해시 (가입 여부가 응답 시간으로 드러나지 않게)"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("dummy-password")
+    return _dummy_hash
+
+
+async def dummy_hash_async() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password_async("dummy-password")
+    return _dummy_hash
+
+
+def needs_rehash(hashed: str) -> bool:
+    """bcrypt 해시("$2b$12$...") 의 비용이 PASSWORD_BCRYPT_ROUNDS 와 다르면 True"""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return True
+    return int(parts[2]) != PASSWORD_BCRYPT_ROUNDS
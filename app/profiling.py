@@ -0,0 +1,239 @@
+# app/profiling.py
+"""
+요청 단위 샘플링 프로파일러 (PROFILING_ENABLED=1 일 때만 미들웨어 등록)
+
+프로파일 대상 요청
+- 관리자 토큰(Authorization: Bearer, ADMIN_USER_IDS) + X-Profile: 1 헤더
+- PROFILE_SAMPLE_RATE 비율만큼 무작위 요청 (0~1, 기본 0)
+
+요청을 처리하는 동안 별도 스레드가 PROFILE_INTERVAL_MS 마다 스택을 샘플링한다.
+- 이벤트 루프 스레드: 이 요청의 코루틴이 실행 중일 때의 스택 (async 라우트/의존성)
+- 그 밖의 스레드: 이 요청 라우트의 endpoint/의존성 함수가 스택에 있을 때 (스레드풀에서 도는 동기 라우트)
+  같은 라우트 요청이 동시에 돌고 있으면 그 요청의 스택도 섞일 수 있다.
+
+결과는 PROFILE_DIR 에 collapsed stack 형식("frame;frame;frame 샘플수") 으로 저장한다.
+파일 이름: {시각}_{METHOD}_{라우트}.collapsed, 최근 PROFILE_MAX_FILES 개만 유지.
+flamegraph.pl / speedscope 로 바로 열 수 있고, 목록/다운로드는 GET /admin/profiles.
+
+PROFILING_ENABLED=0 (기본) 이면 미들웨어 자체가 없으므로 요청 처리 비용은 0 이다.
+"""
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional
+
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.instrumentation import route_template
+
+# 설정 설명은 app.config.Settings 참고
+settings = get_settings()
+
+PROFILE_SAMPLE_RATE: float = settings.profile_sample_rate
+PROFILE_INTERVAL_MS: float = settings.profile_interval_ms
+PROFILE_DIR: str = settings.profile_dir
+PROFILE_MAX_FILES: int = settings.profile_max_files
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".collapsed"
+# 스택 하나의 최대 깊이 (재귀가 깊은 경우 대비)
+MAX_STACK_DEPTH = 200
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _route_codes(route) -> FrozenSet:
+    """라우트 endpoint 와 (하위) 의존성 함수들의 code 객체"""
+    codes = set()
+    endpoint_code = getattr(getattr(route, "endpoint", None), "__code__", None)
+    if endpoint_code is not None:
+        codes.add(endpoint_code)
+    pending = [getattr(route, "dependant", None)]
+    while pending:
+        dependant = pending.pop()
+        if dependant is None:
+            continue
+        code = getattr(getattr(dependant, "call", None), "__code__", None)
+        if code is not None:
+            codes.add(code)
+        pending.extend(getattr(dependant, "dependencies", []) or [])
+    return frozenset(codes)
+
+
+# ------------------------------
+# 샘플러
+# ------------------------------
+class RequestSampler:
+    """요청 1건 동안 스택을 모으는 스레드"""
+
+    def __init__(self, scope: dict, loop_thread_id: int, request_frame, interval: float) -> None:
+        self.scope = scope
+        self.loop_thread_id = loop_thread_id
+        self.request_frame = request_frame
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._codes: Optional[FrozenSet] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._request_stack(thread_id, frame)
+                if stack:
+                    self.stacks[";".join(stack)] += 1
+
+    def _target_codes(self) -> FrozenSet:
+        if self._codes is None and self.scope.get("route") is not None:
+            self._codes = _route_codes(self.scope["route"])
+        return self._codes or frozenset()
+
+    def _request_stack(self, thread_id: int, frame) -> List[str]:
+        """이 요청에 속한 스택이면 바깥→안쪽 순서의 frame 이름 목록, 아니면 []"""
+        frames = []
+        while frame is not None and len(frames) < MAX_STACK_DEPTH:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+
+        if thread_id == self.loop_thread_id:
+            # 이 요청의 미들웨어 frame 아래만 (다른 요청/이벤트 루프 대기 중이면 제외)
+            for index, f in enumerate(frames):
+                if f is self.request_frame:
+                    return [_frame_label(f) for f in frames[index:]]
+            return []
+
+        codes = self._target_codes()
+        for index, f in enumerate(frames):
+            if f.f_code in codes:
+                return [_frame_label(f) for f in frames[index:]]
+        return []
+
+
+# ------------------------------
+# 저장 / 조회
+# ------------------------------
+def profile_filename(method: str, route: str, at: datetime) -> str:
+    slug = _UNSAFE_CHARS.sub("_", route).strip("_") or "root"
+    return f"{at.strftime('%Y%m%d-%H%M%S-%f')}_{method}_{slug}{PROFILE_SUFFIX}"
+
+
+def save_profile(sampler: RequestSampler, method: str, route: str) -> Optional[str]:
+    if not sampler.stacks:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = profile_filename(method, route, datetime.now())
+    with open(os.path.join(PROFILE_DIR, name), "w", encoding="utf-8") as f:
+        for stack, count in sampler.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    _prune_profiles()
+    return name
+
+
+def _prune_profiles() -> None:
+    names = sorted(n for n in os.listdir(PROFILE_DIR) if n.endswith(PROFILE_SUFFIX))
+    for name in names[:-PROFILE_MAX_FILES] if PROFILE_MAX_FILES > 0 else []:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, name))
+        except OSError:
+            pass
+
+
+def list_profiles() -> List[Dict]:
+    """최신순 [{name, size, created_at}]"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if not name.endswith(PROFILE_SUFFIX):
+            continue
+        stat = os.stat(os.path.join(PROFILE_DIR, name))
+        profiles.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+        })
+    return profiles
+
+
+def profile_path(name: str) -> Optional[str]:
+    """PROFILE_DIR 안의 파일만 (경로 조작 방지)"""
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+# ------------------------------
+# 미들웨어
+# ------------------------------
+def _is_admin_request(headers: Dict[bytes, bytes]) -> bool:
+    from app.deps import ADMIN_USER_IDS, user_id_from_token
+
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        return user_id_from_token(token, HTTPException(status_code=401)) in ADMIN_USER_IDS
+    except HTTPException:
+        return False
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, interval_ms: float = PROFILE_INTERVAL_MS) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+
+    def _should_profile(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) in (b"1", b"true") and _is_admin_request(headers):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = RequestSampler(scope, threading.get_ident(), sys._getframe(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            route = route_template(scope) or scope["path"]
+            try:
+                name = save_profile(sampler, scope["method"], route)
+                print(
+                    "[PROFILE]", scope["method"], route,
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms",
+                    f"samples={sum(sampler.stacks.values())}", name,
+                )
+            except OSError as e:
+                print("[PROFILE_ERROR]", e)
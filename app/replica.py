@@ -0,0 +1,91 @@
+# app/replica.py
+"""
+로컬/테스트용 읽기 복제본 (SQLite 파일 2개)
+
+    READ_DATABASE_URL=sqlite:///./app_read.db python -m app.replica          # 주기 동기화
+    READ_DATABASE_URL=sqlite:///./app_read.db python -m app.replica --once   # 1회 복사
+
+운영(MySQL) 에서는 DB 자체 복제를 쓰고 READ_DATABASE_URL 만 복제본으로 지정하면 된다.
+여기서는 sqlite3 backup API 로 primary 파일을 복제본 파일에 통째로 복사해 복제 지연을 흉내 낸다.
+- API 프로세스 안에서는 REPLICA_SYNC_SECONDS > 0 이면 스레드로 주기 실행 (app.main)
+- READ_YOUR_WRITES_SECONDS 는 REPLICA_SYNC_SECONDS 보다 길게 둘 것
+"""
+import argparse
+import threading
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+
+from app.config import get_settings
+from app.db import DATABASE_URL, READ_DATABASE_URL, engine, read_engine
+
+# 복제본 동기화 주기(초), 0 이면 API 프로세스에서 돌리지 않음
+REPLICA_SYNC_SECONDS: float = get_settings().replica_sync_seconds
+
+
+def is_sqlite_replica() -> bool:
+    return (
+        bool(READ_DATABASE_URL)
+        and DATABASE_URL.startswith("sqlite")
+        and READ_DATABASE_URL.startswith("sqlite")
+    )
+
+
+def sync_sqlite_replica() -> float:
+    """primary → 복제본 전체 복사. 걸린 시간(초) 반환"""
+    started = time.perf_counter()
+    src = engine.raw_connection()
+    dst = read_engine.raw_connection()
+    try:
+        # backup 은 복사 중 primary 쓰기를 막지 않고, 복제본 읽기는 끝날 때까지 잠깐 기다린다
+        src.driver_connection.backup(dst.driver_connection)
+    finally:
+        dst.close()
+        src.close()
+    return time.perf_counter() - started
+
+
+def sync_loop(interval: float, stop: Optional[threading.Event] = None) -> None:
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            sync_sqlite_replica()
+        except Exception as e:
+            print("[REPLICA]", e)
+        stop.wait(interval)
+
+
+def register_sync_task(app: FastAPI) -> None:
+    """API 프로세스 안에서 복제본 동기화 스레드 1개 실행 (SQLite 복제본일 때만)"""
+    if not is_sqlite_replica() or REPLICA_SYNC_SECONDS <= 0:
+        return
+
+    stop = threading.Event()
+
+    @app.on_event("startup")
+    def _start_sync():
+        threading.Thread(target=sync_loop, args=(REPLICA_SYNC_SECONDS, stop), daemon=True).start()
+
+    @app.on_event("shutdown")
+    def _stop_sync():
+        stop.set()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 읽기 복제본 동기화")
+    parser.add_argument("--once", action="store_true", help="1회만 복사하고 종료")
+    parser.add_argument("--interval", type=float, default=REPLICA_SYNC_SECONDS or 2)
+    args = parser.parse_args()
+
+    if not is_sqlite_replica():
+        parser.error("DATABASE_URL 과 READ_DATABASE_URL 이 모두 SQLite 일 때만 사용할 수 있습니다.")
+
+    if args.once:
+        print(f"[REPLICA] synced in {sync_sqlite_replica():.3f}s")
+        return
+    sync_loop(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,32 @@
-# app/routers/auth.py  (카카오 단일 로그인 버전)
+# app/routers/auth.py  (카카오 로그인 + 이메일/비밀번호 로그인)
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
-import os
+from typing import Optional, Tuple
 import urllib.parse
-import requests  # pip install requests
 
 from fastapi.responses import RedirectResponse   # ★ 추가
 
-from dotenv import load_dotenv
-load_dotenv()
-
-from app import models, schemas
-from app.deps import get_db, create_access_token
+from app import kakao, models, passwords, schemas
+from app.config import get_settings
+from app.db import ASYNC_DB
+from app.crud.users import upsert_social_user, upsert_social_user_async
+from app.deps import get_async_db, get_db, create_user_access_token
 
 router = APIRouter()
 
+settings = get_settings()
+
 # 환경변수에서 카카오 앱 정보 가져오기
-KAKAO_CLIENT_ID: str = os.getenv("KAKAO_CLIENT_ID", "")
-KAKAO_REDIRECT_URI: str = os.getenv("KAKAO_REDIRECT_URI", "")
+KAKAO_CLIENT_ID: str = settings.kakao_client_id
+KAKAO_REDIRECT_URI: str = settings.kakao_redirect_uri
 
 # 카카오 로그인 완료 후, 우리가 최종적으로 보내줄 프론트 주소
 # 👉 프론트 라우팅에 맞게 경로만 바꿔도 됨 (예: /auth/kakao/success 등)
-FRONTEND_LOGIN_SUCCESS_URL: str = os.getenv(
-    "FRONTEND_LOGIN_SUCCESS_URL",
-    "http://localhost:3000/login/success"  # 기본값
-)
-
-print("DEBUG KAKAO_CLIENT_ID:", KAKAO_CLIENT_ID)
-print("DEBUG KAKAO_REDIRECT_URI:", KAKAO_REDIRECT_URI)
-
-if not KAKAO_CLIENT_ID or not KAKAO_REDIRECT_URI:
-    print("[WARN] KAKAO_CLIENT_ID 또는 KAKAO_REDIRECT_URI가 설정되지 않았습니다.")
+FRONTEND_LOGIN_SUCCESS_URL: str = settings.frontend_login_success_url
 
 
 # ---------- 1) 카카오 로그인 URL 제공 ----------
@@ -55,7 +49,39 @@ def kakao_login_url():
 
 # ---------- 2) 카카오 콜백: 자동 회원가입 + 로그인 ----------
 # ★ response_model 제거 (이제 RedirectResponse를 리턴함)
-@router.get("/kakao/callback")
+def _kakao_profile(kakao_user: dict) -> Tuple[str, str]:
+    """카카오 사용자 정보 → (카카오 고유 ID, 닉네임)"""
+    kakao_id = str(kakao_user.get("id"))  # 카카오 고유 유저 ID
+    if not kakao_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="카카오 사용자 ID를 가져오지 못했습니다.",
+        )
+
+    kakao_account = kakao_user.get("kakao_account", {}) or {}
+    profile = kakao_account.get("profile", {}) or {}
+
+    nickname = profile.get("nickname") or "카카오유저"
+    return kakao_id, nickname
+
+
+def _kakao_access_token(token_json: dict) -> str:
+    kakao_access_token: Optional[str] = token_json.get("access_token")
+    if not kakao_access_token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="카카오 액세스 토큰이 없습니다.",
+        )
+    return kakao_access_token
+
+
+def _login_redirect(user: models.User) -> RedirectResponse:
+    # 우리 서비스용 JWT 발급 후 프론트로 리다이렉트 (쿼리스트링으로 토큰 전달)
+    access_token = create_user_access_token(user)
+    redirect_url = f"{FRONTEND_LOGIN_SUCCESS_URL}?token={access_token}"
+    return RedirectResponse(url=redirect_url, status_code=302)
+
+
 def kakao_callback(code: str, db: Session = Depends(get_db)):
     """
     카카오에서 redirect_uri로 넘겨주는 code를 받아서:
@@ -63,6 +89,7 @@ def kakao_callback(code: str, db: Session = Depends(get_db)):
       2) 사용자 정보 조회
       3) 우리 DB에 사용자 생성 or 조회
       4) JWT(access_token) 발급 후 프론트로 리다이렉트
+    카카오 호출은 app.kakao (공용 연결 풀, 시간 제한, 재시도)
     """
     if not code:
         raise HTTPException(
@@ -70,87 +97,44 @@ def kakao_callback(code: str, db: Session = Depends(get_db)):
             detail="인가 코드(code)가 없습니다.",
         )
 
-    # 1) code -> access_token 교환
-    token_url = "https://kauth.kakao.com/oauth/token"
-    data = {
-        "grant_type": "authorization_code",
-        "client_id": KAKAO_CLIENT_ID,
-        "redirect_uri": KAKAO_REDIRECT_URI,
-        "code": code,
-        # "client_secret": os.getenv("KAKAO_CLIENT_SECRET", "")
-    }
+    try:
+        # 1) code -> access_token 교환
+        kakao_access_token = _kakao_access_token(kakao.exchange_code(code))
+        # 2) access_token으로 사용자 정보 조회
+        kakao_id, nickname = _kakao_profile(kakao.fetch_user(kakao_access_token))
+    except kakao.KakaoError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    token_res = requests.post(token_url, data=data)
-    if token_res.status_code != 200:
-        print("[KAKAO TOKEN ERROR]", token_res.text)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="카카오 토큰 요청에 실패했습니다.",
-        )
+    # 3) 이 카카오 계정의 유저 조회 or 자동 회원가입 (upsert 1번, app.crud.users)
+    user = upsert_social_user(db, "kakao", kakao_id, nickname)
 
-    token_json = token_res.json()
-    kakao_access_token: Optional[str] = token_json.get("access_token")
-    if not kakao_access_token:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="카카오 액세스 토큰이 없습니다.",
-        )
+    # 4), 5) JWT 발급 + 프론트로 리다이렉트 (commit 하면 user 속성이 expire 되므로 먼저 만듦)
+    response = _login_redirect(user)
+    db.commit()
+    return response
 
-    # 2) access_token으로 사용자 정보 조회
-    user_info_res = requests.get(
-        "https://kapi.kakao.com/v2/user/me",
-        headers={"Authorization": f"Bearer {kakao_access_token}"},
-    )
-    if user_info_res.status_code != 200:
-        print("[KAKAO USER INFO ERROR]", user_info_res.text)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="카카오 사용자 정보 조회에 실패했습니다.",
-        )
 
-    kakao_user = user_info_res.json()
-    kakao_id = str(kakao_user.get("id"))  # 카카오 고유 유저 ID
-    if not kakao_id:
+async def kakao_callback_async(code: str, db: AsyncSession = Depends(get_async_db)):
+    """kakao_callback 의 async 버전 (ASYNC_DB=1). 카카오 응답을 기다리는 동안 스레드를 잡지 않음"""
+    if not code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="카카오 사용자 ID를 가져오지 못했습니다.",
+            detail="인가 코드(code)가 없습니다.",
         )
 
-    kakao_account = kakao_user.get("kakao_account", {}) or {}
-    profile = kakao_account.get("profile", {}) or {}
-
-    nickname = profile.get("nickname") or "카카오유저"
-    birth_year = None  # 필요하면 나중에 확장
-
-    # 3) DB에서 이 카카오 계정이 이미 존재하는지 확인
-    user = (
-        db.query(models.User)
-        .filter(
-            models.User.social_provider == "kakao",
-            models.User.social_id == kakao_id,
-        )
-        .first()
-    )
+    try:
+        kakao_access_token = _kakao_access_token(await kakao.exchange_code_async(code))
+        kakao_id, nickname = _kakao_profile(await kakao.fetch_user_async(kakao_access_token))
+    except kakao.KakaoError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    # 3-1) 첫 로그인: 자동 회원가입
-    if not user:
-        user = models.User(
-            social_provider="kakao",
-            social_id=kakao_id,
-            nickname=nickname,
-            user_type="YOUNG",
-            hashed_password=None,  # 소셜로그인 전용
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    user = await upsert_social_user_async(db, "kakao", kakao_id, nickname)
+    response = _login_redirect(user)
+    await db.commit()
+    return response
 
-    # 4) 우리 서비스용 JWT 발급
-    access_token = create_access_token(data={"sub": str(user.user_id)})
 
-    # 5) 프론트로 리다이렉트 (쿼리스트링으로 토큰 전달)
-    redirect_url = f"{FRONTEND_LOGIN_SUCCESS_URL}?token={access_token}"
-    return RedirectResponse(url=redirect_url, status_code=302)
+router.get("/kakao/callback")(kakao_callback_async if ASYNC_DB else kakao_callback)
 
 
 # ---------- 3) 프론트가 카카오 정보를 직접 보내는 방식 (POST) ----------
@@ -171,32 +155,153 @@ def kakao_callback_direct(payload: dict, db: Session = Depends(get_db)):
             detail="kakao_id가 전달되지 않았습니다."
         )
 
-    # DB에서 유저 조회
-    user = (
-        db.query(models.User)
-        .filter(
-            models.User.social_provider == "kakao",
-            models.User.social_id == kakao_id
-        )
-        .first()
-    )
-
-    # 없다면 자동 회원가입
-    if not user:
-        user = models.User(
-            social_provider="kakao",
-            social_id=kakao_id,
-            nickname=nickname or "카카오유저",
-            user_type="YOUNG"
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    # 유저 조회 or 자동 회원가입 (upsert 1번)
+    user = upsert_social_user(db, "kakao", kakao_id, nickname or "카카오유저")
 
-    # JWT 토큰 생성
-    access_token = create_access_token(data={"sub": str(user.user_id)})
+    # JWT 토큰 생성 (commit 전에: commit 하면 user 속성이 expire 됨)
+    access_token = create_user_access_token(user)
+    db.commit()
 
     return schemas.Token(
         access_token=access_token,
         token_type="bearer"
     )
+
+
+# ---------- 4) 이메일/비밀번호 회원가입 + 로그인 ----------
+# bcrypt 는 app.passwords 의 프로세스 풀에서 계산 (요청 스레드/이벤트 루프에서 CPU 를 쓰지 않음)
+def _email_user_stmt(email: str):
+    return select(models.User).where(models.User.email == email).limit(1)
+
+
+def _email_taken() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 가입된 이메일입니다.")
+
+
+def _login_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="이메일 또는 비밀번호가 올바르지 않습니다.",
+    )
+
+
+def _password_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요.",
+    )
+
+
+def _new_password_user(req: schemas.PasswordSignupRequest, hashed_password: str) -> models.User:
+    return models.User(email=req.email, nickname=req.nickname, hashed_password=hashed_password)
+
+
+def password_signup(req: schemas.PasswordSignupRequest, db: Session = Depends(get_db)):
+    if db.scalar(_email_user_stmt(req.email)) is not None:
+        raise _email_taken()
+    # bcrypt 를 기다리는 동안 DB 연결을 잡고 있지 않도록 반납 (로그인이 몰리면 풀이 마름)
+    db.rollback()
+    try:
+        hashed_password = passwords.hash_password(req.password)
+    except passwords.PasswordBusyError:
+        raise _password_busy()
+
+    user = _new_password_user(req, hashed_password)
+    db.add(user)
+    try:
+        db.flush()
+    except IntegrityError:
+        # 같은 이메일로 동시에 가입한 경우
+        db.rollback()
+        raise _email_taken()
+    access_token = create_user_access_token(user)
+    db.commit()
+    return schemas.Token(access_token=access_token, token_type="bearer")
+
+
+async def password_signup_async(req: schemas.PasswordSignupRequest, db: AsyncSession = Depends(get_async_db)):
+    """password_signup 의 async 버전 (ASYNC_DB=1)"""
+    if await db.scalar(_email_user_stmt(req.email)) is not None:
+        raise _email_taken()
+    await db.rollback()
+    try:
+        hashed_password = await passwords.hash_password_async(req.password)
+    except passwords.PasswordBusyError:
+        raise _password_busy()
+
+    user = _new_password_user(req, hashed_password)
+    db.add(user)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise _email_taken()
+    access_token = create_user_access_token(user)
+    await db.commit()
+    return schemas.Token(access_token=access_token, token_type="bearer")
+
+
+router.post("/signup", response_model=schemas.Token, status_code=status.HTTP_201_CREATED)(
+    password_signup_async if ASYNC_DB else password_signup
+)
+
+
+def password_login(req: schemas.PasswordLoginRequest, db: Session = Depends(get_db)):
+    """
+    - 없는 이메일/소셜 전용 계정도 검증 1번만큼 시간을 쓴 뒤 401 (가입 여부가 응답 시간으로 드러나지 않게)
+    - PASSWORD_BCRYPT_ROUNDS 가 바뀐 해시면 로그인 성공 시 새 비용으로 다시 저장
+    """
+    user = db.scalar(_email_user_stmt(req.email))
+    hashed_password = user.hashed_password if user is not None and user.hashed_password else None
+    # bcrypt 를 기다리는 동안 DB 연결을 잡고 있지 않도록 반납 (user 는 세션에서 떼어 값 유지)
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    try:
+        ok = passwords.verify_password(req.password, hashed_password or passwords.dummy_hash())
+    except passwords.PasswordBusyError:
+        raise _password_busy()
+    if not ok or hashed_password is None:
+        raise _login_failed()
+
+    access_token = create_user_access_token(user)
+    if passwords.needs_rehash(hashed_password):
+        try:
+            new_hash = passwords.hash_password(req.password)
+        except passwords.PasswordBusyError:
+            new_hash = None  # 다음 로그인 때 다시
+        if new_hash:
+            db.add(user)
+            user.hashed_password = new_hash
+            db.commit()
+    return schemas.Token(access_token=access_token, token_type="bearer")
+
+
+async def password_login_async(req: schemas.PasswordLoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """password_login 의 async 버전 (ASYNC_DB=1)"""
+    user = await db.scalar(_email_user_stmt(req.email))
+    hashed_password = user.hashed_password if user is not None and user.hashed_password else None
+    if user is not None:
+        db.expunge(user)
+    await db.rollback()
+    try:
+        ok = await passwords.verify_password_async(req.password, hashed_password or await passwords.dummy_hash_async())
+    except passwords.PasswordBusyError:
+        raise _password_busy()
+    if not ok or hashed_password is None:
+        raise _login_failed()
+
+    access_token = create_user_access_token(user)
+    if passwords.needs_rehash(hashed_password):
+        try:
+            new_hash = await passwords.hash_password_async(req.password)
+        except passwords.PasswordBusyError:
+            new_hash = None
+        if new_hash:
+            db.add(user)
+            user.hashed_password = new_hash
+            await db.commit()
+    return schemas.Token(access_token=access_token, token_type="bearer")
+
+
+router.post("/login", response_model=schemas.Token)(password_login_async if ASYNC_DB else password_login)
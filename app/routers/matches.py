@@ -1,23 +1,71 @@
 # app/routers/matches.py
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+import logging
 import threading
 import time
+from collections import Counter
 
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, status
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.deps import get_db, get_active_user  # 약관 동의 + 로그인된 유저만 매칭 가능
-from app.db import SessionLocal
+from app.config import get_settings
+from app.crud.match import (
+    ClaimCursor,
+    apply_matched_pairs,
+    claim_pending_entries,
+    load_matching_snapshot,
+    match_new_entry,
+    matched_pair_rows,
+    new_worker_id,
+    release_claims,
+)
+from app.deps import (  # 약관 동의 + 로그인된 유저만 매칭 가능
+    get_active_user,
+    get_active_user_async,
+    get_admin_user,
+    get_async_db,
+    get_db,
+    get_read_db,
+)
+from app.db import ASYNC_DB
+from app.instrumentation import track_queries
+from app.matching_events import notify_queue_changed
+from app.metrics import observe_matching_round
+from app.matching import (
+    MATCHING_MODES,
+    MatchingRoundStats,
+    MatchingSnapshot,
+    build_index,
+    pair_entries,
+    unmatched_entries,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# 주기 매칭 라운드 방식: greedy(기본, FIFO first-fit) / maximum(최대 매칭)
+MATCHING_MODE: str = settings.matching_mode
+# 라운드 1회에 선점할 최대 대기열 row 수 / 선점 유지 시간(초)
+MATCH_CLAIM_BATCH: int = settings.match_claim_batch
+MATCH_LEASE_SECONDS: int = settings.match_lease_seconds
+
+# 만료 처리 시 한 트랜잭션에서 다루는 최대 row 수
+MATCH_EXPIRE_CHUNK_SIZE: int = settings.match_expire_chunk_size
+
+# 워커별 대기열 선점 커서 (worker_id → 마지막으로 가져간 row 의 (requested_at, match_id))
+_claim_cursors: Dict[str, ClaimCursor] = {}
 
 router = APIRouter()
 
 # ------------------------------
 # 1) 랜덤 매칭 시작 (MAIN-2310, 2320)
 # ------------------------------
-@router.post("/start", response_model=schemas.MatchStartResponse)
 def start_matching(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_active_user),
@@ -32,24 +80,9 @@ def start_matching(
             ),
         )
 
-    # 재능 카드 존재 여부 확인
-    learn_talent = (
-        db.query(models.Talent)
-        .filter(
-            models.Talent.user_id == current_user.user_id,
-            models.Talent.type.ilike("learn"),
-        )
-        .first()
-    )
-    teach_talent = (
-        db.query(models.Talent)
-        .filter(
-            models.Talent.user_id == current_user.user_id,
-            models.Talent.type.ilike("teach"),
-        )
-        .first()
-    )
-    if not learn_talent or not teach_talent:
+    # 재능 카드 존재 여부 확인 (매칭 프로필 PK 조회 1회)
+    profile = db.get(models.MatchingProfile, current_user.user_id)
+    if profile is None or not profile.learn_category or not profile.teach_category:
         return schemas.MatchStartResponse(
             result=schemas.MatchStartResult.NO_TALENT,
             message=(
@@ -87,8 +120,10 @@ def start_matching(
     db.commit()
     db.refresh(new_entry)
 
-    # 바로 1회 매칭 시도
-    run_matching_once(db)
+    # 신규 신청자만 기존 대기자와 바로 맞춰 봄 (대기열 전체 매칭은 주기 작업 담당)
+    # 못 맞췄으면 (상대가 없거나, 상대 row 를 워커 라운드가 선점 중) 워커를 바로 깨운다
+    if not match_new_entry(db, new_entry, current_user, profile.teach_category):
+        notify_queue_changed()
 
     # 매칭이 즉시 잡혔는지 확인
     confirmed = (
@@ -123,126 +158,246 @@ def start_matching(
     )
 
 
-# ------------------------------
-# 2) 매칭 알고리즘 1회 실행 (MAIN-2321, 2322)
-# ------------------------------
-def run_matching_once(db: Session) -> None:
-    pending_entries: List[models.MatchingQueue] = (
-        db.query(models.MatchingQueue)
-        .filter(
-            models.MatchingQueue.status == "PENDING",
-            models.MatchingQueue.user_b_id.is_(None),
+async def start_matching_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_active_user_async),
+):
+    """
+    start_matching 의 async 버전 (ASYNC_DB=1)
+    즉시 매칭(match_new_entry) 은 동기 코드를 그대로 run_sync 로 실행한다.
+    """
+    if current_user.user_type == "MIDDLE":
+        return schemas.MatchStartResponse(
+            result=schemas.MatchStartResult.MIDDLE_USER,
+            message=(
+                "현재 서비스는 청년-시니어 세대 간 교류를 위해 운영 중입니다.\n"
+                "세대 조건이 맞지 않아 매칭 신청이 불가합니다."
+            ),
         )
-        .order_by(models.MatchingQueue.requested_at.asc())
-        .all()
-    )
 
-    used = set()
+    profile = await db.get(models.MatchingProfile, current_user.user_id)
+    if profile is None or not profile.learn_category or not profile.teach_category:
+        return schemas.MatchStartResponse(
+            result=schemas.MatchStartResult.NO_TALENT,
+            message=(
+                "랜덤 매칭을 시작하려면\n"
+                "'배우고 싶은 재능'과 '가르쳐줄 수 있는 재능' 카드를 모두 등록해야 합니다."
+            ),
+        )
 
-    def get_categories(user_id: int) -> Optional[tuple[str, str]]:
-        learn = (
-            db.query(models.Talent)
-            .filter(
-                models.Talent.user_id == user_id,
-                models.Talent.type.ilike("learn"),
-            )
-            .first()
+    existing = (await db.scalars(
+        select(models.MatchingQueue).where(
+            models.MatchingQueue.user_a_id == current_user.user_id,
+            models.MatchingQueue.status == "PENDING",
+        ).limit(1)
+    )).first()
+    if existing:
+        return schemas.MatchStartResponse(
+            result=schemas.MatchStartResult.ALREADY_WAITING,
+            message=(
+                "이미 매칭 대기 중입니다.\n"
+                "매칭 결과는 마이페이지의 알림에서 확인해 주세요."
+            ),
+            match_id=existing.match_id,
         )
-        teach = (
-            db.query(models.Talent)
-            .filter(
-                models.Talent.user_id == user_id,
-                models.Talent.type.ilike("teach"),
-            )
-            .first()
+
+    new_entry = models.MatchingQueue(
+        user_a_id=current_user.user_id,
+        status="PENDING",
+        requested_at=datetime.utcnow(),
+    )
+    db.add(new_entry)
+    await db.commit()
+    new_entry_id = new_entry.match_id
+    teach_category = profile.teach_category
+
+    if not await db.run_sync(
+        lambda session: match_new_entry(session, new_entry, current_user, teach_category)
+    ):
+        notify_queue_changed()
+
+    # 매칭이 즉시 잡혔는지 확인 (동기 버전과 같은 기준)
+    confirmed = (await db.scalars(
+        select(models.MatchingQueue)
+        .where(
+            models.MatchingQueue.status.in_(["CONFIRMED", "SUCCESS"]),
+            (
+                (models.MatchingQueue.user_a_id == current_user.user_id)
+                | (models.MatchingQueue.user_b_id == current_user.user_id)
+            ),
+        )
+        .order_by(models.MatchingQueue.confirmed_at.desc())
+        .limit(1)
+    )).first()
+    if confirmed:
+        return schemas.MatchStartResponse(
+            result=schemas.MatchStartResult.MATCHED_IMMEDIATELY,
+            message=(
+                "신청 완료! 바로 매칭이 성사되었습니다.\n"
+                "상대방과의 교류는 마이페이지에서 확인해 보세요."
+            ),
+            match_id=confirmed.match_id,
         )
-        if not learn or not teach:
-            return None
-        return (learn.category, teach.category)
-
-    for i in range(len(pending_entries)):
-        a_entry = pending_entries[i]
-        if a_entry.match_id in used:
-            continue
-
-        user_a = db.query(models.User).get(a_entry.user_a_id)
-        if not user_a or user_a.user_type == "MIDDLE":
-            continue
-
-        cats_a = get_categories(user_a.user_id)
-        if not cats_a:
-            continue
-        a_learn, a_teach = cats_a
-
-        for j in range(i + 1, len(pending_entries)):
-            b_entry = pending_entries[j]
-            if b_entry.match_id in used:
-                continue
-
-            user_b = db.query(models.User).get(b_entry.user_a_id)
-            if not user_b or user_b.user_type == "MIDDLE":
-                continue
-
-            cats_b = get_categories(user_b.user_id)
-            if not cats_b:
-                continue
-            b_learn, b_teach = cats_b
-
-            # 매칭 조건
-            if (a_learn == b_teach) and (user_a.user_type != user_b.user_type):
-                # A row를 최종 매칭 row로 사용
-                a_entry.user_b_id = user_b.user_id
-                a_entry.status = "CONFIRMED"
-                a_entry.shared_category = a_learn
-                a_entry.confirmed_at = datetime.utcnow()
-                a_entry.a_consent = None
-                a_entry.b_consent = None
-
-                # B row는 취소
-                b_entry.status = "CANCELED"
-                b_entry.canceled_at = datetime.utcnow()
-
-                db.add(a_entry)
-                db.add(b_entry)
-
-                # ✅ MATCH_FOUND 알림 생성
-                create_match_found_notifications(db, a_entry, user_a, user_b)
-
-                used.add(a_entry.match_id)
-                used.add(b_entry.match_id)
-                break
 
-    db.commit()
+    return schemas.MatchStartResponse(
+        result=schemas.MatchStartResult.QUEUED,
+        message=(
+            "신청 완료! 매칭이 확정되면 알림(앱 내 뱃지)으로 알려드릴게요.\n"
+            "잠시 후 마이페이지에서 확인해 보세요."
+        ),
+        match_id=new_entry_id,
+    )
 
 
-def create_match_found_notifications(
-    db: Session,
-    match_entry: models.MatchingQueue,
-    user_a: models.User,
-    user_b: models.User,
-):
-    category = match_entry.shared_category or "재능 교환"
+router.post("/start", response_model=schemas.MatchStartResponse)(
+    start_matching_async if ASYNC_DB else start_matching
+)
 
-    msg_a = f"{user_b.nickname}님과 '{category}' 재능 교환 가능성이 생겼습니다!"
-    msg_b = f"{user_a.nickname}님과 '{category}' 재능 교환 가능성이 생겼습니다!"
 
-    notif_a = models.Notification(
-        user_id=user_a.user_id,
-        type="MATCH_FOUND",
-        content=msg_a,
-        link_path=f"/matches/{match_entry.match_id}",
-        is_read=False,
+# ------------------------------
+# 2) 매칭 알고리즘 1회 실행 (MAIN-2321, 2322)
+# ------------------------------
+def run_matching_once(
+    db: Session,
+    worker_id: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+) -> MatchingRoundStats:
+    """
+    대기열을 대상으로 매칭 1라운드 실행.
+    - 대기열 row 선점(lease) → 스냅샷 로드 (쿼리 고정 2회) → 메모리에서 짝 찾기
+      → 일괄 UPDATE/INSERT → 선점 해제
+    - 여러 워커가 동시에 돌아도 선점한 row 만 다루므로 중복 매칭이 없다.
+    - 라운드마다 실행된 SQL 개수를 stats 로 반환하고 로그로 남긴다.
+    """
+    # 커서는 계속 같은 worker_id 로 도는 워커만 이어 간다.
+    # (worker_id 없이 1번 부르는 호출마다 새 id 로 커서를 쌓아 두지 않음)
+    keep_cursor = worker_id is not None
+    worker_id = worker_id or new_worker_id()
+    snapshot = MatchingSnapshot()
+    written = 0
+
+    started = time.perf_counter()
+    with track_queries() as queries:
+        claimed, cursor = claim_pending_entries(
+            db,
+            worker_id,
+            MATCH_LEASE_SECONDS,
+            MATCH_CLAIM_BATCH,
+            categories,
+            after=_claim_cursors.get(worker_id) if keep_cursor else None,
+        )
+        if keep_cursor:
+            if cursor is None:
+                _claim_cursors.pop(worker_id, None)
+            else:
+                _claim_cursors[worker_id] = cursor
+        if claimed:
+            try:
+                snapshot = load_matching_snapshot(db, worker_id)
+                pairs = pair_entries(snapshot.entries, MATCHING_MODE)
+                written = apply_matched_pairs(db, pairs, snapshot.nicknames, worker_id)
+            finally:
+                release_claims(db, worker_id)
+
+    stats = MatchingRoundStats(
+        entries=len(snapshot.entries),
+        pairs=written,
+        sql_statements=queries.statements,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
     )
-    notif_b = models.Notification(
-        user_id=user_b.user_id,
-        type="MATCH_FOUND",
-        content=msg_b,
-        link_path=f"/matches/{match_entry.match_id}",
-        is_read=False,
+    logger.info(
+        "matching round: entries=%d pairs=%d sql=%d elapsed=%.1fms",
+        stats.entries, stats.pairs, stats.sql_statements, stats.elapsed_ms,
     )
-    db.add(notif_a)
-    db.add(notif_b)
-    db.commit()
+    observe_matching_round(stats.elapsed_ms / 1000, stats.pairs)
+    return stats
+
+
+# ------------------------------
+# 2-1) 매칭 라운드 dry-run (운영용, 아무것도 쓰지 않음)
+# ------------------------------
+def dry_run_matching(
+    db: Session,
+    mode: str = MATCHING_MODE,
+    sample_limit: int = 100,
+) -> schemas.MatchDryRunResponse:
+    """
+    지금 대기열 전체로 라운드를 돌렸을 때의 결과를 계산만 한다.
+    - 선점(lease) / UPDATE / 알림 INSERT 없음 → 조회 쿼리만 실행하고 끝에 rollback
+    - 단계별 시간: load(스냅샷) / index(정렬+인덱스) / pair(짝 찾기) / write(반영 파라미터 준비)
+    """
+    started = time.perf_counter()
+    try:
+        with track_queries() as queries:
+            t0 = time.perf_counter()
+            snapshot = load_matching_snapshot(db, worker_id=None)
+            t1 = time.perf_counter()
+            index = build_index(snapshot.entries)
+            t2 = time.perf_counter()
+            pairs = pair_entries(snapshot.entries, mode, index)
+            t3 = time.perf_counter()
+            confirmed, canceled, notifs = matched_pair_rows(pairs, snapshot.nicknames)
+            t4 = time.perf_counter()
+    finally:
+        db.rollback()
+
+    unmatched = unmatched_entries(snapshot.entries, pairs)
+    return schemas.MatchDryRunResponse(
+        mode=mode,
+        entries=len(snapshot.entries),
+        pairs=len(pairs),
+        unmatched=len(unmatched),
+        unmatched_by_reason=dict(Counter(reason for _, reason in unmatched)),
+        would_write={
+            "confirm": len(confirmed),
+            "cancel": len(canceled),
+            "notifications": len(notifs),
+        },
+        sql_statements=queries.statements,
+        timings=schemas.DryRunTimings(
+            load_ms=(t1 - t0) * 1000,
+            index_ms=(t2 - t1) * 1000,
+            pair_ms=(t3 - t2) * 1000,
+            write_ms=(t4 - t3) * 1000,
+            total_ms=(time.perf_counter() - started) * 1000,
+        ),
+        pair_samples=[
+            schemas.DryRunPair(
+                a_match_id=a.match_id,
+                a_user_id=a.user_id,
+                b_match_id=b.match_id,
+                b_user_id=b.user_id,
+                shared_category=a.learn,
+            )
+            for a, b in pairs[:sample_limit]
+        ],
+        unmatched_samples=[
+            schemas.DryRunUnmatched(
+                match_id=e.match_id,
+                user_id=e.user_id,
+                user_type=e.user_type,
+                learn=e.learn,
+                teach=e.teach,
+                reason=reason,
+            )
+            for e, reason in unmatched[:sample_limit]
+        ],
+    )
+
+
+@router.get("/dry-run", response_model=schemas.MatchDryRunResponse)
+def get_matching_dry_run(
+    mode: str = Query(MATCHING_MODE, description="greedy / maximum"),
+    limit: int = Query(100, ge=0, le=10_000, description="응답에 담을 pair/미매칭 샘플 수"),
+    db: Session = Depends(get_db),
+    admin: models.User = Depends(get_admin_user),
+):
+    if mode not in MATCHING_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"알 수 없는 매칭 모드입니다: {mode}",
+        )
+    return dry_run_matching(db, mode, sample_limit=limit)
 
 
 # ------------------------------
@@ -288,6 +443,7 @@ def submit_agreement(
         db.add(match)
         db.commit()
         notify_match_canceled(db, match)
+        notify_queue_changed()
         return schemas.MatchAgreementResponse(
             status=match.status,
             message="매칭이 취소되었습니다. 다시 재능 공유를 신청해보세요.",
@@ -355,40 +511,82 @@ def notify_match_canceled(db: Session, match: models.MatchingQueue) -> None:
 # ------------------------------
 # 4) 24시간 만료 처리 (MATCH_FAIL)
 # ------------------------------
-def expire_old_matches(db: Session) -> None:
+def expire_old_matches(db: Session, chunk_size: Optional[int] = None) -> int:
+    """
+    24시간 지난 PENDING/CONFIRMED 매칭을 CANCELED 로 바꾸고 MATCH_FAIL 알림 발송.
+    - chunk_size 개씩 끊어서 UPDATE 1번 + 알림 INSERT 1번 후 바로 commit
+      → 장애 후 몇십만 건이 밀려 있어도 트랜잭션/메모리 크기가 일정
+    - match_id 순으로 이어서 처리 (keyset), 이 호출이 실제로 만료시킨 건수 반환
+    - 여러 워커가 동시에 돌아도 UPDATE 로 바뀐 row 에만 알림을 보내므로 중복 알림 없음
+    """
+    chunk_size = chunk_size or MATCH_EXPIRE_CHUNK_SIZE
+    Queue = models.MatchingQueue.__table__
     now = datetime.utcnow()
     threshold = now - timedelta(hours=24)
-
-    targets: List[models.MatchingQueue] = (
-        db.query(models.MatchingQueue)
-        .filter(
-            models.MatchingQueue.status.in_(["PENDING", "CONFIRMED"]),
-            models.MatchingQueue.requested_at < threshold,
-        )
-        .all()
+    stale = (
+        Queue.c.status.in_(["PENDING", "CONFIRMED"]),
+        Queue.c.requested_at < threshold,
     )
+    txt = "매칭 대기 시간이 만료되어 매칭이 실패하였습니다."
+
+    expired = 0
+    last_id = 0
+    while True:
+        targets = db.execute(
+            select(Queue.c.match_id, Queue.c.user_a_id, Queue.c.user_b_id)
+            .where(*stale, Queue.c.match_id > last_id)
+            .order_by(Queue.c.match_id.asc())
+            .limit(chunk_size)
+            .with_for_update()
+        ).all()
+        if not targets:
+            db.commit()
+            break
+        last_id = targets[-1].match_id
+
+        # 다른 만료 실행(다른 프로세스의 워커) 이 먼저 바꾼 row 는 UPDATE 에서 빠지므로
+        # 실제로 바뀐 row 에만 알림을 보낸다. (SELECT 만으로는 SQLite 에서 잠기지 않음)
+        target_ids = [t.match_id for t in targets]
+        expire = (
+            update(Queue)
+            .where(Queue.c.match_id.in_(target_ids), *stale)
+            .values(status="CANCELED", canceled_at=now)
+        )
+        if db.get_bind().dialect.update_returning:
+            changed = db.execute(
+                expire.returning(Queue.c.match_id, Queue.c.user_a_id, Queue.c.user_b_id)
+            ).all()
+        else:
+            db.execute(expire)
+            changed = db.execute(
+                select(Queue.c.match_id, Queue.c.user_a_id, Queue.c.user_b_id).where(
+                    Queue.c.match_id.in_(target_ids),
+                    Queue.c.status == "CANCELED",
+                    Queue.c.canceled_at == now,
+                )
+            ).all()
+
+        notifs = [
+            {
+                "user_id": uid,
+                "type": "MATCH_FAIL",
+                "content": txt,
+                "link_path": None,
+                "is_read": False,
+            }
+            for t in changed
+            for uid in (t.user_a_id, t.user_b_id)
+            if uid is not None
+        ]
+        if notifs:
+            db.execute(insert(models.Notification.__table__), notifs)
+        db.commit()
+        expired += len(changed)
 
-    for m in targets:
-        m.status = "CANCELED"
-        m.canceled_at = now
-        db.add(m)
-
-        txt = "매칭 대기 시간이 만료되어 매칭이 실패하였습니다."
-
-        for uid in (m.user_a_id, m.user_b_id):
-            if uid is None:
-                continue
-            notif = models.Notification(
-                user_id=uid,
-                type="MATCH_FAIL",
-                content=txt,
-                link_path=None,
-                is_read=False,
-            )
-            db.add(notif)
+        if len(targets) < chunk_size:
+            break
 
-    if targets:
-        db.commit()
+    return expired
 
 
 # ------------------------------
@@ -396,7 +594,7 @@ def expire_old_matches(db: Session) -> None:
 # ------------------------------
 @router.get("/stats/today", response_model=schemas.TodayMatchStats)
 def get_today_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     today = datetime.utcnow().date()
     start = datetime.combine(today, datetime.min.time())
@@ -421,24 +619,30 @@ def get_today_stats(
 # 6) 주기적 작업 등록 (run_matching_once + expire_old_matches)
 # ------------------------------
 def register_periodic_task(app: FastAPI) -> None:
-    def worker():
-        while True:
-            db = SessionLocal()
-            try:
-                run_matching_once(db)
-                expire_old_matches(db)
-            except Exception as e:
-                print("[MATCH_WORKER_ERROR]", e)
-            finally:
-                db.close()
-            time.sleep(30)
+    """
+    API 프로세스 안에서 매칭 워커 스레드 1개 실행.
+    - 매칭 신청/재능 등록/취소 신호(notify_queue_changed) 를 받으면 바로 라운드 실행
+    - 신호가 없어도 MATCH_WORKER_INTERVAL 마다 1번 (만료 처리)
+    여러 프로세스로 운영할 때는 대신 `python -m app.matching_worker` 를 따로 띄운다.
+    """
+    from app.matching_worker import worker_loop
+
+    stop = threading.Event()
 
     @app.on_event("startup")
     def _start_worker():
-        t = threading.Thread(target=worker, daemon=True)
+        t = threading.Thread(
+            target=worker_loop,
+            args=(new_worker_id(),),
+            kwargs={"stop": stop},
+            daemon=True,
+        )
         t.start()
-        thread = threading.Thread(target=worker, daemon=True)
-        thread.start()
+
+    @app.on_event("shutdown")
+    def _stop_worker():
+        stop.set()
+        notify_queue_changed()   # 대기 중인 워커 스레드를 깨워 종료
 
 # -------------------------------------------
 # 7) 매칭 합의 여부 처리 API
@@ -520,6 +724,7 @@ def submit_match_consent(
         db.add(user)
 
         db.commit()
+        notify_queue_changed()
 
         return schemas.MatchConsentResponse(
             result="CANCELED",
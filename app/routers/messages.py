@@ -1,13 +1,23 @@
 # app/routers/messages.py
-from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc
+from sqlalchemy import or_, desc, select
 
 from app import models, schemas
-from app.deps import get_db, get_active_user
+from app.crud.messages import list_chat_summaries, list_chat_summaries_async, mark_read_stmt
+from app.db import ASYNC_DB
+from app.deps import (
+    get_async_db,
+    get_db,
+    get_active_token_user,
+    get_active_token_user_async,
+    get_active_user,
+    get_active_user_async,
+    get_user_read_db,
+)
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
@@ -16,72 +26,32 @@ def ping_messages():
     return {"area": "messages", "status": "ok"}
 
 #쪽지 목록
-@router.get("", response_model=List[schemas.ChatSummary])
-def list_chats(db: Session = Depends(get_db), current_user: models.User = Depends(get_active_user)):
+def list_chats(db: Session = Depends(get_user_read_db), current_user: models.User = Depends(get_active_token_user)):
     """
     반환: 사용자와 CONFIRMED 상태인 매칭들에 대해, 상대방 정보 + 최근 메시지 + 읽지 않은 개수
     최신순 정렬(가장 최근 메시지 기준).
     차단된 상대는 목록에서 제외.
+    (대화 수와 관계없이 쿼리 4번, app.crud.messages)
     """
-    matches = (
-        db.query(models.MatchingQueue)
-        .filter(
-            models.MatchingQueue.status == "CONFIRMED",
-            ((models.MatchingQueue.user_a_id == current_user.user_id) | (models.MatchingQueue.user_b_id == current_user.user_id))
-        )
-        .all()
-    )
+    return list_chat_summaries(db, current_user.user_id)
+
+
+def _block_between(user_id: int, partner_id: int):
+    return select(models.Block).where(
+        ((models.Block.blocker_id == user_id) & (models.Block.blocked_id == partner_id)) |
+        ((models.Block.blocker_id == partner_id) & (models.Block.blocked_id == user_id))
+    ).limit(1)
+
+
+async def list_chats_async(db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_active_token_user_async)):
+    """list_chats 의 async 버전 (ASYNC_DB=1)"""
+    return await list_chat_summaries_async(db, current_user.user_id)
+
 
-    results: List[schemas.ChatSummary] = []
-    for m in matches:
-        partner_id = m.user_b_id if m.user_a_id == current_user.user_id else m.user_a_id
-        partner = db.query(models.User).get(partner_id)
-        if not partner:
-            continue
-
-        # 차단 검사
-        blocked = db.query(models.Block).filter(
-            ((models.Block.blocker_id == current_user.user_id) & (models.Block.blocked_id == partner_id)) |
-            ((models.Block.blocker_id == partner_id) & (models.Block.blocked_id == current_user.user_id))
-        ).first()
-        if blocked:
-            continue
-
-        # 최근 메시지
-        last_msg = (
-            db.query(models.Message)
-            .filter(models.Message.match_id == m.match_id)
-            .order_by(models.Message.timestamp.desc())
-            .first()
-        )
-
-        # unread count (messages where recipient is current_user and is_read = False)
-        unread_count = db.query(models.Message).filter(
-            models.Message.match_id == m.match_id,
-            models.Message.sender_id != current_user.user_id,
-            models.Message.is_read == False
-        ).count()
-
-        results.append(
-            schemas.ChatSummary(
-                match_id=m.match_id,
-                partner_id=partner.user_id,
-                partner_nickname=partner.nickname,
-                partner_profile_image=getattr(partner, "profile_image", None),
-                shared_category=m.shared_category,
-                last_message=last_msg.content if last_msg else None,
-                last_message_time=last_msg.timestamp if last_msg else None,
-                unread_count=unread_count,
-            )
-        )
-
-    # 정렬: 최신 메시지 시간 기준 내림차순
-    results.sort(key=lambda x: x.last_message_time or datetime.min, reverse=True)
-    return results
+router.get("", response_model=List[schemas.ChatSummary])(list_chats_async if ASYNC_DB else list_chats)
 
 
 # --- 쪽지 상세 ---
-@router.get("/{match_id}", response_model=List[schemas.MessageItem])
 def get_chat_detail(match_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_active_user)):
     """
     대화 상세: match_id 기준 메시지 전체를 시간순으로 반환.
@@ -103,24 +73,36 @@ def get_chat_detail(match_id: int, db: Session = Depends(get_db), current_user:
         ((models.Block.blocker_id == partner_id) & (models.Block.blocked_id == current_user.user_id))
     ).first()
 
-    msgs = db.query(models.Message).filter(models.Message.match_id == match_id).order_by(models.Message.timestamp.asc()).all()
-
     # 읽음 처리: 현재 사용자가 '수신자'인 메시지 중 is_read=False -> True로 변경
-    changed = False
-    for m in msgs:
-        if m.sender_id != current_user.user_id and not m.is_read:
-            m.is_read = True
-            db.add(m)
-            changed = True
-
-    if changed:
+    # (UPDATE 1번. 목록을 먼저 읽고 commit 하면 메시지마다 다시 SELECT 됨)
+    if db.execute(mark_read_stmt(match_id, current_user.user_id)).rowcount:
         db.commit()
 
-    return msgs
+    return db.query(models.Message).filter(models.Message.match_id == match_id).order_by(models.Message.timestamp.asc()).all()
+
+
+async def get_chat_detail_async(match_id: int, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_active_user_async)):
+    """get_chat_detail 의 async 버전 (ASYNC_DB=1)"""
+    match = await db.get(models.MatchingQueue, match_id)
+    if not match:
+        raise HTTPException(status_code=404, detail="매칭 정보를 찾을 수 없습니다.")
+
+    if current_user.user_id not in (match.user_a_id, match.user_b_id):
+        raise HTTPException(status_code=403, detail="이 대화의 당사자가 아닙니다.")
+
+    # 읽음 처리: 현재 사용자가 '수신자'인 메시지 중 is_read=False -> True로 변경
+    if (await db.execute(mark_read_stmt(match_id, current_user.user_id))).rowcount:
+        await db.commit()
+
+    return (await db.scalars(
+        select(models.Message).where(models.Message.match_id == match_id).order_by(models.Message.timestamp.asc())
+    )).all()
+
+
+router.get("/{match_id}", response_model=List[schemas.MessageItem])(get_chat_detail_async if ASYNC_DB else get_chat_detail)
 
 
 # --- 쪽지 전송 API ---
-@router.post("/{match_id}", response_model=schemas.SendMessageResponse)
 def send_message(match_id: int, req: schemas.SendMessageRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_active_user)):
     """
     - 차단 여부 검사
@@ -169,6 +151,44 @@ def send_message(match_id: int, req: schemas.SendMessageRequest, db: Session = D
     return schemas.SendMessageResponse(message=msg)
 
 
+async def send_message_async(match_id: int, req: schemas.SendMessageRequest, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_active_user_async)):
+    """send_message 의 async 버전 (ASYNC_DB=1)"""
+    match = await db.get(models.MatchingQueue, match_id)
+    if not match:
+        raise HTTPException(status_code=404, detail="매칭 정보를 찾을 수 없습니다.")
+
+    if current_user.user_id not in (match.user_a_id, match.user_b_id):
+        raise HTTPException(status_code=403, detail="이 매칭의 당사자가 아닙니다.")
+
+    # 송신 금지: 어느 쪽이든 차단된 경우
+    partner_id = match.user_b_id if current_user.user_id == match.user_a_id else match.user_a_id
+    if (await db.scalars(_block_between(current_user.user_id, partner_id))).first():
+        raise HTTPException(status_code=403, detail="차단된 사용자 입니다. 쪽지를 전송할 수 없습니다.")
+
+    msg = models.Message(
+        match_id=match_id,
+        sender_id=current_user.user_id,
+        content=req.content,
+        is_read=False,
+    )
+    db.add(msg)
+    db.add(models.Notification(
+        user_id=partner_id,
+        type="NEW_MESSAGE",
+        content=f"{current_user.nickname}님으로부터 새로운 쪽지가 도착했습니다.",
+        link_path=f"/messages/{match_id}",
+        is_read=False,
+    ))
+
+    await db.commit()
+    await db.refresh(msg)
+
+    return schemas.SendMessageResponse(message=msg)
+
+
+router.post("/{match_id}", response_model=schemas.SendMessageResponse)(send_message_async if ASYNC_DB else send_message)
+
+
 # --- 신고 처리 ---
 @router.post("/{match_id}/report")
 def report_user(match_id: int, req: schemas.ReportRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_active_user)):
@@ -235,16 +255,7 @@ def mark_read(match_id: int, db: Session = Depends(get_db), current_user: models
     if current_user.user_id not in (match.user_a_id, match.user_b_id):
         raise HTTPException(status_code=403, detail="이 매칭의 당사자가 아닙니다.")
 
-    updated = False
-    messages = db.query(models.Message).filter(
-        models.Message.match_id == match_id,
-        models.Message.sender_id != current_user.user_id,
-        models.Message.is_read == False
-    ).all()
-    for m in messages:
-        m.is_read = True
-        db.add(m)
-        updated = True
+    updated = db.execute(mark_read_stmt(match_id, current_user.user_id)).rowcount
     if updated:
         db.commit()
-    return {"result": "OK", "updated": len(messages)}
+    return {"result": "OK", "updated": updated}
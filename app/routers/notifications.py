@@ -2,10 +2,20 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.deps import get_db, get_current_user
+from app.db import ASYNC_DB
+from app.deps import (
+    get_async_db,
+    get_db,
+    get_current_user,
+    get_token_user,
+    get_token_user_async,
+    get_user_read_db,
+)
 
 router = APIRouter()
 
@@ -13,10 +23,9 @@ router = APIRouter()
 # ------------------------------
 # 1) 내 알림 리스트 조회
 # ------------------------------
-@router.get("/", response_model=List[schemas.NotificationRead])
 def list_notifications(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_user_read_db),
+    current_user: models.User = Depends(get_token_user),
 ):
     """
     현재 로그인한 사용자의 알림 목록 조회
@@ -31,13 +40,30 @@ def list_notifications(
     return notifications
 
 
+async def list_notifications_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_token_user_async),
+):
+    """list_notifications 의 async 버전 (ASYNC_DB=1)"""
+    notifications = await db.scalars(
+        select(models.Notification)
+        .where(models.Notification.user_id == current_user.user_id)
+        .order_by(models.Notification.timestamp.desc())
+    )
+    return notifications.all()
+
+
+router.get("/", response_model=List[schemas.NotificationRead])(
+    list_notifications_async if ASYNC_DB else list_notifications
+)
+
+
 # ------------------------------
 # 2) 안 읽은 알림 개수 조회 (헤더 뱃지용)
 # ------------------------------
-@router.get("/unread-count", response_model=schemas.NotificationUnreadCount)
 def get_unread_count(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_user_read_db),
+    current_user: models.User = Depends(get_token_user),
 ):
     """
     헤더 뱃지 표시용: 읽지 않은(is_read=False) 알림 개수 반환
@@ -53,6 +79,27 @@ def get_unread_count(
     return schemas.NotificationUnreadCount(unread_count=count)
 
 
+async def get_unread_count_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_token_user_async),
+):
+    """get_unread_count 의 async 버전 (ASYNC_DB=1)"""
+    count = await db.scalar(
+        select(func.count())
+        .select_from(models.Notification)
+        .where(
+            models.Notification.user_id == current_user.user_id,
+            models.Notification.is_read.is_(False),
+        )
+    )
+    return schemas.NotificationUnreadCount(unread_count=count)
+
+
+router.get("/unread-count", response_model=schemas.NotificationUnreadCount)(
+    get_unread_count_async if ASYNC_DB else get_unread_count
+)
+
+
 # ------------------------------
 # 3) 알림 전체 읽음 처리 (알림 페이지 진입 시)
 # ------------------------------
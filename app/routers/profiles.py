@@ -0,0 +1,26 @@
+# app/routers/profiles.py
+"""요청 프로파일 목록/다운로드 (관리자, PROFILING_ENABLED=1 일 때만 등록)"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app import models, profiling, schemas
+from app.deps import get_admin_user
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[schemas.ProfileInfo])
+def list_profiles(admin: models.User = Depends(get_admin_user)):
+    """저장된 프로파일 목록 (최신순)"""
+    return profiling.list_profiles()
+
+
+@router.get("/{name}")
+def download_profile(name: str, admin: models.User = Depends(get_admin_user)):
+    """collapsed stack 파일 (flamegraph.pl / speedscope 로 열기)"""
+    path = profiling.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="프로파일을 찾을 수 없습니다.")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=name)
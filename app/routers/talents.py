@@ -4,7 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app import models, schemas
+from app.crud.matching_profile import refresh_matching_profile
 from app.deps import get_db, get_current_user
+from app.matching_events import notify_queue_changed
 
 router = APIRouter(prefix="/talents", tags=["Talents"])
 
@@ -39,8 +41,10 @@ def create_my_talent(
     )
 
     db.add(new_talent)
+    refresh_matching_profile(db, current_user)
     db.commit()
     db.refresh(new_talent)
+    notify_queue_changed()
     return new_talent
 
 
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
+from app.crud.matching_profile import refresh_matching_profile
 from app.deps import get_db, get_current_user, classify_user_type
 
 router = APIRouter()
@@ -52,6 +53,8 @@ def update_my_profile(
         # terms_version은 그대로 두거나, 필요하면 "none" 등으로 초기화할 수도 있음
 
     db.add(current_user)
+    # 세대가 바뀌면 매칭 가능 여부도 바뀜
+    refresh_matching_profile(db, current_user)
     db.commit()
     db.refresh(current_user)
 
@@ -1,6 +1,6 @@
 # app/schemas.py
 from enum import Enum
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import datetime
@@ -38,6 +38,24 @@ class Token(BaseModel):
     token_type: str
 
 
+class PasswordSignupRequest(BaseModel):
+    email: EmailStr
+    password: str = Field(..., min_length=8)
+    nickname: str = Field(..., min_length=1)
+
+    @validator("password")
+    def check_password_bytes(cls, v):
+        # bcrypt 는 72바이트까지만 사용 (app.passwords)
+        if len(v.encode("utf-8")) > 72:
+            raise ValueError("비밀번호는 72바이트(영문 72자, 한글 24자) 이하여야 합니다.")
+        return v
+
+
+class PasswordLoginRequest(BaseModel):
+    email: EmailStr
+    password: str
+
+
 class UserProfileUpdate(BaseModel):
     birth_year: int
     terms_agreed: bool
@@ -143,7 +161,46 @@ class MatchAgreementResponse(BaseModel):
 class TodayMatchStats(BaseModel):
     date: str              # "YYYY-MM-DD"
     matched_pairs: int     # 오늘 CONFIRMED 된 매칭 수
-    
+
+
+# ------ 매칭 dry-run (운영용: 라운드 결과 미리보기, DB 에는 아무것도 쓰지 않음) ------
+class DryRunPair(BaseModel):
+    a_match_id: int        # CONFIRMED 가 될 row (먼저 신청, 배우는 쪽)
+    a_user_id: int
+    b_match_id: int        # CANCELED 가 될 row
+    b_user_id: int
+    shared_category: Optional[str] = None
+
+
+class DryRunUnmatched(BaseModel):
+    match_id: int
+    user_id: int
+    user_type: Optional[str] = None
+    learn: Optional[str] = None
+    teach: Optional[str] = None
+    reason: str            # MIDDLE / UNSUPPORTED_USER_TYPE / NO_TALENT / NO_COMPLEMENT
+
+
+class DryRunTimings(BaseModel):
+    load_ms: float         # 대기열 스냅샷 조회
+    index_ms: float        # FIFO 정렬 + 카테고리 인덱스
+    pair_ms: float         # 짝 찾기
+    write_ms: float        # UPDATE/INSERT 파라미터 준비까지만 (실행하지 않음)
+    total_ms: float
+
+
+class MatchDryRunResponse(BaseModel):
+    mode: str
+    entries: int
+    pairs: int
+    unmatched: int
+    unmatched_by_reason: Dict[str, int]
+    would_write: Dict[str, int]    # confirm / cancel / notifications 건수
+    sql_statements: int            # dry-run 중 실행된 SQL (조회만)
+    timings: DryRunTimings
+    pair_samples: List[DryRunPair]
+    unmatched_samples: List[DryRunUnmatched]
+
 # ------ 재능 카테고리 ------
 class TalentCategory(str, Enum):
     DIGITAL_IT = "디지털/IT"
@@ -310,3 +367,9 @@ class BlockResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+# --- 요청 프로파일 (관리자) ---
+class ProfileInfo(BaseModel):
+    name: str
+    size: int
+    created_at: str
@@ -0,0 +1,175 @@
+# app/slow_query.py
+"""
+느린 쿼리 로그 (app.db 가 엔진을 만들 때 install() 로 연결)
+
+SLOW_QUERY_MS 보다 오래 걸린 statement 를 JSON 한 줄로 남긴다.
+
+    {"ts": "...", "duration_ms": 812.4, "route": "GET /messages/messages",
+     "statement": "SELECT ...", "params": [3, 3], "plan": ["SEARCH messages USING INDEX ..."]}
+
+- route: 요청 처리 중이면 "METHOD /경로/{템플릿}", 매칭 워커 등 요청 밖이면 null
+- plan: SQLite 는 EXPLAIN QUERY PLAN, MySQL 은 EXPLAIN 결과.
+  statement 모양(IN 목록 길이만 다른 것은 같은 모양)마다 처음 한 번만 실행하고 이후 로그는 재사용한다.
+- 출력: SLOW_QUERY_LOG_FILE 을 지정하면 크기 기준 회전 파일, 비우면 stdout
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.config import get_settings
+from app.instrumentation import current_route, statement_shape
+
+# 설정 설명은 app.config.Settings 참고
+settings = get_settings()
+
+SLOW_QUERY_MS: float = settings.slow_query_ms
+SLOW_QUERY_LOG_FILE: str = settings.slow_query_log_file
+SLOW_QUERY_LOG_MAX_BYTES: int = settings.slow_query_log_max_bytes
+SLOW_QUERY_LOG_BACKUPS: int = settings.slow_query_log_backups
+
+# 실행 계획을 기억해 둘 최대 statement 모양 수 (넘으면 새 모양은 계획 없이 기록)
+MAX_PLANS = 1000
+# 로그에 남길 파라미터 최대 개수 / 값 하나의 최대 길이
+MAX_PARAMS = 20
+MAX_PARAM_LENGTH = 200
+
+# EXPLAIN 을 붙일 수 있는 statement (DDL / PRAGMA / BEGIN 등은 제외)
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+logger = logging.getLogger("app.slow_query")
+
+_plans: Dict[str, Optional[list]] = {}
+_plans_lock = threading.Lock()
+
+
+def _configure_logger() -> None:
+    if logger.handlers:
+        return
+    if SLOW_QUERY_LOG_FILE:
+        handler: logging.Handler = RotatingFileHandler(
+            SLOW_QUERY_LOG_FILE,
+            maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=SLOW_QUERY_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _param_value(value):
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_PARAM_LENGTH else text[:MAX_PARAM_LENGTH] + "..."
+
+
+def _loggable_params(parameters, executemany: bool):
+    if executemany:
+        # 여러 행 INSERT/UPDATE: 행 수와 첫 행만
+        rows = list(parameters or [])
+        return {"rows": len(rows), "first": _loggable_params(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        items = list(parameters.items())[:MAX_PARAMS]
+        return {key: _param_value(value) for key, value in items}
+    return [_param_value(value) for value in list(parameters or ())[:MAX_PARAMS]]
+
+
+def explain(conn, statement: str, parameters) -> Optional[list]:
+    """같은 DBAPI 연결에서 실행 계획을 조회 (SQLAlchemy 이벤트/쿼리 카운트를 거치지 않음)"""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        sql = f"EXPLAIN QUERY PLAN {statement}"
+    elif dialect in ("mysql", "mariadb"):
+        sql = f"EXPLAIN {statement}"
+    else:
+        return None
+
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(sql, parameters or ())
+        rows = cursor.fetchall()
+        if dialect == "sqlite":
+            # (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+    finally:
+        cursor.close()
+
+
+def _plan_for(conn, statement: str, parameters, executemany: bool, shape: str) -> Optional[list]:
+    with _plans_lock:
+        if shape in _plans:
+            return _plans[shape]
+        if len(_plans) >= MAX_PLANS:
+            return None
+        # 동시에 같은 모양이 느려도 EXPLAIN 은 한 번만
+        _plans[shape] = None
+
+    if executemany or not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    try:
+        plan = explain(conn, statement, parameters)
+    except Exception as e:
+        plan = [f"EXPLAIN 실패: {e}"]
+    with _plans_lock:
+        _plans[shape] = plan
+    return plan
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 실패한 문장은 after 가 불리지 않으므로 연결이 아니라 실행 단위(context) 에 기록
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    if duration_ms < SLOW_QUERY_MS:
+        return
+
+    try:
+        # 서버 쪽 커서(stream_results) 는 결과를 다 읽기 전에 같은 연결로 다른 쿼리를 보낼 수 없음
+        streaming = context is not None and context.execution_options.get("stream_results")
+        shape = statement_shape(statement)
+        plan = None if streaming else _plan_for(conn, statement, parameters, executemany, shape)
+        logger.info(json.dumps({
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 1),
+            "route": current_route(),
+            "statement": statement,
+            "params": _loggable_params(parameters, executemany),
+            "plan": plan,
+        }, ensure_ascii=False, default=str))
+    except Exception as e:
+        # 로그 때문에 요청이 실패하면 안 됨
+        print("[SLOW_QUERY]", e)
+
+
+def install(sync_engine) -> None:
+    """SLOW_QUERY_MS > 0 이면 엔진에 느린 쿼리 로그 리스너를 건다"""
+    if SLOW_QUERY_MS <= 0:
+        return
+    _configure_logger()
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def captured_plans() -> Dict[str, List]:
+    """지금까지 기록한 statement 모양별 실행 계획 (점검/디버깅용)"""
+    with _plans_lock:
+        return dict(_plans)
@@ -0,0 +1,135 @@
+# app/token_claims.py
+"""
+권한 클레임을 담은 access token (TOKEN_CLAIMS=1 일 때 로그인에서 발급)
+
+    {"sub": "12", "ver": 3, "terms_agreed": true, "user_status": "NORMAL", "user_type": "YOUNG", "exp": ...}
+
+알림 뱃지 폴링, 쪽지 목록처럼 user_id 와 약관 동의 여부만 필요한 라우트는
+(deps.get_token_user) 토큰의 클레임만으로 권한을 확인하고 users 테이블을 읽지 않는다.
+
+버전
+- 버전 번호는 users.token_version 컬럼에 있다. (재시작해도 유지, 줄어들지 않음)
+  로그인할 때 그 값을 토큰의 ver 로 넣고, 프로세스 메모리(token_versions) 에 캐시한다.
+  토큰의 ver 가 캐시된 버전과 같을 때만 클레임을 믿는다.
+- ORM 으로 클레임 컬럼(terms_agreed / user_status / user_type) 이 바뀌면 (프로필 수정, 신고 누적 BANNED)
+  같은 UPDATE 에서 token_version = token_version + 1 로 올리고, commit 직후 새 버전을 캐시에 넣는다.
+  → 이전 토큰의 클레임은 다시는 믿지 않는다. (캐시 값은 커지기만 함)
+- 캐시에 없으면(재시작, TOKEN_VERSION_TTL 경과) 평소처럼 users 를 조회하고,
+  DB 의 token_version 을 캐시에 넣는다. 메모리에서 버전을 0 부터 다시 세지 않는다.
+  → 다른 프로세스에서 바뀐 값은 최대 TOKEN_VERSION_TTL 초 늦게 반영된다.
+- 클레임이 낡은 토큰도 401 이 아니라 DB 조회로 처리된다. (다시 로그인하면 새 클레임 토큰)
+- users 를 ORM 을 거치지 않고 고치는 코드는 token_version 도 직접 올려야 한다.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.cache import TTLCache
+from app.config import get_settings
+
+settings = get_settings()
+
+TOKEN_CLAIMS: bool = settings.token_claims
+TOKEN_VERSION_TTL: float = settings.token_version_ttl
+
+CLAIM_FIELDS = ("terms_agreed", "user_status", "user_type")
+
+token_versions = TTLCache("token_version", maxsize=settings.token_version_cache_size, ttl=TOKEN_VERSION_TTL)
+_version_lock = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
+class TokenUser:
+    """클레임으로 만든 로그인 유저 (models.User 의 일부 속성만)"""
+    user_id: int
+    terms_agreed: bool
+    user_status: str
+    user_type: str
+
+
+def remember_version(user_id: int, version: int) -> None:
+    """DB 에서 읽은 버전을 캐시 (이미 더 큰 버전이 있으면 그대로)"""
+    with _version_lock:
+        cached = token_versions.get(user_id)
+        if cached is None or version > cached:
+            token_versions.set(user_id, version)
+
+
+def claims_for(user: models.User) -> dict:
+    """create_access_token 에 넘길 data (user 는 방금 DB 에서 읽은 값이어야 함)"""
+    remember_version(user.user_id, user.token_version)
+    claims = {"sub": str(user.user_id), "ver": user.token_version}
+    claims.update({field: getattr(user, field) for field in CLAIM_FIELDS})
+    return claims
+
+
+def user_from_claims(payload: dict) -> Optional[TokenUser]:
+    """버전이 최신인 클레임 토큰이면 TokenUser, 아니면 None (DB 조회 필요)"""
+    if "ver" not in payload:
+        return None
+    user_id = int(payload["sub"])
+    if token_versions.get(user_id) != payload["ver"]:
+        return None
+    return TokenUser(user_id, *(payload.get(field) for field in CLAIM_FIELDS))
+
+
+def confirm_claims(payload: dict, user: models.User) -> None:
+    """DB 에서 읽은 user 의 버전을 캐시. 토큰의 ver 가 그 버전과 같으면 다음 요청부터 클레임만으로 처리"""
+    if "ver" not in payload or any(payload.get(field) != getattr(user, field) for field in CLAIM_FIELDS):
+        return
+    remember_version(user.user_id, user.token_version)
+
+
+# ------------------------------
+# ORM 쓰기 → users.token_version 올림, commit 후 캐시 반영
+# ------------------------------
+def _claims_changed(target: models.User) -> bool:
+    state = inspect(target)
+    return any(state.attrs[field].history.has_changes() for field in CLAIM_FIELDS)
+
+
+def _on_user_updating(mapper, connection, target) -> None:
+    if _claims_changed(target):
+        # 읽고 더하지 않고 SQL 식으로 올림 (동시에 고쳐도 번호가 겹치지 않음)
+        target.token_version = models.User.token_version + 1
+
+
+def _on_user_updated(mapper, connection, target) -> None:
+    if not _claims_changed(target):
+        return
+    version = connection.scalar(
+        select(models.User.token_version).where(models.User.user_id == target.user_id)
+    )
+    _pending_versions(target)[target.user_id] = version
+
+
+def _on_user_deleted(mapper, connection, target) -> None:
+    _pending_versions(target)[target.user_id] = None
+
+
+def _pending_versions(target: models.User) -> dict:
+    session = inspect(target).session
+    return session.info.setdefault("token_versions", {}) if session is not None else {}
+
+
+event.listen(models.User, "before_update", _on_user_updating)
+event.listen(models.User, "after_update", _on_user_updated)
+event.listen(models.User, "after_delete", _on_user_deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_versions(session) -> None:
+    for user_id, version in session.info.pop("token_versions", {}).items():
+        if version is None:
+            token_versions.pop(user_id)
+        else:
+            remember_version(user_id, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_versions(session) -> None:
+    session.info.pop("token_versions", None)
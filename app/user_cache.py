@@ -0,0 +1,86 @@
+# app/user_cache.py
+"""
+로그인 유저 캐시 (get_current_user / get_current_user_async 가 사용)
+
+매 요청 users 테이블을 읽는 대신 User 컬럼 값 스냅샷을 TTL+LRU 캐시에 두고,
+캐시 적중 시 스냅샷으로 User 를 만들어 요청 세션에 "이미 DB 에 있는 객체" 로 붙인다. (SELECT 없음)
+→ 라우트가 current_user 를 고치고 commit 하면 평소처럼 UPDATE 가 나가고,
+  관계(lazy load) 도 그 세션으로 읽힌다.
+
+무효화
+- ORM 으로 User 를 UPDATE/DELETE 하면 (프로필 수정, 신고 누적 BANNED, 매칭 가능 여부 변경 등)
+  flush 시점과 commit 직후에 해당 user_id 를 지운다. (commit 전에 다른 요청이 옛 값을 다시 넣는 경우 대비)
+- users 테이블을 ORM 을 거치지 않고 고치는 코드는 invalidate_user() 를 직접 호출해야 한다.
+- 캐시는 프로세스마다 따로 있으므로, 다른 프로세스에서 바뀐 값은 USER_CACHE_TTL 까지 늦게 반영된다.
+"""
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app import models
+from app.cache import TTLCache
+from app.config import get_settings
+
+settings = get_settings()
+
+USER_CACHE_SIZE: int = settings.user_cache_size
+USER_CACHE_TTL: float = settings.user_cache_ttl
+
+user_cache = TTLCache("user", maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+_COLUMNS = tuple(attr.key for attr in inspect(models.User).column_attrs)
+
+
+def remember_user(user: models.User) -> None:
+    """컬럼이 모두 로드된 상태일 때만 저장 (expire 된 객체는 건너뜀)"""
+    if user_cache.maxsize <= 0:
+        return
+    state = inspect(user)
+    if state.modified or any(key not in state.dict for key in _COLUMNS):
+        return
+    user_cache.set(user.user_id, {key: state.dict[key] for key in _COLUMNS})
+
+
+def cached_user(db: Session, user_id: int) -> Optional[models.User]:
+    """캐시에 있으면 db 세션에 붙인 User, 없으면 None"""
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        return None
+
+    existing = db.identity_map.get(db.identity_key(models.User, user_id))
+    if existing is not None:
+        return existing
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.pop(user_id)
+
+
+# ------------------------------
+# ORM 쓰기 → 무효화
+# ------------------------------
+def _on_user_changed(mapper, connection, target) -> None:
+    invalidate_user(target.user_id)
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.user_id)
+
+
+event.listen(models.User, "after_update", _on_user_changed)
+event.listen(models.User, "after_delete", _on_user_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session) -> None:
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session) -> None:
+    session.info.pop("changed_user_ids", None)
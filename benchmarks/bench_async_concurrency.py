@@ -0,0 +1,176 @@
+# benchmarks/bench_async_concurrency.py
+"""
+동기 라우트(스레드풀) vs async 라우트(ASYNC_DB=1) 동시 접속 벤치마크
+
+    python -m benchmarks.bench_async_concurrency
+    python -m benchmarks.bench_async_concurrency --clients 1000 --seconds 20
+
+임시 SQLite DB 에 사용자/CONFIRMED 매칭/쪽지를 채운 뒤, 같은 DB 로 uvicorn 서버를
+ASYNC_DB=0 / ASYNC_DB=1 로 한 번씩 띄우고 --clients 개의 클라이언트가 동시에
+- GET /notifications/unread-count
+- GET /messages/messages          (list_chats)
+- GET /messages/messages/{id}     (get_chat_detail)
+를 섞어서 --seconds 동안 호출한다. 모드별 초당 처리 수, 지연 p50/p99, 실패 수를 출력.
+(클라이언트도 같은 머신에서 돌므로 절대값보다 두 모드의 차이를 볼 것)
+
+동기 모드에서는 get_current_user(스레드풀) 가 연결을 잡은 뒤 라우트 본문이 다시 스레드풀 자리를
+기다리므로, 동시 요청이 풀 크기보다 많으면 연결을 쥔 채 대기하는 요청 때문에 나머지가
+pool timeout(DB_POOL_TIMEOUT) 으로 실패한다. --pool-size 로 두 모드의 풀 크기를 같이 바꿔 볼 수 있다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+ENDPOINTS = ["unread_count", "list_chats", "chat_detail"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed(users: int, chats: int, messages_per_chat: int) -> list:
+    from app import models
+    from app.db import engine
+    from benchmarks.bench_db_concurrency import seed_chats
+    from benchmarks.populate import bulk_insert, datetime_formatter
+
+    pairs = seed_chats(engine, users, chats)
+    rnd = random.Random(1)
+    with engine.begin() as conn:
+        to_db = datetime_formatter(conn.dialect)
+        base = datetime.utcnow()
+        bulk_insert(conn, models.Message.__table__, [
+            {
+                "match_id": match_id,
+                "sender_id": a if rnd.random() < 0.5 else b,
+                "content": "안녕하세요",
+                "is_read": False,
+                "timestamp": to_db(base - timedelta(minutes=i)),
+            }
+            for match_id, a, b in pairs
+            for i in range(messages_per_chat)
+        ])
+    engine.dispose()
+    return pairs
+
+
+def start_server(port: int, async_db: bool, pool_size: Optional[int] = None) -> subprocess.Popen:
+    env = {**os.environ, "ASYNC_DB": "1" if async_db else "0", "RUN_MATCHING_WORKER": "0"}
+    if pool_size:
+        env["DB_POOL_SIZE"] = str(pool_size)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn 서버가 뜨지 않았습니다.")
+
+
+async def load(port: int, pairs: list, tokens: dict, clients: int, seconds: float) -> dict:
+    import httpx
+
+    latencies = {name: [] for name in ENDPOINTS}
+    errors = {name: 0 for name in ENDPOINTS}
+    deadline = time.perf_counter() + seconds
+
+    async def client(seed_: int, http: "httpx.AsyncClient") -> None:
+        rnd = random.Random(seed_)
+        while time.perf_counter() < deadline:
+            match_id, a, b = pairs[rnd.randrange(len(pairs))]
+            headers = {"Authorization": f"Bearer {tokens[a if rnd.random() < 0.5 else b]}"}
+            name = rnd.choice(ENDPOINTS)
+            path = {
+                "unread_count": "/notifications/unread-count",
+                "list_chats": "/messages/messages",
+                "chat_detail": f"/messages/messages/{match_id}",
+            }[name]
+            started = time.perf_counter()
+            try:
+                response = await http.get(path, headers=headers)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[name].append(time.perf_counter() - started)
+            else:
+                errors[name] += 1
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as http:
+        await asyncio.gather(*(client(i, http) for i in range(clients)))
+
+    result = {}
+    for name in ENDPOINTS:
+        lat = sorted(latencies[name])
+        result[name] = {
+            "ok": len(lat),
+            "errors": errors[name],
+            "p50_ms": round(statistics.median(lat) * 1000, 1) if lat else None,
+            "p99_ms": round(lat[int(len(lat) * 0.99) - 1] * 1000, 1) if lat else None,
+        }
+    total = sum(r["ok"] for r in result.values())
+    result["total_rps"] = round(total / seconds, 1)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--chats", type=int, default=2_000)
+    parser.add_argument("--messages-per-chat", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=500, help="동시 클라이언트 수")
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--pool-size", type=int, help="DB_POOL_SIZE (미지정 시 app.db 기본값)")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("bench_async_")
+
+    from app.deps import create_access_token
+
+    pairs = seed(args.users, args.chats, args.messages_per_chat)
+    user_ids = {uid for _, a, b in pairs for uid in (a, b)}
+    tokens = {uid: create_access_token({"sub": str(uid)}) for uid in user_ids}
+
+    results = {}
+    for mode, async_db in (("sync", False), ("async", True)):
+        port = free_port()
+        server = start_server(port, async_db, args.pool_size)
+        try:
+            results[mode] = asyncio.run(load(port, pairs, tokens, args.clients, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"clients={args.clients} seconds={args.seconds} pool_size={args.pool_size or 'default'}")
+    print(f"{'':>6} {'endpoint':>13} {'ok':>7} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode, result in results.items():
+        for name in ENDPOINTS:
+            r = result[name]
+            print(f"{mode:>6} {name:>13} {r['ok']:>7} {r['errors']:>7} {r['p50_ms']!s:>8} {r['p99_ms']!s:>8}")
+        print(f"{mode:>6} {'total req/s':>13} {result['total_rps']:>7}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
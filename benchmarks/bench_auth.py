@@ -0,0 +1,155 @@
+# benchmarks/bench_auth.py
+"""
+인증 의존성 비용 측정 (요청 1건당 µs)
+
+    python -m benchmarks.bench_auth
+    python -m benchmarks.bench_auth --users 5000 --calls 50000
+
+설정마다 하위 프로세스에서 (app 모듈은 import 시점에 설정을 읽으므로)
+임시 DB 에 사용자 --users 명을 만들고, 그 사용자들의 토큰을 돌아가며 써서
+- decode       : user_id_from_token (JWT 서명 검증 + JSON 파싱)
+- current_user : get_current_user (decode + users 조회)
+를 --calls 번 직접 호출해 1건당 평균 시간을 잰다. 세션은 요청처럼 매 호출마다 새로 연다.
+이어서 TestClient 로 GET /users/me, GET /notifications/unread-count 를 --seconds 동안
+순서대로 호출해 초당 처리 수(미들웨어/직렬화 포함) 를 잰다.
+
+- no_cache    : 캐시 모두 끔 (TOKEN_CACHE_SIZE=0, USER_CACHE_SIZE=0, 이전 동작)
+- token_cache : 검증된 토큰 payload 캐시만
+- user_cache  : 토큰 캐시 + 로그인 유저 캐시 (기본값)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+CONFIGS = {
+    "no_cache": {"TOKEN_CACHE_SIZE": "0", "USER_CACHE_SIZE": "0"},
+    "token_cache": {"USER_CACHE_SIZE": "0"},
+    "user_cache": {},
+}
+
+HTTP_ENDPOINTS = ("/users/me", "/notifications/unread-count")
+
+
+def seed_users(users: int) -> list:
+    """user_id 목록"""
+    from app import models
+    from app.db import engine
+    from benchmarks.populate import bulk_insert
+
+    rows = [
+        {"user_id": i, "nickname": f"user{i}", "user_type": "YOUNG", "terms_agreed": True}
+        for i in range(1, users + 1)
+    ]
+    with engine.begin() as conn:
+        bulk_insert(conn, models.User.__table__, rows)
+    return [row["user_id"] for row in rows]
+
+
+def per_call_us(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def requests_per_sec(client, path: str, tokens: list, seconds: float) -> float:
+    headers = [{"Authorization": f"Bearer {t}"} for t in tokens]
+    done = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        response = client.get(path, headers=headers[done % len(headers)])
+        assert response.status_code == 200, response.text
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+def run_child(args) -> None:
+    from fastapi import HTTPException
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app.db import SessionLocal
+    from app.deps import create_access_token, get_current_user, user_id_from_token
+    from app.migrations import upgrade
+
+    upgrade()
+    user_ids = seed_users(args.users)
+    tokens = [create_access_token({"sub": str(uid)}) for uid in user_ids]
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=t) for t in tokens]
+    exc = HTTPException(status_code=401)
+
+    def decode(i):
+        user_id_from_token(tokens[i % len(tokens)], exc)
+
+    def current_user(i):
+        db = SessionLocal()
+        try:
+            get_current_user(credentials[i % len(credentials)], db)
+        finally:
+            db.close()
+
+    # 1바퀴 데워서 캐시가 있는 설정은 채워진 상태로 측정
+    for i in range(len(tokens)):
+        current_user(i)
+
+    result = {
+        "decode_us": round(per_call_us(decode, args.calls), 2),
+        "current_user_us": round(per_call_us(current_user, args.calls), 2),
+    }
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        for path in HTTP_ENDPOINTS:
+            result[path] = round(requests_per_sec(client, path, tokens, args.seconds), 1)
+
+    from app.cache import all_caches
+
+    result["caches"] = {cache.name: round(cache.stats()["hit_rate"], 3) for cache in all_caches()}
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=5.0, help="HTTP 엔드포인트별 측정 시간")
+    parser.add_argument("--config", choices=sorted(CONFIGS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        run_child(args)
+        return
+
+    from benchmarks.populate import temp_database_url
+
+    results = {}
+    for name, overrides in CONFIGS.items():
+        env = {
+            **os.environ,
+            **overrides,
+            "DATABASE_URL": temp_database_url(f"bench_auth_{name}_"),
+            "RUN_MATCHING_WORKER": "0",
+        }
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_auth", "--config", name,
+             "--users", str(args.users), "--calls", str(args.calls), "--seconds", str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        results[name] = json.loads(child.stdout.strip().splitlines()[-1])
+
+    print(f"users={args.users} calls={args.calls} seconds={args.seconds}")
+    print(f"{'':>12} {'decode us':>10} {'current_user us':>16} {'/users/me r/s':>14} {'unread r/s':>11}")
+    for name, r in results.items():
+        print(f"{name:>12} {r['decode_us']:>10} {r['current_user_us']:>16} "
+              f"{r[HTTP_ENDPOINTS[0]]:>14} {r[HTTP_ENDPOINTS[1]]:>11}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# benchmarks/bench_db_concurrency.py
+"""
+SQLite 연결 설정별 동시 읽기/쓰기 처리량 비교 (쪽지 전송 / 대화 목록)
+
+    python -m benchmarks.bench_db_concurrency
+    python -m benchmarks.bench_db_concurrency --writers 8 --readers 16 --seconds 20
+
+설정마다 새 임시 DB 를 만들고 하위 프로세스에서 (app.db 는 import 시점에 설정을 읽으므로)
+- benchmarks.populate 로 사용자를 채우고 CONFIRMED 매칭 --chats 건을 만든 뒤
+- writer 스레드: send_message (쪽지 + 알림 INSERT, commit)
+- reader 스레드: list_chats + get_chat_detail
+을 --seconds 동안 각자 세션으로 반복 호출해 초당 처리 수, 지연 p50/p99, 실패(database is locked) 수를 잰다.
+
+- legacy : 이전 기본값 (journal_mode=DELETE, synchronous=FULL, mmap 끔, 캐시 2MB)
+- tuned  : app.db 기본값 (WAL, synchronous=NORMAL, mmap 256MB, 캐시 64MB)
+두 설정 모두 busy_timeout 과 풀 크기는 같게 두어 PRAGMA 차이만 비교한다.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+CONFIGS = {
+    "legacy": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_CACHE_SIZE_KB": "2000",
+    },
+    "tuned": {},
+}
+
+
+def seed_chats(engine, users: int, chats: int) -> list:
+    """(match_id, user_a_id, user_b_id) CONFIRMED 매칭 목록"""
+    from app import models
+    from benchmarks.populate import bulk_insert, populate
+
+    populate(engine, users, queue_ratio=0.0)
+    rnd = random.Random(0)
+    pairs = []
+    with engine.begin() as conn:
+        rows = []
+        for match_id in range(1, chats + 1):
+            a, b = rnd.sample(range(1, users + 1), 2)
+            rows.append({
+                "match_id": match_id, "user_a_id": a, "user_b_id": b,
+                "status": "CONFIRMED", "shared_category": "디지털/IT",
+            })
+            pairs.append((match_id, a, b))
+        bulk_insert(conn, models.MatchingQueue.__table__, rows)
+    return pairs
+
+
+def worker(kind: str, pairs: list, deadline: float, seed: int, out: dict) -> None:
+    from pydantic import ValidationError
+    from sqlalchemy.exc import OperationalError
+
+    from app import models, schemas
+    from app.db import SessionLocal
+    from app.routers.messages import get_chat_detail, list_chats, send_message
+
+    rnd = random.Random(seed)
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        match_id, a, b = pairs[rnd.randrange(len(pairs))]
+        db = SessionLocal()
+        started = time.perf_counter()
+        try:
+            user = db.get(models.User, a if rnd.random() < 0.5 else b)
+            if kind == "writer":
+                try:
+                    send_message(match_id, schemas.SendMessageRequest(content="안녕하세요"), db=db, current_user=user)
+                except ValidationError:
+                    # pydantic v2 에서는 응답 변환(orm_mode) 이 실패하지만 commit 은 이미 끝난 뒤
+                    pass
+            else:
+                list_chats(db=db, current_user=user)
+                get_chat_detail(match_id, db=db, current_user=user)
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            print("[BENCH]", e.orig, file=sys.stderr)
+            errors += 1
+        finally:
+            db.close()
+    out[kind].append((latencies, errors))
+
+
+def summarize(results: list, seconds: float) -> dict:
+    latencies = sorted(x for lat, _ in results for x in lat)
+    if not latencies:
+        return {"ops": 0, "ops_per_sec": 0.0, "errors": sum(e for _, e in results)}
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "errors": sum(e for _, e in results),
+    }
+
+
+def run_child(args) -> None:
+    from sqlalchemy import text
+
+    from app.db import engine
+
+    pairs = seed_chats(engine, args.users, args.chats)
+    engine.dispose()    # 적재용 연결 대신 설정이 적용된 새 연결로 측정
+    with engine.connect() as conn:
+        pragmas = {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name in ("journal_mode", "synchronous", "mmap_size", "cache_size")
+        }
+
+    out = {"writer": [], "reader": []}
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(kind, pairs, deadline, i, out))
+        for i, kind in enumerate(["writer"] * args.writers + ["reader"] * args.readers)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(json.dumps({
+        "pragmas": pragmas,
+        "send_message": summarize(out["writer"], args.seconds),
+        "list_and_detail": summarize(out["reader"], args.seconds),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--chats", type=int, default=2_000, help="CONFIRMED 매칭 수")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--config", choices=sorted(CONFIGS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        run_child(args)
+        return
+
+    from benchmarks.populate import temp_database_url
+
+    results = {}
+    for name, overrides in CONFIGS.items():
+        env = {
+            **os.environ,
+            **overrides,
+            "DATABASE_URL": temp_database_url(f"bench_db_{name}_"),
+            "DB_POOL_SIZE": str(args.writers + args.readers),
+            "SQLITE_BUSY_TIMEOUT_MS": "5000",
+        }
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_db_concurrency", "--config", name,
+             "--users", str(args.users), "--chats", str(args.chats),
+             "--writers", str(args.writers), "--readers", str(args.readers),
+             "--seconds", str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        results[name] = json.loads(child.stdout.strip().splitlines()[-1])
+
+    print(f"writers={args.writers} readers={args.readers} seconds={args.seconds}")
+    print(f"{'':>8} {'endpoint':>16} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, result in results.items():
+        for endpoint in ("send_message", "list_and_detail"):
+            r = result[endpoint]
+            print(f"{name:>8} {endpoint:>16} {r['ops_per_sec']:>9} "
+                  f"{r.get('p50_ms', '-'):>8} {r.get('p99_ms', '-'):>8} {r['errors']:>7}")
+    print(json.dumps(results, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/bench_expire.py
+"""
+expire_old_matches 벤치마크 (만료 대상 row 50만 건)
+
+    python -m benchmarks.bench_expire
+    python -m benchmarks.bench_expire --rows 500000 --chunk-size 2000
+    python -m benchmarks.bench_expire --rows 50000 --legacy     # 이전 구현과 비교
+
+구현마다 별도 프로세스에서 임시 SQLite DB 를 만들어 측정한다. (peak RSS 분리)
+- chunked : 현재 expire_old_matches (청크 단위 UPDATE + 알림 bulk INSERT + commit)
+- legacy  : ORM 객체를 전부 읽어 한 건씩 수정하고 마지막에 commit 1번
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def seed(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app import models
+    from app.db import SessionLocal, engine
+    from app.migrations import upgrade
+
+    upgrade(engine)
+    stale = datetime.utcnow() - timedelta(days=2)
+    db = SessionLocal()
+    step = 50_000
+    for start in range(1, rows + 1, step):
+        ids = range(start, min(start + step, rows + 1))
+        db.execute(
+            insert(models.User.__table__),
+            [{"user_id": i, "nickname": f"user{i}", "user_type": "YOUNG"} for i in ids],
+        )
+        # 절반은 CONFIRMED (알림 2건), 절반은 PENDING (알림 1건)
+        db.execute(
+            insert(models.MatchingQueue.__table__),
+            [
+                {
+                    "user_a_id": i,
+                    "user_b_id": i + 1 if i % 2 else None,
+                    "status": "CONFIRMED" if i % 2 else "PENDING",
+                    "requested_at": stale,
+                }
+                for i in ids
+            ],
+        )
+    db.commit()
+    db.close()
+
+
+def legacy_expire(db) -> None:
+    from app import models
+
+    now = datetime.utcnow()
+    threshold = now - timedelta(hours=24)
+    targets = (
+        db.query(models.MatchingQueue)
+        .filter(
+            models.MatchingQueue.status.in_(["PENDING", "CONFIRMED"]),
+            models.MatchingQueue.requested_at < threshold,
+        )
+        .all()
+    )
+    for m in targets:
+        m.status = "CANCELED"
+        m.canceled_at = now
+        db.add(m)
+        for uid in (m.user_a_id, m.user_b_id):
+            if uid is None:
+                continue
+            db.add(models.Notification(
+                user_id=uid,
+                type="MATCH_FAIL",
+                content="매칭 대기 시간이 만료되어 매칭이 실패하였습니다.",
+                link_path=None,
+                is_read=False,
+            ))
+    if targets:
+        db.commit()
+
+
+def run_one(impl: str, rows: int, chunk_size: int) -> dict:
+    """자식 프로세스에서 실행: DATABASE_URL 은 부모가 지정"""
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.db import SessionLocal
+    from app.routers.matches import expire_old_matches
+
+    seed(rows)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    if impl == "legacy":
+        legacy_expire(db)
+    else:
+        expire_old_matches(db, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - started
+
+    canceled = db.scalar(
+        select(func.count()).select_from(models.MatchingQueue)
+        .where(models.MatchingQueue.status == "CANCELED")
+    )
+    notifs = db.scalar(select(func.count()).select_from(models.Notification))
+    db.close()
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "impl": impl,
+        "rows": rows,
+        "chunk_size": chunk_size if impl == "chunked" else None,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(rows / elapsed),
+        "canceled": canceled,
+        "notifications": notifs,
+        "peak_rss_growth_mb": round((rss_after - rss_before) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000)
+    parser.add_argument("--legacy", action="store_true", help="이전 구현도 함께 측정")
+    parser.add_argument("--child", choices=["chunked", "legacy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child, args.rows, args.chunk_size)))
+        return
+
+    impls = ["chunked", "legacy"] if args.legacy else ["chunked"]
+    for impl in impls:
+        tmpdir = tempfile.mkdtemp(prefix="bench_expire_")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_expire", "--child", impl,
+             "--rows", str(args.rows), "--chunk-size", str(args.chunk_size)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        print(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
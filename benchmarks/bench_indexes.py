@@ -0,0 +1,208 @@
+# benchmarks/bench_indexes.py
+"""
+복합 인덱스 전/후 조회 시간 비교 (테이블당 100만 row 기준)
+
+    python -m benchmarks.bench_indexes
+    python -m benchmarks.bench_indexes --rows 200000 --users 50000 --samples 30
+
+임시 SQLite DB 에
+- benchmarks.populate 로 사용자/재능 카드/매칭 프로필/대기열
+- 지난 매칭 기록(CONFIRMED/SUCCESS/CANCELED), 메시지, 알림 각 --rows 건, 차단 일부
+를 채운 뒤, models 에 선언된 인덱스(PK 제외) 를 지운 상태(before) 와
+app.migrations.ensure_indexes 로 다시 만든 상태(after) 에서 아래를 잰다.
+- list_chats / list_notifications / get_unread_count : 샘플 유저별 호출 시간 중앙값
+- 매칭 로더 : claim_pending_entries + load_matching_snapshot (라운드 1회분)
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+
+def seed_history(engine, users: int, rows: int, seed: int = 0) -> None:
+    """매칭 기록 / 메시지 / 알림 / 차단 데이터"""
+    from app import models
+    from benchmarks.populate import CHUNK_SIZE, bulk_insert, datetime_formatter
+
+    rnd = random.Random(seed)
+    base = datetime.utcnow() - timedelta(days=30)
+    with engine.begin() as conn:
+        to_db = datetime_formatter(conn.dialect)
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA cache_size=-262144")
+        first_match_id = (conn.exec_driver_sql("SELECT max(match_id) FROM matching_queue").scalar() or 0) + 1
+
+        confirmed = []     # (match_id, user_a_id, user_b_id)
+        for start in range(0, rows, CHUNK_SIZE):
+            chunk = []
+            for i in range(start, min(start + CHUNK_SIZE, rows)):
+                a, b = rnd.randint(1, users), rnd.randint(1, users)
+                status = rnd.choices(["CONFIRMED", "SUCCESS", "CANCELED"], [10, 30, 60])[0]
+                chunk.append({
+                    "match_id": first_match_id + i,
+                    "user_a_id": a,
+                    "user_b_id": None if status == "CANCELED" else b,
+                    "status": status,
+                    "shared_category": "디지털/IT",
+                    "requested_at": to_db(base + timedelta(seconds=i)),
+                })
+                if status == "CONFIRMED":
+                    confirmed.append((first_match_id + i, a, b))
+            bulk_insert(conn, models.MatchingQueue.__table__, chunk)
+
+        for start in range(0, rows, CHUNK_SIZE):
+            chunk = []
+            for i in range(start, min(start + CHUNK_SIZE, rows)):
+                match_id, a, b = confirmed[rnd.randrange(len(confirmed))]
+                chunk.append({
+                    "match_id": match_id,
+                    "sender_id": a if rnd.random() < 0.5 else b,
+                    "content": "안녕하세요",
+                    "is_read": rnd.random() < 0.8,
+                    "timestamp": to_db(base + timedelta(seconds=i)),
+                })
+            bulk_insert(conn, models.Message.__table__, chunk)
+
+        for start in range(0, rows, CHUNK_SIZE):
+            chunk = [
+                {
+                    "user_id": rnd.randint(1, users),
+                    "type": "NEW_MESSAGE",
+                    "content": "새 쪽지가 도착했습니다.",
+                    "is_read": rnd.random() < 0.7,
+                    "timestamp": to_db(base + timedelta(seconds=i)),
+                }
+                for i in range(start, min(start + CHUNK_SIZE, rows))
+            ]
+            bulk_insert(conn, models.Notification.__table__, chunk)
+
+        bulk_insert(conn, models.Block.__table__, [
+            {"blocker_id": rnd.randint(1, users), "blocked_id": rnd.randint(1, users)}
+            for _ in range(users // 100)
+        ])
+
+
+def managed_indexes():
+    """PK 단일 컬럼 인덱스를 제외한, models 에 선언된 인덱스"""
+    from app.db import Base
+
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if not (len(index.columns) == 1 and next(iter(index.columns)).primary_key)
+    ]
+
+
+def median_ms(fn, args_list) -> float:
+    times = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def measure(sample_users, batch: int) -> dict:
+    from app import models
+    from app.crud.match import (
+        claim_pending_entries,
+        load_matching_snapshot,
+        release_claims,
+    )
+    from app.db import SessionLocal
+    from app.routers.messages import list_chats
+    from app.routers.notifications import get_unread_count, list_notifications
+
+    db = SessionLocal()
+    users = [db.get(models.User, uid) for uid in sample_users]
+    result = {
+        "list_chats_ms": median_ms(lambda u: list_chats(db=db, current_user=u), [(u,) for u in users]),
+        "list_notifications_ms": median_ms(
+            lambda u: list_notifications(db=db, current_user=u), [(u,) for u in users]
+        ),
+        "get_unread_count_ms": median_ms(
+            lambda u: get_unread_count(db=db, current_user=u), [(u,) for u in users]
+        ),
+    }
+
+    started = time.perf_counter()
+    claimed, _ = claim_pending_entries(db, "bench-indexes", 60, batch)
+    claimed_at = time.perf_counter()
+    snapshot = load_matching_snapshot(db, "bench-indexes")
+    loaded_at = time.perf_counter()
+    release_claims(db, "bench-indexes")
+    db.close()
+
+    result.update({
+        "matching_claim_ms": round((claimed_at - started) * 1000, 1),
+        "matching_load_ms": round((loaded_at - claimed_at) * 1000, 1),
+        "matching_entries": len(snapshot.entries),
+        "matching_claimed": claimed,
+    })
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="매칭 기록/메시지/알림 각 row 수")
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=50, help="조회 시간을 잴 유저 수")
+    parser.add_argument("--batch", type=int, default=10_000, help="매칭 로더 선점 row 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("bench_indexes_")
+
+    from sqlalchemy import text
+
+    from app.db import engine
+    from app.migrations import ensure_indexes
+    from benchmarks.populate import populate
+
+    started = time.perf_counter()
+    populate(engine, args.users, queue_ratio=0.5)
+    seed_history(engine, args.users, args.rows)
+    seeded_in = time.perf_counter() - started
+
+    sample_users = random.Random(1).sample(range(1, args.users + 1), args.samples)
+
+    with engine.begin() as conn:
+        for index in managed_indexes():
+            index.drop(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+    engine.dispose()    # 풀에 남은 연결의 캐시된 statement/통계 대신 새 연결로 측정
+    before = measure(sample_users, args.batch)
+
+    started = time.perf_counter()
+    created = ensure_indexes(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    index_build_s = time.perf_counter() - started
+    engine.dispose()
+    after = measure(sample_users, args.batch)
+
+    if args.json:
+        print(json.dumps({
+            "rows": args.rows, "users": args.users, "seed_s": round(seeded_in, 1),
+            "indexes": created, "index_build_s": round(index_build_s, 1),
+            "before": before, "after": after,
+        }, ensure_ascii=False))
+        return
+
+    print(f"seeded in {seeded_in:.1f}s, {len(created)} indexes built in {index_build_s:.1f}s")
+    print(f"{'':>24} {'before':>10} {'after':>10} {'speedup':>8}")
+    for key in before:
+        b, a = before[key], after[key]
+        speedup = f"{b / a:7.1f}x" if key.endswith("_ms") and a else ""
+        print(f"{key:>24} {b:>10} {a:>10} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
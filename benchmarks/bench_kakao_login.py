@@ -0,0 +1,214 @@
+# benchmarks/bench_kakao_login.py
+"""
+카카오 로그인 콜백 동시 처리 벤치마크 (가짜 카카오 서버 사용)
+
+    python -m benchmarks.bench_kakao_login
+    python -m benchmarks.bench_kakao_login --clients 100 --seconds 20 --kakao-latency-ms 50
+
+이 프로세스 안에 카카오 OAuth 를 흉내 내는 HTTP 서버(POST /oauth/token, GET /v2/user/me) 를 띄우고
+KAKAO_AUTH_HOST / KAKAO_API_HOST 를 그쪽으로 돌린 uvicorn 서버에 --clients 개의 클라이언트가
+GET /auth/kakao/callback?code=... 를 --seconds 동안 호출한다. (--users 명을 돌아가며: 첫 로그인은 가입)
+
+- sync        : ASYNC_DB=0, requests.Session (스레드풀)
+- async       : ASYNC_DB=1, httpx.AsyncClient
+- sync_slow   : 카카오가 KAKAO_READ_TIMEOUT 보다 늦게 응답 → 시간 제한 안에 504 로 끝나는지 확인
+
+설정별 초당 로그인 수, 지연 p50/p99, 응답 코드별 개수, 가짜 카카오 서버가 받은 TCP 연결 수
+(연결 재사용이 되면 로그인 수보다 훨씬 적다) 를 출력한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from benchmarks.bench_async_concurrency import free_port
+
+SLOW_READ_TIMEOUT = 0.5
+
+
+# ------------------------------
+# 가짜 카카오 서버
+# ------------------------------
+class StubKakaoServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, port: int) -> None:
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.latency = 0.0
+        self.connections = 0
+        self._count_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._count_lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, body: dict) -> None:
+        time.sleep(self.server.latency)
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+        self._reply({"access_token": f"stub-{form['code'][0]}", "token_type": "bearer"})
+
+    def do_GET(self):
+        kakao_id = self.headers["Authorization"].rsplit("-", 1)[-1]
+        self._reply({"id": int(kakao_id), "kakao_account": {"profile": {"nickname": f"kakao{kakao_id}"}}})
+
+
+# ------------------------------
+# 앱 서버 / 부하
+# ------------------------------
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env={**os.environ, "RUN_MATCHING_WORKER": "0", **env},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn 서버가 뜨지 않았습니다.")
+
+
+async def load(port: int, users: int, clients: int, seconds: float) -> dict:
+    import httpx
+
+    latencies = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + seconds
+    next_code = iter(range(10 ** 9))
+
+    async def client(http: "httpx.AsyncClient") -> None:
+        while time.perf_counter() < deadline:
+            code = next(next_code) % users + 1
+            started = time.perf_counter()
+            try:
+                response = await http.get("/auth/kakao/callback", params={"code": str(code)})
+                statuses[response.status_code] += 1
+            except httpx.HTTPError:
+                statuses["error"] += 1
+                continue
+            if response.status_code == 302:
+                latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as http:
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+
+    all_latencies = sorted(latencies)
+    return {
+        "logins_per_sec": round(len(all_latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(all_latencies) * 1000, 1) if all_latencies else None,
+        "p99_ms": round(all_latencies[int(len(all_latencies) * 0.99) - 1] * 1000, 1) if all_latencies else None,
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+    }
+
+
+async def slow_load(port: int, clients: int) -> dict:
+    """카카오가 멈춘 상태에서 요청 clients 개가 얼마 만에 끝나는지"""
+    import httpx
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as http:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(http.get("/auth/kakao/callback", params={"code": str(i + 1)}) for i in range(clients))
+        )
+        elapsed = time.perf_counter() - started
+    return {
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "statuses": dict(Counter(str(r.status_code) for r in responses)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000, help="로그인하는 카카오 계정 수")
+    parser.add_argument("--clients", type=int, default=50, help="동시 클라이언트 수")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--kakao-latency-ms", type=float, default=20.0, help="가짜 카카오 서버 응답 지연")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("bench_kakao_")
+
+    from app.migrations import upgrade
+
+    upgrade()
+
+    stub = StubKakaoServer(free_port())
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+    kakao_env = {
+        "KAKAO_AUTH_HOST": stub_url,
+        "KAKAO_API_HOST": stub_url,
+        "KAKAO_CLIENT_ID": "bench",
+        "KAKAO_REDIRECT_URI": "http://127.0.0.1/auth/kakao/callback",
+    }
+
+    configs = {
+        "sync": {"ASYNC_DB": "0"},
+        "async": {"ASYNC_DB": "1"},
+        "sync_slow": {"ASYNC_DB": "0", "KAKAO_READ_TIMEOUT": str(SLOW_READ_TIMEOUT), "KAKAO_RETRIES": "0"},
+    }
+    results = {}
+    for name, env in configs.items():
+        port = free_port()
+        server = start_server(port, {**kakao_env, **env})
+        stub.connections = 0
+        try:
+            if name == "sync_slow":
+                stub.latency = SLOW_READ_TIMEOUT * 4
+                results[name] = asyncio.run(slow_load(port, args.clients))
+            else:
+                stub.latency = args.kakao_latency_ms / 1000
+                results[name] = asyncio.run(load(port, args.users, args.clients, args.seconds))
+            results[name]["kakao_connections"] = stub.connections
+        finally:
+            server.terminate()
+            server.wait()
+    stub.shutdown()
+
+    print(f"clients={args.clients} seconds={args.seconds} kakao_latency_ms={args.kakao_latency_ms}")
+    print(f"{'':>6} {'logins/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'kakao conns':>12}  statuses")
+    for name in ("sync", "async"):
+        r = results[name]
+        print(f"{name:>6} {r['logins_per_sec']:>9} {r['p50_ms']!s:>8} {r['p99_ms']!s:>8} "
+              f"{r['kakao_connections']:>12}  {r['statuses']}")
+    slow = results["sync_slow"]
+    print(f"kakao {SLOW_READ_TIMEOUT * 4}s 지연, KAKAO_READ_TIMEOUT={SLOW_READ_TIMEOUT}: "
+          f"{args.clients}건 {slow['elapsed_ms']}ms 만에 종료 {slow['statuses']}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_matching_engine.py
+"""
+매칭 엔진 라운드 시간 측정 (DB 없이 메모리 연산만)
+
+    python -m benchmarks.bench_matching_engine
+    python -m benchmarks.bench_matching_engine --sizes 1000 10000 100000 --quadratic-max 10000
+
+- pair_greedy : 카테고리 인덱스 기반 엔진
+- quadratic   : 기존 run_matching_once 의 이중 루프를 그대로 옮긴 기준 구현
+두 구현을 모두 돌린 크기에서는 결과(짝 목록)가 같은지도 확인한다.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from app.matching import QueueEntry, fifo_order, pair_greedy
+
+CATEGORIES = ["디지털/IT", "요리/생활", "취미/예술", "직무/경험", "건강/운동"]
+USER_TYPES = ["YOUNG"] * 45 + ["SENIOR"] * 45 + ["MIDDLE"] * 10
+
+
+def make_queue(size: int, seed: int = 42) -> List[QueueEntry]:
+    rnd = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    entries = []
+    for i in range(size):
+        has_talent = rnd.random() > 0.05
+        entries.append(
+            QueueEntry(
+                match_id=i + 1,
+                user_id=i + 1,
+                requested_at=base + timedelta(seconds=rnd.randrange(size * 10)),
+                user_type=rnd.choice(USER_TYPES),
+                learn=rnd.choice(CATEGORIES) if has_talent else None,
+                teach=rnd.choice(CATEGORIES) if has_talent else None,
+            )
+        )
+    return entries
+
+
+def pair_quadratic(entries: List[QueueEntry]):
+    ordered = fifo_order(entries)
+    used = set()
+    pairs = []
+    for i, a in enumerate(ordered):
+        if a.match_id in used or not a.is_matchable:
+            continue
+        for b in ordered[i + 1:]:
+            if b.match_id in used or not b.is_matchable:
+                continue
+            if a.learn == b.teach and a.user_type != b.user_type:
+                used.add(a.match_id)
+                used.add(b.match_id)
+                pairs.append((a, b))
+                break
+    return pairs
+
+
+def timed(fn, entries, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(entries)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--quadratic-max", type=int, default=10_000,
+                        help="이 크기 이하에서만 기존 이중 루프도 측정")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'queue':>8} {'pairs':>7} {'indexed(ms)':>12} {'quadratic(ms)':>14} {'speedup':>8}")
+    for size in args.sizes:
+        entries = make_queue(size)
+        t_idx, pairs = timed(pair_greedy, entries, args.repeat)
+
+        t_quad = None
+        if size <= args.quadratic_max:
+            t_quad, ref = timed(pair_quadratic, entries, 1)
+            got = [(a.match_id, b.match_id) for a, b in pairs]
+            want = [(a.match_id, b.match_id) for a, b in ref]
+            assert got == want, f"pair mismatch at size={size}"
+
+        quad_txt = f"{t_quad * 1000:14.1f}" if t_quad is not None else f"{'-':>14}"
+        speed_txt = f"{t_quad / t_idx:7.0f}x" if t_quad is not None else f"{'-':>8}"
+        print(f"{size:>8} {len(pairs):>7} {t_idx * 1000:12.1f} {quad_txt} {speed_txt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_matching_modes.py
+"""
+greedy vs maximum 매칭 모드 비교 (짝 수 / 라운드 시간)
+
+    python -m benchmarks.bench_matching_modes
+    python -m benchmarks.bench_matching_modes --sizes 1000 10000 100000 --seeds 5
+
+시나리오
+- uniform : 카테고리 균등 분포 (bench_matching_engine 과 같은 대기열)
+- skewed  : 인기 카테고리 쏠림 (배우려는 사람은 디지털/IT 에 몰리고 가르칠 사람은 적음)
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from app.matching import QueueEntry, pair_greedy, pair_maximum
+from benchmarks.bench_matching_engine import CATEGORIES, USER_TYPES, make_queue
+
+LEARN_WEIGHTS = [40, 15, 15, 15, 15]
+TEACH_WEIGHTS = [5, 30, 25, 20, 20]
+
+
+def make_skewed_queue(size: int, seed: int = 42) -> List[QueueEntry]:
+    rnd = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    return [
+        QueueEntry(
+            match_id=i + 1,
+            user_id=i + 1,
+            requested_at=base + timedelta(seconds=rnd.randrange(size * 10)),
+            user_type=rnd.choice(USER_TYPES),
+            learn=rnd.choices(CATEGORIES, LEARN_WEIGHTS)[0],
+            teach=rnd.choices(CATEGORIES, TEACH_WEIGHTS)[0],
+        )
+        for i in range(size)
+    ]
+
+
+SCENARIOS = {
+    "uniform": make_queue,
+    "skewed": make_skewed_queue,
+}
+
+
+def run(fn, entries):
+    start = time.perf_counter()
+    pairs = fn(entries)
+    return len(pairs), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'scenario':>8} {'queue':>8} {'greedy pairs':>13} {'max pairs':>10} "
+          f"{'gain':>7} {'greedy(ms)':>11} {'max(ms)':>9}")
+    for name, make in SCENARIOS.items():
+        for size in args.sizes:
+            g_pairs = m_pairs = 0
+            g_time = m_time = 0.0
+            for seed in range(args.seeds):
+                entries = make(size, seed)
+                n, t = run(pair_greedy, entries)
+                g_pairs += n
+                g_time += t
+                n, t = run(pair_maximum, entries)
+                m_pairs += n
+                m_time += t
+            gain = (m_pairs - g_pairs) / g_pairs * 100 if g_pairs else 0.0
+            print(f"{name:>8} {size:>8} {g_pairs / args.seeds:13.1f} {m_pairs / args.seeds:10.1f} "
+                  f"{gain:6.1f}% {g_time / args.seeds * 1000:11.1f} {m_time / args.seeds * 1000:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_metrics_overhead.py
+"""
+요청 지표 기록 비용 측정 (app.metrics.MetricsMiddleware)
+
+    python -m benchmarks.bench_metrics_overhead
+    python -m benchmarks.bench_metrics_overhead --requests 200000 --routes 50
+
+아무 일도 하지 않는 ASGI 앱을 미들웨어 유무로 --requests 번씩 직접 호출해
+요청 1건당 추가 시간(µs) 을 잰다. (HTTP 서버/라우팅 비용 제외, 목표 50µs 미만)
+--routes 개의 서로 다른 경로 템플릿을 돌아가며 써서 라벨 수가 늘어난 상태도 반영한다.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+
+class _Route:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+
+async def _endpoint(scope, receive, send):
+    # 라우팅 결과를 흉내 냄 (Starlette 가 scope["route"] 를 채운다)
+    scope["route"] = scope["_route"]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+async def run(app, scopes, requests: int) -> float:
+    """요청 1건당 평균 시간(초)"""
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(dict(scopes[i % len(scopes)]), _receive, _send)
+    return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--routes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.metrics import MetricsMiddleware
+
+    scopes = [
+        {
+            "type": "http", "method": "GET", "path": f"/bench/{i}/7",
+            "_route": _Route(f"/bench/{i}/{{item_id}}"),
+        }
+        for i in range(args.routes)
+    ]
+    wrapped = MetricsMiddleware(_endpoint)
+
+    loop = asyncio.new_event_loop()
+    bare, measured = [], []
+    for _ in range(args.repeat):
+        bare.append(loop.run_until_complete(run(_endpoint, scopes, args.requests)))
+        measured.append(loop.run_until_complete(run(wrapped, scopes, args.requests)))
+    loop.close()
+
+    bare_us = statistics.median(bare) * 1e6
+    measured_us = statistics.median(measured) * 1e6
+    print(json.dumps({
+        "requests": args.requests,
+        "routes": args.routes,
+        "bare_us": round(bare_us, 2),
+        "with_metrics_us": round(measured_us, 2),
+        "overhead_us": round(measured_us - bare_us, 2),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/bench_password_login.py
+"""
+비밀번호 로그인 처리량 + 로그인 폭주 중 다른 API 지연 (app.passwords)
+
+    python -m benchmarks.bench_password_login
+    python -m benchmarks.bench_password_login --clients 64 --seconds 20 --rounds 12 --workers 2
+
+임시 SQLite DB 에 이메일/비밀번호 사용자 --users 명을 만들고 (해시 비용 --rounds), 설정마다 uvicorn 을 띄워
+1) 기준: 탐침 클라이언트 1개가 GET /notifications/unread-count 를 --seconds 동안 순서대로 호출
+2) 폭주: 같은 탐침 + --clients 개 클라이언트가 POST /auth/login 을 --seconds 동안 동시에 호출
+초당 로그인 수, 코어당 초당 로그인 수, 응답 코드, 탐침 지연 p50/p99 (기준 vs 폭주) 를 출력한다.
+
+- inline     : PASSWORD_HASH_WORKERS=0, 스레드풀의 요청 스레드에서 bcrypt (이전 방식)
+- pool       : PASSWORD_HASH_WORKERS=--workers, 프로세스 풀
+- pool_async : pool + ASYNC_DB=1
+(클라이언트도 같은 머신에서 돌므로 절대값보다 설정 간 차이를 볼 것)
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import Counter
+
+from benchmarks.bench_async_concurrency import free_port
+from benchmarks.bench_kakao_login import start_server
+
+PASSWORD = "bench-password"
+
+
+def seed(users: int, rounds: int) -> None:
+    import bcrypt
+
+    from app import models
+    from app.db import engine
+    from benchmarks.populate import bulk_insert
+
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds)).decode()
+    with engine.begin() as conn:
+        bulk_insert(conn, models.User.__table__, [
+            {
+                "user_id": i,
+                "email": f"user{i}@example.com",
+                "nickname": f"user{i}",
+                "hashed_password": hashed,
+                "user_type": "YOUNG",
+                "terms_agreed": True,
+            }
+            for i in range(1, users + 1)
+        ])
+    engine.dispose()
+
+
+def _percentiles(latencies: list) -> dict:
+    lat = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(lat) * 1000, 1) if lat else None,
+        "p99_ms": round(lat[min(int(len(lat) * 0.99), len(lat) - 1)] * 1000, 1) if lat else None,
+        "requests": len(lat),
+    }
+
+
+async def probe(http, token: str, deadline: float) -> list:
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await http.get("/notifications/unread-count", headers=headers)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(port: int, users: int, clients: int, seconds: float, token: str) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=clients + 1, max_keepalive_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as http:
+        baseline = await probe(http, token, time.perf_counter() + seconds / 2)
+
+        statuses: Counter = Counter()
+        next_user = iter(range(10 ** 9))
+        deadline = time.perf_counter() + seconds
+
+        async def login_client() -> None:
+            while time.perf_counter() < deadline:
+                email = f"user{next(next_user) % users + 1}@example.com"
+                try:
+                    response = await http.post("/auth/login", json={"email": email, "password": PASSWORD})
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError:
+                    statuses["error"] += 1
+
+        started = time.perf_counter()
+        during, *_ = await asyncio.gather(probe(http, token, deadline), *(login_client() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "logins_per_sec": round(statuses[200] / elapsed, 1),
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+        "probe_baseline": _percentiles(baseline),
+        "probe_during_burst": _percentiles(during),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--clients", type=int, default=32, help="동시 로그인 클라이언트 수")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt 비용 (PASSWORD_BCRYPT_ROUNDS)")
+    parser.add_argument("--workers", type=int, default=1, help="PASSWORD_HASH_WORKERS (pool 설정)")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("bench_password_")
+
+    from app.deps import create_access_token
+    from app.migrations import upgrade
+
+    upgrade()
+    seed(args.users, args.rounds)
+    token = create_access_token({"sub": "1"})
+
+    cpus = os.cpu_count() or 1
+    configs = {
+        "inline": ({"PASSWORD_HASH_WORKERS": "0"}, cpus),
+        "pool": ({"PASSWORD_HASH_WORKERS": str(args.workers)}, min(args.workers, cpus)),
+        "pool_async": ({"PASSWORD_HASH_WORKERS": str(args.workers), "ASYNC_DB": "1"}, min(args.workers, cpus)),
+    }
+    results = {}
+    for name, (env, cores) in configs.items():
+        port = free_port()
+        server = start_server(port, {"PASSWORD_BCRYPT_ROUNDS": str(args.rounds), "ASYNC_DB": "0", **env})
+        try:
+            results[name] = asyncio.run(run(port, args.users, args.clients, args.seconds, token))
+        finally:
+            server.terminate()
+            server.wait()
+        results[name]["logins_per_sec_per_core"] = round(results[name]["logins_per_sec"] / cores, 1)
+
+    print(f"clients={args.clients} seconds={args.seconds} rounds={args.rounds} workers={args.workers} cpus={cpus}")
+    print(f"{'':>10} {'logins/s':>9} {'per core':>9} {'probe p50/p99 ms (기준)':>24} {'(폭주 중)':>16}  statuses")
+    for name, r in results.items():
+        base, burst = r["probe_baseline"], r["probe_during_burst"]
+        print(f"{name:>10} {r['logins_per_sec']:>9} {r['logins_per_sec_per_core']:>9} "
+              f"{base['p50_ms']!s:>12}/{base['p99_ms']!s:<11} {burst['p50_ms']!s:>8}/{burst['p99_ms']!s:<7}  {r['statuses']}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# benchmarks/bench_social_login.py
+"""
+소셜 로그인 유저 조회/가입 비용 + 동시 첫 로그인 확인 (app.crud.users.upsert_social_user)
+
+    python -m benchmarks.bench_social_login
+    python -m benchmarks.bench_social_login --logins 5000 --threads 16
+
+임시 SQLite DB 에서 로그인 1건(유저 조회 or 가입 + commit + JWT 발급 직전까지) 을
+- legacy : SELECT → (없으면) INSERT + commit + refresh  (이전 auth 라우트)
+- upsert : SELECT → (없으면) INSERT ... ON CONFLICT ... RETURNING + commit (app.crud.users)
+방식으로 --logins 번씩 (처음은 모두 가입, 두 번째는 모두 기존 유저) 실행해
+1건당 평균 시간(µs) 과 SQL 수를 잰다.
+
+이어서 같은 kakao_id 로 --threads 개 스레드가 동시에 첫 로그인을 --rounds 번 해서
+방식별 실패(unique 충돌) 수와 생긴 유저 row 수를 확인한다. upsert 에서 실패가 있으면 종료 코드 1.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+
+def legacy_login(db, kakao_id: str):
+    from app import models
+
+    user = (
+        db.query(models.User)
+        .filter(models.User.social_provider == "kakao", models.User.social_id == kakao_id)
+        .first()
+    )
+    if not user:
+        user = models.User(social_provider="kakao", social_id=kakao_id, nickname="카카오유저", user_type="YOUNG")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    return user.user_id
+
+
+def upsert_login(db, kakao_id: str):
+    from app.crud.users import upsert_social_user
+
+    user = upsert_social_user(db, "kakao", kakao_id, "카카오유저")
+    user_id = user.user_id
+    db.commit()
+    return user_id
+
+
+MODES = {"legacy": legacy_login, "upsert": upsert_login}
+
+
+def measure(login, prefix: str, logins: int) -> dict:
+    """(가입 / 기존 유저) 1건당 µs 와 SQL 수"""
+    from app.db import SessionLocal
+    from app.instrumentation import query_budget
+
+    result = {}
+    for phase in ("signup", "returning"):
+        with query_budget(10 ** 9) as stats:
+            started = time.perf_counter()
+            for i in range(logins):
+                db = SessionLocal()
+                try:
+                    login(db, f"{prefix}{i}")
+                finally:
+                    db.close()
+            elapsed = time.perf_counter() - started
+        result[phase] = {
+            "us": round(elapsed / logins * 1e6, 1),
+            "statements": round(stats.statements / logins, 2),
+        }
+    return result
+
+
+def concurrent_first_logins(login, prefix: str, threads: int, rounds: int) -> dict:
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.db import SessionLocal
+
+    failures = 0
+    user_ids = set()
+    lock = threading.Lock()
+
+    for round_ in range(rounds):
+        kakao_id = f"{prefix}{round_}"
+        barrier = threading.Barrier(threads)
+
+        def worker():
+            nonlocal failures
+            barrier.wait()
+            db = SessionLocal()
+            try:
+                user_id = login(db, kakao_id)
+                with lock:
+                    user_ids.add((kakao_id, user_id))
+            except Exception:
+                db.rollback()
+                with lock:
+                    failures += 1
+            finally:
+                db.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+    db = SessionLocal()
+    try:
+        rows = db.scalar(
+            select(func.count()).select_from(models.User).where(models.User.social_id.like(f"{prefix}%"))
+        )
+    finally:
+        db.close()
+    return {
+        "failures": failures,
+        "rows": rows,
+        "distinct_user_ids_per_kakao_id": max(
+            (sum(1 for k, _ in user_ids if k == f"{prefix}{r}") for r in range(rounds)), default=0
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=8, help="동시 첫 로그인 스레드 수")
+    parser.add_argument("--rounds", type=int, default=50, help="동시 첫 로그인 반복 (kakao_id 마다 1번)")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("bench_social_login_")
+
+    from app.migrations import upgrade
+
+    upgrade()
+
+    results = {}
+    for name, login in MODES.items():
+        results[name] = measure(login, f"{name}-seq-", args.logins)
+        results[name]["concurrent"] = concurrent_first_logins(login, f"{name}-race-", args.threads, args.rounds)
+
+    print(f"logins={args.logins} threads={args.threads} rounds={args.rounds}")
+    print(f"{'':>7} {'signup us':>10} {'sql':>5} {'returning us':>13} {'sql':>5} {'race fails':>11} {'rows':>5}")
+    for name, r in results.items():
+        c = r["concurrent"]
+        print(f"{name:>7} {r['signup']['us']:>10} {r['signup']['statements']:>5} "
+              f"{r['returning']['us']:>13} {r['returning']['statements']:>5} {c['failures']:>11} {c['rows']:>5}")
+    print(json.dumps(results))
+
+    upsert = results["upsert"]["concurrent"]
+    if upsert["failures"] or upsert["rows"] != args.rounds or upsert["distinct_user_ids_per_kakao_id"] != 1:
+        print("동시 첫 로그인 확인 실패")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_startup.py
+"""
+앱 기동 시간 벤치마크 (import → 첫 요청 응답)
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --repo /path/to/other/checkout   # 다른 커밋과 비교
+
+새 프로세스마다
+- import: `import app.main` 에 걸린 시간 (인터프리터 기동 제외), import_cpu 는 같은 구간의 CPU 시간
+  (다른 프로세스 영향을 덜 받아 커밋 간 비교에는 이쪽이 안정적)
+- first_request: uvicorn 프로세스 실행부터 GET / 가 200 으로 응답할 때까지
+를 --runs 번 재고 중앙값/최소값을 출력한다.
+미리 스키마를 만들어 둔 임시 SQLite DB 를 쓰고 매칭 워커 스레드는 끈다 (RUN_MATCHING_WORKER=0).
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Tuple
+
+IMPORT_SNIPPET = (
+    "import time; started, cpu = time.perf_counter(), time.process_time(); import app.main; "
+    "print(time.perf_counter() - started, time.process_time() - cpu)"
+)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(repo: str, env: dict) -> Tuple[float, float]:
+    """(wall, cpu) 초"""
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=repo, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    wall, cpu = out.strip().splitlines()[-1].split()
+    return float(wall), float(cpu)
+
+
+def measure_first_request(repo: str, env: dict, timeout: float = 30.0) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=repo, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/")
+                if conn.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("서버가 응답하지 않았습니다.")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summary(values) -> dict:
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "min_ms": round(min(values) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--repo", default=os.getcwd(), help="측정할 체크아웃 경로 (기본: 현재 디렉터리)")
+    args = parser.parse_args()
+    repo = os.path.abspath(args.repo)
+
+    from benchmarks.populate import temp_database_url
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": temp_database_url("bench_startup_"),
+        "RUN_MATCHING_WORKER": "0",
+    }
+    # 스키마는 미리 만들어 두고, 바이트코드 캐시도 한 번 데워 둔다
+    subprocess.run([sys.executable, "-m", "app.migrations"], cwd=repo, env=env,
+                   capture_output=True, check=True)
+    measure_import(repo, env)
+
+    imports = [measure_import(repo, env) for _ in range(args.runs)]
+    firsts = [measure_first_request(repo, env) for _ in range(args.runs)]
+
+    print(json.dumps({
+        "repo": repo,
+        "runs": args.runs,
+        "import": summary([wall for wall, _ in imports]),
+        "import_cpu": summary([cpu for _, cpu in imports]),
+        "first_request": summary(firsts),
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
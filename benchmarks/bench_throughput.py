@@ -0,0 +1,151 @@
+# benchmarks/bench_throughput.py
+"""
+매칭 처리량 벤치마크 (결과는 JSON 한 줄 → 커밋 간 비교용)
+
+    python -m benchmarks.bench_throughput
+    python -m benchmarks.bench_throughput --users 200000 --stale-ratio 0.2 --mode maximum
+    python -m benchmarks.bench_throughput --db /tmp/x.db --out results.jsonl   # 이미 채운 DB 사용
+
+1. benchmarks.populate 로 임시 SQLite DB 를 채운다. (--db 지정 시 그 DB 를 그대로 사용)
+2. run_matching_once 를 대기열이 바닥날 때까지 반복
+   (선점 커서가 대기열을 한 바퀴 도는 동안 짝이 하나도 안 나오면 종료)
+3. expire_old_matches 1회
+4. rounds/sec, pairs/sec, SQL 개수, peak RSS, 커밋 해시를 JSON 으로 출력 (--out 이면 파일에 append)
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import time
+from datetime import datetime
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def peak_rss_mb() -> float:
+    # Linux 의 ru_maxrss 단위는 KB
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run_matching_until_idle(max_rounds: int) -> dict:
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.crud.match import new_worker_id
+    from app.db import SessionLocal
+    from app.routers.matches import MATCH_CLAIM_BATCH, run_matching_once
+
+    db = SessionLocal()
+    pending = db.scalar(
+        select(func.count()).select_from(models.MatchingQueue)
+        .where(models.MatchingQueue.status == "PENDING")
+    )
+    idle_limit = pending // MATCH_CLAIM_BATCH + 2
+
+    worker_id = new_worker_id()
+    rounds = pairs = statements = idle = 0
+    started = time.perf_counter()
+    while rounds < max_rounds and idle < idle_limit:
+        stats = run_matching_once(db, worker_id=worker_id)
+        rounds += 1
+        pairs += stats.pairs
+        statements += stats.sql_statements
+        idle = idle + 1 if stats.pairs == 0 else 0
+    elapsed = time.perf_counter() - started
+    db.close()
+
+    return {
+        "pending_before": pending,
+        "rounds": rounds,
+        "pairs": pairs,
+        "seconds": round(elapsed, 3),
+        "rounds_per_sec": round(rounds / elapsed, 2) if elapsed else None,
+        "pairs_per_sec": round(pairs / elapsed, 1) if elapsed else None,
+        "sql_statements": statements,
+        "sql_per_round": round(statements / rounds, 1) if rounds else None,
+    }
+
+
+def run_expire() -> dict:
+    from app.db import SessionLocal
+    from app.instrumentation import track_queries
+    from app.routers.matches import expire_old_matches
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    with track_queries() as queries:
+        expired = expire_old_matches(db)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return {
+        "expired": expired,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(expired / elapsed, 1) if elapsed else None,
+        "sql_statements": queries.statements,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--db", help="이미 채워 둔 SQLite 파일 (지정 시 populate 생략)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skew", action="store_true")
+    parser.add_argument("--stale-ratio", type=float, default=0.1)
+    parser.add_argument("--mode", choices=["greedy", "maximum"], default="greedy")
+    parser.add_argument("--batch", type=int, default=10_000, help="MATCH_CLAIM_BATCH")
+    parser.add_argument("--max-rounds", type=int, default=10_000)
+    parser.add_argument("--out", help="결과 JSON 을 이 파일에 한 줄씩 추가")
+    args = parser.parse_args()
+
+    # app 설정은 import 시점에 환경변수를 읽으므로 import 전에 지정
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = (
+        f"sqlite:///{os.path.abspath(args.db)}" if args.db else temp_database_url("bench_throughput_")
+    )
+    os.environ["MATCHING_MODE"] = args.mode
+    os.environ["MATCH_CLAIM_BATCH"] = str(args.batch)
+
+    from app.db import engine
+    from benchmarks.populate import populate
+
+    result = {
+        "commit": git_commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "params": {
+            "users": None if args.db else args.users,
+            "skew": args.skew,
+            "stale_ratio": args.stale_ratio,
+            "mode": args.mode,
+            "batch": args.batch,
+        },
+    }
+    if not args.db:
+        seeded = populate(
+            engine, args.users, seed=args.seed, skew=args.skew, stale_ratio=args.stale_ratio,
+        )
+        result["populate_seconds"] = round(seeded.seconds, 2)
+
+    result["matching"] = run_matching_until_idle(args.max_rounds)
+    result["expire"] = run_expire()
+    result["peak_rss_mb"] = peak_rss_mb()
+
+    line = json.dumps(result, ensure_ascii=False)
+    print(line)
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/check_dry_run.py
+"""
+매칭 dry-run 의 짝 수 / 미매칭 사유 확인 (GET /matches/dry-run 의 dry_run_matching)
+
+    python -m benchmarks.check_dry_run
+
+임시 SQLite DB 에 사유별 대기자를 한 명씩 넣고 greedy / maximum 두 모드로 dry-run 을 돌려
+짝 수와 unmatched_by_reason 이 EXPECTED 와 같은지 확인한다. 다르면 종료 코드 1.
+- YOUNG ↔ SENIOR, UNKNOWN ↔ YOUNG 보완 쌍 (두 모드 모두 짝)
+- 상대가 없는 UNKNOWN        → NO_COMPLEMENT
+- MIDDLE                      → MIDDLE
+- 재능 카드 없음               → NO_TALENT
+- 세대 값이 MATCHABLE_USER_TYPES 밖 (예전 데이터 "ADULT") → UNSUPPORTED_USER_TYPE
+"""
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+# (닉네임, user_type, learn, teach). learn/teach 가 None 이면 매칭 프로필 없음
+QUEUE = [
+    ("young-it", "YOUNG", "디지털/IT", "요리/생활"),
+    ("senior-it", "SENIOR", "요리/생활", "디지털/IT"),
+    ("unknown-sport", "UNKNOWN", "건강/운동", "요리/생활"),
+    ("young-sport", "YOUNG", "요리/생활", "건강/운동"),
+    ("unknown-alone", "UNKNOWN", "문화/예술", "외국어"),
+    ("middle", "MIDDLE", "디지털/IT", "요리/생활"),
+    ("young-no-talent", "YOUNG", None, None),
+    ("legacy-adult", "ADULT", "디지털/IT", "요리/생활"),
+]
+
+EXPECTED = {
+    "pairs": 2,
+    "unmatched_by_reason": {
+        "NO_COMPLEMENT": 1,
+        "MIDDLE": 1,
+        "NO_TALENT": 1,
+        "UNSUPPORTED_USER_TYPE": 1,
+    },
+}
+
+
+def seed() -> None:
+    from app import models
+    from app.crud.matching_profile import profile_values
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        started = datetime.utcnow() - timedelta(minutes=10)
+        for i, (nickname, user_type, learn, teach) in enumerate(QUEUE):
+            user = models.User(nickname=nickname, user_type=user_type, terms_agreed=True)
+            db.add(user)
+            db.flush()
+            if learn is not None:
+                db.add(models.MatchingProfile(user_id=user.user_id, **profile_values(user_type, learn, teach)))
+            db.add(models.MatchingQueue(
+                user_a_id=user.user_id, status="PENDING", requested_at=started + timedelta(seconds=i),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("check_dry_run_")
+
+    from app.db import SessionLocal
+    from app.matching import MATCHING_MODES
+    from app.migrations import upgrade
+    from app.routers.matches import dry_run_matching
+
+    upgrade()
+    seed()
+
+    failed = False
+    for mode in MATCHING_MODES:
+        db = SessionLocal()
+        try:
+            report = dry_run_matching(db, mode)
+        finally:
+            db.close()
+        got = {"pairs": report.pairs, "unmatched_by_reason": report.unmatched_by_reason}
+        ok = got == EXPECTED
+        failed |= not ok
+        print(f"{mode:>8} {'ok' if ok else 'FAIL'} {json.dumps(got, ensure_ascii=False)}")
+        if not ok:
+            print(f"{'':>8} expected {json.dumps(EXPECTED, ensure_ascii=False)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
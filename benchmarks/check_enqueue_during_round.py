@@ -0,0 +1,167 @@
+# benchmarks/check_enqueue_during_round.py
+"""
+워커 라운드가 대기자 row 를 선점(lease)하고 있는 동안 들어온 신청 확인 (POST /matches/start)
+
+    python -m benchmarks.check_enqueue_during_round
+    python -m benchmarks.check_enqueue_during_round --waiting 500
+
+임시 SQLite DB 에 대기자 --waiting 명(YOUNG, 디지털/IT 를 배우고 싶음) 을 넣고
+1) 선점 없음   : 보완 관계인 SENIOR(디지털/IT 를 가르침) 가 신청 → MATCHED_IMMEDIATELY 기대
+2) 라운드 진행 중: 워커가 대기열을 선점한 상태에서 같은 조건의 SENIOR 가 신청
+   → match_new_entry 는 선점된 row 를 건너뛰므로 QUEUED, 대신 워커 깨우기 신호가 남아 있어야 함
+   → 진행 중이던 라운드가 선점을 풀고, 신호로 깨어난 다음 라운드에서 짝이 되는지 확인
+결과 코드, 신호 여부, 신청부터 다음 라운드에서 짝이 될 때까지의 시간(디바운스 포함) 을 출력한다.
+기대와 다르면 종료 코드 1.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+
+def seed(waiting: int) -> None:
+    from app import models
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        users = [
+            models.User(nickname=f"young{i}", user_type="YOUNG", terms_agreed=True, is_matching_available=False)
+            for i in range(waiting)
+        ]
+        db.add_all(users)
+        db.flush()
+        started = datetime.utcnow() - timedelta(minutes=10)
+        for i, user in enumerate(users):
+            db.add(models.MatchingProfile(
+                user_id=user.user_id, user_type="YOUNG",
+                learn_category="디지털/IT", teach_category="요리/생활", is_matchable=True,
+            ))
+            db.add(models.MatchingQueue(
+                user_a_id=user.user_id, status="PENDING", requested_at=started + timedelta(seconds=i),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def new_applicant(nickname: str):
+    from app import models
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = models.User(nickname=nickname, user_type="SENIOR", terms_agreed=True)
+        db.add(user)
+        db.flush()
+        db.add(models.MatchingProfile(
+            user_id=user.user_id, user_type="SENIOR",
+            learn_category="요리/생활", teach_category="디지털/IT", is_matchable=True,
+        ))
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+def apply(user) -> str:
+    from app.db import SessionLocal
+    from app.routers.matches import start_matching
+
+    db = SessionLocal()
+    try:
+        return start_matching(db=db, current_user=db.merge(user)).result.value
+    finally:
+        db.close()
+
+
+def is_paired(user_id: int) -> bool:
+    from sqlalchemy import select
+
+    from app import models
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        Queue = models.MatchingQueue
+        return db.scalar(
+            select(Queue.match_id).where(Queue.user_b_id == user_id, Queue.status == "CONFIRMED").limit(1)
+        ) is not None
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--waiting", type=int, default=50, help="대기자 수 (MATCH_CLAIM_BATCH 이하)")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("check_enqueue_")
+
+    from app.crud.match import claim_pending_entries, release_claims
+    from app.db import SessionLocal
+    from app.matching_events import wait_for_change
+    from app.matching_worker import MATCH_DEBOUNCE_SECONDS
+    from app.migrations import upgrade
+    from app.routers.matches import MATCH_CLAIM_BATCH, run_matching_once
+
+    if args.waiting > MATCH_CLAIM_BATCH:
+        parser.error(f"--waiting 은 MATCH_CLAIM_BATCH({MATCH_CLAIM_BATCH}) 이하여야 함 (한 라운드 구간 안에서만 짝이 됨)")
+
+    upgrade()
+    seed(args.waiting)
+    failures = []
+
+    # 1) 선점 없음
+    wait_for_change(0)
+    result = apply(new_applicant("senior-free"))
+    print(f"no lease      : {result}")
+    if result != "MATCHED_IMMEDIATELY":
+        failures.append("선점이 없는데 즉시 매칭되지 않음")
+
+    # 2) 워커 라운드가 대기열을 선점한 상태
+    worker_id = "check-enqueue-round"
+    db = SessionLocal()
+    try:
+        claimed, _ = claim_pending_entries(db, worker_id, 60, MATCH_CLAIM_BATCH)
+        senior = new_applicant("senior-leased")
+        wait_for_change(0)
+        started = time.perf_counter()
+        result = apply(senior)
+        signaled = wait_for_change(0)
+        # 진행 중이던 라운드 종료 (짝 없이 선점만 해제한 경우)
+        release_claims(db, worker_id)
+    finally:
+        db.close()
+
+    print(f"during round  : {result} (claimed={claimed}, wakeup signal={signaled})")
+    if result != "QUEUED":
+        failures.append(f"선점 중 신청 결과가 QUEUED 가 아님: {result}")
+    if not signaled:
+        failures.append("선점 때문에 즉시 매칭을 못 했는데 워커 깨우기 신호가 없음")
+
+    # 신호로 깨어난 워커가 디바운스 후 돌리는 다음 라운드
+    time.sleep(MATCH_DEBOUNCE_SECONDS)
+    db = SessionLocal()
+    try:
+        run_matching_once(db, worker_id=worker_id)
+    finally:
+        db.close()
+    paired = is_paired(senior.user_id)
+    print(f"next round    : paired={paired} after {(time.perf_counter() - started) * 1000:.0f} ms")
+    if not paired:
+        failures.append("신호로 깨어난 다음 라운드에서 짝이 되지 않음")
+
+    if failures:
+        for failure in failures:
+            print("FAIL:", failure)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
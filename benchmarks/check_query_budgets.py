@@ -0,0 +1,119 @@
+# benchmarks/check_query_budgets.py
+"""
+API 별 SQL 쿼리 수 예산 점검 (N+1 회귀 확인용)
+
+    python -m benchmarks.check_query_budgets
+    python -m benchmarks.check_query_budgets --chats 50 --verbose
+
+임시 SQLite DB 에 대화 상대 --chats 명(대화마다 쪽지 몇 건, 알림 몇 건)을 만든 뒤
+TestClient 로 ENDPOINT_BUDGETS 의 API 를 호출하고, 요청 1번에 실행된 statement 수가
+예산을 넘거나 같은 모양의 statement 가 MAX_REPEATS 번을 넘게 반복되면 종료 코드 1.
+예산은 대화/쪽지 수와 무관한 상수이므로, --chats 를 늘려도 통과해야 한다.
+(인증 유저 조회 1번 포함)
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+# 같은 모양 statement 반복 허용 횟수
+MAX_REPEATS = 2
+
+# (method, path, 최대 statement 수). {match_id} 는 첫 번째 대화로 채운다
+ENDPOINT_BUDGETS = [
+    ("GET", "/users/me", 2),
+    ("GET", "/talents/my-summary", 3),
+    ("GET", "/messages/messages", 5),
+    ("GET", "/messages/messages/{match_id}", 6),
+    ("GET", "/notifications/unread-count", 2),
+    ("GET", "/matches/stats/today", 4),
+]
+
+
+def seed(chats: int) -> tuple:
+    """(내 user_id, 첫 match_id)"""
+    from app import models
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        me = models.User(nickname="me", user_type="YOUNG", terms_agreed=True)
+        partners = [
+            models.User(nickname=f"p{i}", user_type="SENIOR", terms_agreed=True)
+            for i in range(chats)
+        ]
+        db.add(me)
+        db.add_all(partners)
+        db.flush()
+
+        now = datetime.utcnow()
+        matches = [
+            models.MatchingQueue(
+                user_a_id=me.user_id, user_b_id=p.user_id,
+                status="CONFIRMED", shared_category="디지털/IT",
+            )
+            for p in partners
+        ]
+        db.add_all(matches)
+        db.flush()
+        for i, (match, partner) in enumerate(zip(matches, partners)):
+            for j in range(3):
+                db.add(models.Message(
+                    match_id=match.match_id,
+                    sender_id=partner.user_id if j % 2 == 0 else me.user_id,
+                    content=f"쪽지 {i}-{j}",
+                    timestamp=now - timedelta(minutes=i * 10 + j),
+                ))
+            db.add(models.Notification(
+                user_id=me.user_id, type="NEW_MESSAGE", content=f"{partner.nickname}님의 쪽지",
+            ))
+        db.commit()
+        return me.user_id, matches[0].match_id
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--verbose", action="store_true", help="통과한 API 의 statement 모양도 출력")
+    args = parser.parse_args()
+
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("check_budgets_")
+    os.environ["RUN_MATCHING_WORKER"] = "0"
+    os.environ.setdefault("ASYNC_DB", "0")
+
+    from fastapi.testclient import TestClient
+
+    from app.deps import create_access_token
+    from app.instrumentation import QueryBudgetExceeded, query_budget
+    from app.main import app
+    from app.migrations import upgrade
+
+    upgrade()
+    user_id, match_id = seed(args.chats)
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": str(user_id)})}
+
+    failed = 0
+    with TestClient(app) as client:
+        for method, path, budget in ENDPOINT_BUDGETS:
+            url = path.format(match_id=match_id)
+            try:
+                with query_budget(budget, max_repeats=MAX_REPEATS) as stats:
+                    response = client.request(method, url, headers=headers)
+                status = "ok"
+            except QueryBudgetExceeded as e:
+                status = f"FAIL {e}"
+                failed += 1
+            print(f"{method:6} {path:40} {response.status_code} {stats.statements:3}/{budget:<3} {status}")
+            if args.verbose:
+                for shape, count in stats.shapes.most_common():
+                    print(f"        {count}x {shape[:150]}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/check_read_your_writes.py
+"""
+read-your-writes 확인 (READ_DATABASE_URL 복제본 + 방금 쓴 유저는 primary 로 읽기, app.db)
+
+    python -m benchmarks.check_read_your_writes
+
+ASYNC_DB=0 / ASYNC_DB=1 마다 별도 프로세스에서 임시 SQLite primary/복제본 파일을 만들고
+(복제본은 시작할 때 1번만 복사, 이후 동기화 없음 = 계속 뒤처진 복제본)
+1) 나(me, SENIOR) 가 POST /matches/start 로 신청 → 대기 중인 상대(YOUNG) 와 즉시 매칭
+   (ASYNC_DB=1 이면 async 라우트, 매칭 알림이 생김)
+2) 그 commit 이 read-your-writes 기록에 남았는지, 내 읽기 세션이 primary 인지 확인
+   (아무것도 쓰지 않은 다른 유저는 여전히 복제본)
+3) GET /notifications/unread-count 에 방금 생긴 매칭 알림이 보이는지 확인
+하나라도 다르면 종료 코드 1.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODES = {"sync": "0", "async": "1"}
+
+
+def seed() -> tuple:
+    """(me, 쓰지 않는 다른 유저)"""
+    from app import models
+    from app.crud.matching_profile import profile_values
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        me = models.User(nickname="me", user_type="SENIOR", terms_agreed=True)
+        partner = models.User(nickname="partner", user_type="YOUNG", terms_agreed=True, is_matching_available=False)
+        other = models.User(nickname="other", user_type="YOUNG", terms_agreed=True)
+        db.add_all([me, partner, other])
+        db.flush()
+        db.add(models.MatchingProfile(user_id=me.user_id, **profile_values("SENIOR", "요리/생활", "디지털/IT")))
+        db.add(models.MatchingProfile(user_id=partner.user_id, **profile_values("YOUNG", "디지털/IT", "요리/생활")))
+        db.add(models.MatchingQueue(user_a_id=partner.user_id, status="PENDING"))
+        db.commit()
+        return me.user_id, other.user_id
+    finally:
+        db.close()
+
+
+def run_child() -> None:
+    from fastapi.testclient import TestClient
+
+    from app.db import engine, session_for_read, wrote_recently
+    from app.deps import create_access_token
+    from app.main import app
+    from app.migrations import upgrade
+    from app.replica import sync_sqlite_replica
+
+    upgrade()
+    me, other = seed()
+    sync_sqlite_replica()
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": str(me)})}
+    with TestClient(app) as client:
+        started = client.post("/matches/start", headers=headers)
+        unread = client.get("/notifications/unread-count", headers=headers)
+
+    def reads_primary(user_id: int) -> bool:
+        db = session_for_read(user_id)
+        try:
+            return db.get_bind() is engine
+        finally:
+            db.close()
+
+    print(json.dumps({
+        "start_result": started.json().get("result"),
+        "recorded_write": wrote_recently(me),
+        "me_reads_primary": reads_primary(me),
+        "other_reads_primary": reads_primary(other),
+        "sees_own_notification": unread.status_code == 200 and unread.json()["unread_count"] > 0,
+    }, ensure_ascii=False))
+
+
+EXPECTED = {
+    "start_result": "MATCHED_IMMEDIATELY",
+    "recorded_write": True,
+    "me_reads_primary": True,
+    "other_reads_primary": False,
+    "sees_own_notification": True,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    from benchmarks.populate import temp_database_url
+
+    failed = False
+    for name, async_db in MODES.items():
+        env = {
+            **os.environ,
+            "ASYNC_DB": async_db,
+            "DATABASE_URL": temp_database_url(f"check_ryw_{name}_"),
+            "READ_DATABASE_URL": temp_database_url(f"check_ryw_{name}_replica_"),
+            "REPLICA_SYNC_SECONDS": "0",
+            "RUN_MATCHING_WORKER": "0",
+        }
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.check_read_your_writes", "--child"],
+            env=env, capture_output=True, text=True,
+        )
+        if child.returncode != 0:
+            print(f"{name:>6} FAIL (exit {child.returncode})\n{child.stderr[-2000:]}")
+            failed = True
+            continue
+        got = json.loads(child.stdout.strip().splitlines()[-1])
+        ok = got == EXPECTED
+        failed |= not ok
+        print(f"{name:>6} {'ok' if ok else 'FAIL'} {json.dumps(got, ensure_ascii=False)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/check_token_versions.py
+"""
+권한 클레임 토큰 버전 확인 (TOKEN_CLAIMS=1, app.token_claims / deps.get_token_user)
+
+    python -m benchmarks.check_token_versions
+
+임시 SQLite DB 에 유저 1명을 만들고 클레임 토큰(old) 을 발급한 뒤
+1) 발급 직후 old 는 클레임만으로 처리 (users 조회 없음)
+2) 클레임 컬럼을 바꿨다가 원래 값으로 되돌림 (버전 2번 올라감, 클레임은 old 와 같아짐)
+3) 버전 캐시가 비어도 (TOKEN_VERSION_TTL 경과 / 재시작) old 는 다시 믿지 않고 DB 조회로 처리
+4) 다시 로그인해서 받은 토큰(new) 은 클레임만으로 처리, ver 는 DB 의 users.token_version
+기대와 다르면 종료 코드 1.
+"""
+import os
+import sys
+import time
+
+
+def main() -> None:
+    from benchmarks.populate import temp_database_url
+
+    os.environ["DATABASE_URL"] = temp_database_url("check_token_versions_")
+    os.environ["TOKEN_CLAIMS"] = "1"
+    os.environ["TOKEN_VERSION_TTL"] = "1"
+
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app import models
+    from app.db import SessionLocal
+    from app.deps import create_user_access_token, get_token_user, payload_from_token
+    from app.migrations import upgrade
+    from app.token_claims import TOKEN_VERSION_TTL, TokenUser, token_versions
+
+    upgrade()
+    failures = []
+
+    def trusted(token: str) -> bool:
+        """DB 조회 없이 클레임만으로 처리됐는지"""
+        db = SessionLocal()
+        try:
+            credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+            return isinstance(get_token_user(credentials, db), TokenUser)
+        finally:
+            db.close()
+
+    def login(user_id: int) -> str:
+        db = SessionLocal()
+        try:
+            return create_user_access_token(db.get(models.User, user_id))
+        finally:
+            db.close()
+
+    def set_status(user_id: int, user_status: str) -> None:
+        db = SessionLocal()
+        try:
+            db.get(models.User, user_id).user_status = user_status
+            db.commit()
+        finally:
+            db.close()
+
+    def check(name: str, got, expected) -> None:
+        print(f"{name:<40} {got!s:<6} {'ok' if got == expected else 'FAIL'}")
+        if got != expected:
+            failures.append(name)
+
+    db = SessionLocal()
+    try:
+        user = models.User(nickname="me", user_type="YOUNG", terms_agreed=True)
+        db.add(user)
+        db.commit()
+        user_id = user.user_id
+    finally:
+        db.close()
+
+    old = login(user_id)
+    check("fresh token trusted", trusted(old), True)
+
+    set_status(user_id, "BANNED")
+    check("old token after bump", trusted(old), False)
+    set_status(user_id, "NORMAL")
+    check("old token after bump back", trusted(old), False)
+
+    time.sleep(TOKEN_VERSION_TTL + 0.1)
+    check("old token after TTL (1st request)", trusted(old), False)
+    check("old token after TTL (2nd request)", trusted(old), False)
+
+    token_versions.clear()  # 재시작
+    check("old token after restart (1st request)", trusted(old), False)
+    check("old token after restart (2nd request)", trusted(old), False)
+
+    new = login(user_id)
+    check("new token ver == users.token_version", payload_from_token(new, None)["ver"], 2)
+    check("new token trusted", trusted(new), True)
+    check("old token still untrusted", trusted(old), False)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
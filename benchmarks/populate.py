@@ -0,0 +1,227 @@
+# benchmarks/populate.py
+"""
+가상 사용자/재능 카드/매칭 대기열 생성기 (운영 규모 재현용)
+
+    python -m benchmarks.populate --users 100000                  # ./app.db (DATABASE_URL) 에 추가
+    python -m benchmarks.populate --users 1000000 --temp          # 임시 DB 를 만들어 경로 출력
+    python -m benchmarks.populate --users 50000 --db /tmp/x.db --skew
+
+- 세대 구성: YOUNG / SENIOR / MIDDLE 비율 (--mix, 기본 45:45:10)
+- 재능 카드: 사용자마다 Learn 1장 + Teach 1장 (일부는 카드 없음, 일부는 Teach 추가 1장)
+  카테고리는 schemas.TalentCategory 값. --skew 면 인기 카테고리 쏠림 분포.
+- 매칭 대기열: --queue-ratio 비율의 사용자가 PENDING, 그중 --stale-ratio 는 24시간 지난 신청
+- 기존 데이터의 마지막 id 뒤로 이어서 넣는다. 드라이버 executemany 로 바로 넣어
+  사용자 100만 명(행 약 400만 건) 기준 30초 안팎.
+
+다른 벤치마크에서는 populate(engine, ...) 를 직접 호출한다.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+# schemas.TalentCategory 순서
+CATEGORIES = ["디지털/IT", "요리/생활", "취미/예술", "직무/경험", "건강/운동"]
+UNIFORM_WEIGHTS = [1, 1, 1, 1, 1]
+# 배우려는 사람은 디지털/IT 에 몰리고, 가르칠 사람은 적은 분포
+SKEWED_LEARN_WEIGHTS = [40, 15, 15, 15, 15]
+SKEWED_TEACH_WEIGHTS = [5, 30, 25, 20, 20]
+
+USER_TYPES = ["YOUNG", "SENIOR", "MIDDLE"]
+BIRTH_YEARS = {"YOUNG": (1995, 2006), "SENIOR": (1940, 1965), "MIDDLE": (1966, 1994)}
+
+CHUNK_SIZE = 50_000
+
+
+@dataclass
+class PopulateResult:
+    users: int = 0
+    talents: int = 0
+    queue_entries: int = 0
+    stale_entries: int = 0
+    seconds: float = 0.0
+
+
+def bulk_insert(conn, table, rows: List[Dict]) -> None:
+    """
+    컬럼 이름이 같은 dict 목록을 드라이버 executemany 로 바로 INSERT.
+    Core insert() 는 행마다 파라미터/타입 처리를 거쳐 100만 건 단위에서는 그 비용이 대부분이다.
+    - DateTime 은 호출 쪽에서 datetime_formatter 로 미리 변환해 둔다
+    - 모델의 Python 쪽 기본값(default=...) 은 여기서 채운다
+    """
+    from sqlalchemy import bindparam, insert
+
+    if not rows:
+        return
+    compiled = insert(table).values({name: bindparam(name) for name in rows[0]}) \
+        .compile(dialect=conn.dialect)
+    names = list(compiled.positiontup) if compiled.positional else list(compiled.params)
+    defaults = {
+        name: table.c[name].default.arg
+        for name in names
+        if name not in rows[0] and table.c[name].default is not None
+    }
+    sql = str(compiled)
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = [{**defaults, **row} for row in rows[start:start + CHUNK_SIZE]]
+        if compiled.positional:
+            chunk = [tuple(row[name] for name in names) for row in chunk]
+        conn.exec_driver_sql(sql, chunk)
+
+
+def datetime_formatter(dialect):
+    """SQLite 는 SQLAlchemy DateTime 과 같은 문자열 형식으로, 그 외 DB 는 datetime 그대로"""
+    if dialect.name == "sqlite":
+        return lambda value: value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return lambda value: value
+
+
+def populate(
+    engine,
+    users: int,
+    seed: int = 0,
+    mix: Sequence[int] = (45, 45, 10),
+    skew: bool = False,
+    no_talent_ratio: float = 0.05,
+    extra_teach_ratio: float = 0.1,
+    queue_ratio: float = 1.0,
+    stale_ratio: float = 0.0,
+) -> PopulateResult:
+    """engine 이 가리키는 DB 에 사용자 users 명과 재능 카드/대기열을 bulk insert"""
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.crud.matching_profile import profile_values
+    from app.migrations import upgrade
+
+    upgrade(engine)
+    rnd = random.Random(seed)
+    learn_weights = SKEWED_LEARN_WEIGHTS if skew else UNIFORM_WEIGHTS
+    teach_weights = SKEWED_TEACH_WEIGHTS if skew else UNIFORM_WEIGHTS
+
+    started = time.perf_counter()
+    result = PopulateResult()
+    now = datetime.utcnow()
+    fresh_base = now - timedelta(hours=1)
+    stale_base = now - timedelta(days=2)
+    learn_cum = list(accumulate(learn_weights))
+    teach_cum = list(accumulate(teach_weights))
+    type_cum = list(accumulate(mix))
+
+    with engine.begin() as conn:
+        to_db = datetime_formatter(conn.dialect)
+        agreed_at = to_db(now)
+        if engine.dialect.name == "sqlite":
+            # 적재용 연결에서만 fsync 를 끄고 페이지 캐시를 키운다 (이 연결 한정 설정)
+            # 기본 캐시(2MB) 로는 인덱스가 커질수록 적재가 급격히 느려진다
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA cache_size=-262144")
+        first_uid = (conn.scalar(select(func.max(models.User.user_id))) or 0) + 1
+
+        for chunk_start in range(0, users, CHUNK_SIZE):
+            user_rows, talent_rows, profile_rows, queue_rows = [], [], [], []
+            for offset in range(chunk_start, min(chunk_start + CHUNK_SIZE, users)):
+                uid = first_uid + offset
+                user_type = rnd.choices(USER_TYPES, cum_weights=type_cum)[0]
+                user_rows.append({
+                    "user_id": uid,
+                    "nickname": f"user{uid}",
+                    "birth_year": rnd.randint(*BIRTH_YEARS[user_type]),
+                    "user_type": user_type,
+                    "terms_agreed": True,
+                    "terms_agreed_at": agreed_at,
+                })
+
+                if rnd.random() >= no_talent_ratio:
+                    learn = rnd.choices(CATEGORIES, cum_weights=learn_cum)[0]
+                    teach = rnd.choices(CATEGORIES, cum_weights=teach_cum)[0]
+                    talent_rows.append({
+                        "user_id": uid, "type": "Learn", "category": learn, "title": "배우고 싶어요",
+                    })
+                    talent_rows.append({
+                        "user_id": uid, "type": "Teach", "category": teach, "title": "가르칠 수 있어요",
+                    })
+                    # 재능 등록 API 가 갱신하는 매칭 프로필도 같이 넣는다 (첫 카드 기준)
+                    profile_rows.append({"user_id": uid, **profile_values(user_type, learn, teach)})
+                    if rnd.random() < extra_teach_ratio:
+                        talent_rows.append({
+                            "user_id": uid, "type": "Teach",
+                            "category": rnd.choices(CATEGORIES, cum_weights=teach_cum)[0],
+                            "title": "이것도 가르칠 수 있어요",
+                        })
+
+                if rnd.random() < queue_ratio:
+                    stale = rnd.random() < stale_ratio
+                    base = stale_base if stale else fresh_base
+                    queue_rows.append({
+                        "user_a_id": uid,
+                        "status": "PENDING",
+                        "requested_at": to_db(base + timedelta(milliseconds=offset)),
+                    })
+                    result.stale_entries += stale
+
+            bulk_insert(conn, models.User.__table__, user_rows)
+            bulk_insert(conn, models.Talent.__table__, talent_rows)
+            bulk_insert(conn, models.MatchingProfile.__table__, profile_rows)
+            bulk_insert(conn, models.MatchingQueue.__table__, queue_rows)
+            result.users += len(user_rows)
+            result.talents += len(talent_rows)
+            result.queue_entries += len(queue_rows)
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def temp_database_url(prefix: str = "bench_") -> str:
+    tmpdir = tempfile.mkdtemp(prefix=prefix)
+    return f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10_000)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", help="SQLite 파일 경로 (미지정 시 DATABASE_URL / ./app.db)")
+    target.add_argument("--temp", action="store_true", help="임시 SQLite DB 를 새로 만든다")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mix", type=int, nargs=3, default=[45, 45, 10],
+                        metavar=("YOUNG", "SENIOR", "MIDDLE"))
+    parser.add_argument("--skew", action="store_true", help="인기 카테고리 쏠림 분포")
+    parser.add_argument("--queue-ratio", type=float, default=1.0, help="대기열에 넣을 사용자 비율")
+    parser.add_argument("--stale-ratio", type=float, default=0.0, help="24시간 지난 신청 비율")
+    args = parser.parse_args(argv)
+
+    # app.db 는 import 시점에 DATABASE_URL 을 읽으므로 import 전에 지정
+    if args.temp:
+        os.environ["DATABASE_URL"] = temp_database_url()
+    elif args.db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+
+    from app.db import DATABASE_URL, engine
+
+    result = populate(
+        engine,
+        args.users,
+        seed=args.seed,
+        mix=args.mix,
+        skew=args.skew,
+        queue_ratio=args.queue_ratio,
+        stale_ratio=args.stale_ratio,
+    )
+    print(
+        f"[POPULATE] {DATABASE_URL}: users={result.users} talents={result.talents} "
+        f"queue={result.queue_entries} (stale={result.stale_entries}) "
+        f"in {result.seconds:.1f}s",
+        file=sys.stderr,
+    )
+    print(DATABASE_URL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# benchmarks/stress_matching_workers.py
+"""
+매칭 워커 다중 프로세스 스트레스 테스트 (SQLite 파일 DB)
+
+    python -m benchmarks.stress_matching_workers
+    python -m benchmarks.stress_matching_workers --users 20000 --workers 6 --batch 300
+
+임시 DB 에 대기열을 채운 뒤
+- 매칭 워커 프로세스 N 개 (절반은 카테고리 샤드, 절반은 전체 담당)
+- 신규 신청을 넣으며 match_new_entry 를 호출하는 프로세스 1 개
+를 동시에 돌리고, 끝난 뒤 중복 매칭이 없는지 검사한다. 위반 시 exit code 1.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+CATEGORIES = ["디지털/IT", "요리/생활", "취미/예술", "직무/경험", "건강/운동"]
+USER_TYPES = ["YOUNG", "SENIOR", "MIDDLE"]
+
+
+def seed(users: int) -> None:
+    from sqlalchemy import insert
+
+    from app import models
+    from app.crud.matching_profile import profile_values
+    from app.db import SessionLocal, engine
+    from app.migrations import upgrade
+
+    upgrade(engine)
+    rnd = random.Random(0)
+    base = datetime.utcnow() - timedelta(hours=1)
+    user_rows, talent_rows, profile_rows, queue_rows = [], [], [], []
+    for uid in range(1, users + 1):
+        user_type, learn, teach = rnd.choice(USER_TYPES), rnd.choice(CATEGORIES), rnd.choice(CATEGORIES)
+        user_rows.append({"user_id": uid, "nickname": f"user{uid}",
+                          "user_type": user_type, "terms_agreed": True})
+        talent_rows.append({"user_id": uid, "type": "Learn", "category": learn, "title": "learn"})
+        talent_rows.append({"user_id": uid, "type": "Teach", "category": teach, "title": "teach"})
+        profile_rows.append({"user_id": uid, **profile_values(user_type, learn, teach)})
+        queue_rows.append({"user_a_id": uid, "status": "PENDING",
+                           "requested_at": base + timedelta(milliseconds=uid)})
+
+    db = SessionLocal()
+    db.execute(insert(models.User.__table__), user_rows)
+    db.execute(insert(models.Talent.__table__), talent_rows)
+    db.execute(insert(models.MatchingProfile.__table__), profile_rows)
+    db.execute(insert(models.MatchingQueue.__table__), queue_rows)
+    db.commit()
+    db.close()
+
+
+def matching_worker(categories, deadline: float, idle_rounds: int) -> None:
+    from sqlalchemy.exc import OperationalError
+
+    from app.crud.match import new_worker_id
+    from app.db import SessionLocal
+    from app.routers.matches import run_matching_once
+
+    worker_id = new_worker_id()
+    idle = 0
+    while time.time() < deadline and idle < idle_rounds:
+        db = SessionLocal()
+        try:
+            stats = run_matching_once(db, worker_id=worker_id, categories=categories)
+            idle = idle + 1 if stats.pairs == 0 else 0
+        except OperationalError:
+            db.rollback()          # database is locked → 다음 라운드에 재시도
+        finally:
+            db.close()
+
+
+def enqueuer(first_uid: int, count: int) -> None:
+    from sqlalchemy.exc import OperationalError
+
+    from app import models
+    from app.crud.match import match_new_entry
+    from app.crud.matching_profile import refresh_matching_profile
+    from app.db import SessionLocal
+
+    rnd = random.Random(first_uid)
+    db = SessionLocal()
+    for uid in range(first_uid, first_uid + count):
+        teach = rnd.choice(CATEGORIES)
+        try:
+            user = models.User(user_id=uid, nickname=f"user{uid}",
+                               user_type=rnd.choice(USER_TYPES[:2]), terms_agreed=True)
+            db.add(user)
+            db.add(models.Talent(user_id=uid, type="Learn",
+                                 category=rnd.choice(CATEGORIES), title="learn"))
+            db.add(models.Talent(user_id=uid, type="Teach", category=teach, title="teach"))
+            refresh_matching_profile(db, user)
+            entry = models.MatchingQueue(user_a_id=uid, status="PENDING",
+                                         requested_at=datetime.utcnow())
+            db.add(entry)
+            db.commit()
+            db.refresh(entry)
+            match_new_entry(db, entry, user, teach)
+        except OperationalError:
+            db.rollback()
+    db.close()
+
+
+def verify() -> list:
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.db import SessionLocal
+
+    Queue = models.MatchingQueue
+    db = SessionLocal()
+    problems = []
+
+    confirmed = db.execute(
+        select(Queue.match_id, Queue.user_a_id, Queue.user_b_id).where(Queue.status == "CONFIRMED")
+    ).all()
+    seen = {}
+    for match_id, a, b in confirmed:
+        for uid in (a, b):
+            if uid in seen:
+                problems.append(f"user {uid} matched twice (rows {seen[uid]}, {match_id})")
+            seen[uid] = match_id
+
+    canceled_users = db.scalars(select(Queue.user_a_id).where(Queue.status == "CANCELED")).all()
+    b_users = sorted(b for _, _, b in confirmed)
+    if sorted(canceled_users) != b_users:
+        problems.append(
+            f"canceled rows ({len(canceled_users)}) do not match B sides ({len(b_users)})"
+        )
+
+    notifs = db.scalar(select(func.count()).select_from(models.Notification))
+    if notifs != 2 * len(confirmed):
+        problems.append(f"notifications {notifs} != 2 x {len(confirmed)} pairs")
+
+    leftover = db.scalar(
+        select(func.count()).select_from(Queue)
+        .where(Queue.status == "PENDING", Queue.claimed_by.is_not(None))
+    )
+    if leftover:
+        problems.append(f"{leftover} pending rows still claimed")
+
+    print(f"pairs={len(confirmed)} pending={db.scalar(select(func.count()).select_from(Queue).where(Queue.status == 'PENDING'))}")
+    db.close()
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=500, help="라운드당 선점 row 수")
+    parser.add_argument("--enqueue", type=int, default=1_000, help="실행 중 새로 들어올 신청 수")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="stress_matching_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'stress.db')}"
+    os.environ["MATCH_CLAIM_BATCH"] = str(args.batch)
+    print("db:", os.environ["DATABASE_URL"])
+
+    seed(args.users)
+
+    ctx = mp.get_context("spawn")
+    deadline = time.time() + args.timeout
+    # 커서가 대기열을 한 바퀴 돌 동안 짝이 하나도 안 나오면 종료
+    idle_rounds = args.users // args.batch + 2
+    procs = []
+    for i in range(args.workers):
+        shard = [CATEGORIES[i % len(CATEGORIES)]] if i % 2 else None
+        procs.append(ctx.Process(target=matching_worker, args=(shard, deadline, idle_rounds)))
+    procs.append(ctx.Process(target=enqueuer, args=(args.users + 1, args.enqueue)))
+
+    started = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - started
+
+    problems = verify()
+    print(f"elapsed={elapsed:.1f}s workers={args.workers}")
+    if problems:
+        print("FAIL")
+        for p in problems[:20]:
+            print(" -", p)
+        sys.exit(1)
+    print("OK: no entry matched twice")
+
+
+if __name__ == "__main__":
+    main()